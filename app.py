@@ -10,7 +10,11 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 # --- IMPORT BACKEND ---
 try:
     from src.physics import get_pit_loss
-    from src.solve_strategy_battle import solve_scenario, load_artifacts
+    from src.artifacts import REGISTRY
+    from src.result_cache import RESULT_CACHE, solve_grid_cached
+    from src.parallel_grid import DEFAULT_WORKERS
+    from src.grid_job import GridJob
+    from src.season_table import SEASON_TABLE
     from src.calendar_utils import get_next_race 
     from src.llm_agent import F1Agent
 except Exception as e:
@@ -56,12 +60,75 @@ def format_time(seconds):
     secs = seconds % 60
     return f"{hours}h {minutes}m {secs:05.2f}s" if hours > 0 else f"{minutes}m {secs:05.2f}s"
 
-# --- HELPER: RUN SCENARIO ---
-def run_scenario_analysis(driver_code, circuit_name, scenario_mode):
-    model, encoder = load_artifacts()
+# --- HELPER: RUN SCENARIOS (every qualifying mode in one cached, batched solve) ---
+def run_scenario_analysis(driver_code, circuit_name, scenario_modes):
+    # batched: concurrent sessions share one PredictBroker (merged model calls)
+    model, encoder = REGISTRY.get(fast=True, batched=True)
     pit_loss = get_pit_loss(circuit_name)
     traffic = 1.5
-    return solve_scenario(model, encoder, driver_code, circuit_name, pit_loss, traffic, "", scenario_mode)
+    results = solve_grid_cached(model, encoder, [driver_code], [circuit_name], scenario_modes,
+                                pit_loss=pit_loss, traffic=traffic)
+    return {mode: results[(driver_code, circuit_name, mode)] for mode in scenario_modes}
+
+# --- HELPER: NEXT RACE CLASSIFICATION (from a finished or still running GridJob) ---
+def grid_classification(grid_results):
+    results = []
+    for name, code in DRIVERS.items():
+        if code not in grid_results:
+            continue
+        strat, desc, time = grid_results[code]
+        bias = 0
+        if code in ["VER", "HAM", "LEC", "NOR"]: bias = -5
+        elif code in ["BOT", "HUL", "OCO"]: bias = +10
+        final_time = time + bias
+        results.append({"Driver": name, "Strategy": strat, "Time_Sec": final_time})
+
+    results.sort(key=lambda x: x['Time_Sec'])
+    final_table = []
+    for res in results:
+        gap = res['Time_Sec'] - results[0]['Time_Sec']
+        gap_str = "LEADER" if gap == 0 else f"+{gap:.3f}s"
+        final_table.append({
+            "Driver": res['Driver'],
+            "Strategy": res['Strategy'],
+            "Race Time": format_time(res['Time_Sec']),
+            "Gap": gap_str
+        })
+    return final_table
+
+def show_grid_job(job, circuit_name, polling):
+    snap = job.snapshot()
+    if polling and not job.running:
+        st.rerun()   # finished: one full rerun to stop polling and refresh the buttons
+
+    if job.running:
+        st.write(f"Simulating full {snap['total']}-car grid battle at **{circuit_name}**... "
+                 f"({snap['done']}/{snap['total']} drivers)")
+        st.progress(snap['done'] / snap['total'])
+        if st.button("⏹ Stop", key="btn_stop_grid"):
+            job.cancel()
+    elif snap['status'] == 'cancelled':
+        st.warning(f"Stopped after {snap['done']}/{snap['total']} drivers. Predict again to finish the grid.")
+    elif snap['status'] == 'failed':
+        st.error(f"Grid simulation failed: {snap['error']}")
+    else:
+        st.caption(f"Grid simulated in {snap['seconds']:.1f}s")
+
+    final_table = grid_classification(snap['results'])
+    if not final_table:
+        return
+    podium = [("### 🥈 2nd Place", 1, 'Gap'), ("### 🥇 1st Place", 0, 'Race Time'), ("### 🥉 3rd Place", 2, 'Gap')]
+    for col, (title, pos, field) in zip(st.columns(3), podium):
+        with col:
+            st.markdown(title)
+            if pos < len(final_table):
+                st.metric(label=final_table[pos]['Driver'], value=final_table[pos][field])
+
+    st.divider()
+    st.subheader("Full Race Classification" if snap['status'] == 'done' else "Provisional Classification")
+    df_display = pd.DataFrame(final_table)
+    df_display.index += 1
+    st.dataframe(df_display, use_container_width=True)
 
 # --- INITIALIZE CHAT ---
 if "chat_history" not in st.session_state:
@@ -75,6 +142,19 @@ if "agent" not in st.session_state and api_key:
     except Exception as e:
         st.error(f"Failed to initialize AI: {e}")
 
+# --- MODEL REGISTRY STATUS ---
+with st.sidebar:
+    try:
+        REGISTRY.get()
+        reg = REGISTRY.stats()
+        st.caption(f"Model `{reg['version']}` · loaded in {reg['last_load_seconds']*1000:.0f} ms · cache hits: {reg['cache_hits']}")
+        res = RESULT_CACHE.stats()
+        st.caption(f"Strategy cache: {res['entries']} stored · {res['hits']} hits / {res['misses']} misses")
+        season = SEASON_TABLE.stats()
+        st.caption(f"Season table: {season['rows']} precomputed rows · {season['hits']} hits")
+    except FileNotFoundError as e:
+        st.warning(str(e))
+
 # --- TABS ---
 st.title("🏎️ F1 2026 Strategy Oracle")
 tab1, tab2, tab3 = st.tabs(["🔮 Next Race", "🛠️ Workbench", "💬 AI Engineer"])
@@ -91,52 +171,21 @@ with tab1:
     st.header(f"Next Grand Prix: {circuit_next}")
     st.caption(f"Scheduled for: **{formatted_date}**")
     
-    if st.button("🏆 Predict Race Winner", type="primary"):
-        st.write(f"Simulating full 22-car grid battle at **{circuit_next}**...")
-        progress_bar = st.progress(0)
-        results = []
-        driver_list = list(DRIVERS.items())
-        total_drivers = len(driver_list)
-        
-        for i, (name, code) in enumerate(driver_list):
-            strat, desc, time = run_scenario_analysis(code, circuit_next, "Standard Q3")
-            bias = 0
-            if code in ["VER", "HAM", "LEC", "NOR"]: bias = -5
-            elif code in ["BOT", "HUL", "OCO"]: bias = +10
-            final_time = time + bias
-            results.append({"Driver": name, "Strategy": strat, "Time_Sec": final_time})
-            progress_bar.progress((i + 1) / total_drivers)
-            
-        results.sort(key=lambda x: x['Time_Sec'])
-        winner_time = results[0]['Time_Sec']
-        
-        final_table = []
-        for res in results:
-            gap = res['Time_Sec'] - winner_time
-            gap_str = "LEADER" if gap == 0 else f"+{gap:.3f}s"
-            final_table.append({
-                "Driver": res['Driver'],
-                "Strategy": res['Strategy'],
-                "Race Time": format_time(res['Time_Sec']),
-                "Gap": gap_str
-            })
-        
-        c1, c2, c3 = st.columns(3)
-        with c2: 
-            st.markdown(f"### 🥇 1st Place")
-            st.metric(label=final_table[0]['Driver'], value=final_table[0]['Race Time'])
-        with c1: 
-            st.markdown(f"### 🥈 2nd Place")
-            st.metric(label=final_table[1]['Driver'], value=final_table[1]['Gap'])
-        with c3: 
-            st.markdown(f"### 🥉 3rd Place")
-            st.metric(label=final_table[2]['Driver'], value=final_table[2]['Gap'])
-            
-        st.divider()
-        st.subheader("Full Race Classification")
-        df_display = pd.DataFrame(final_table)
-        df_display.index += 1
-        st.dataframe(df_display, use_container_width=True)
+    # The grid runs on a background GridJob kept in session_state: the table fills
+    # in as drivers finish, survives reruns, and a finished grid is not recomputed
+    grid_jobs = st.session_state.setdefault("grid_jobs", {})
+    job_key = (circuit_next, "Standard Q3")
+    job = grid_jobs.get(job_key)
+
+    if st.button("🏆 Predict Race Winner", type="primary") and (
+            job is None or job.status in ("cancelled", "failed") or job.model_version != REGISTRY.version):
+        for other in grid_jobs.values():
+            other.cancel()   # only one grid per session at a time
+        job = grid_jobs[job_key] = GridJob(list(DRIVERS.values()), circuit_next, "Standard Q3",
+                                           workers=DEFAULT_WORKERS, traffic=1.5).start()
+
+    if job is not None:
+        st.fragment(run_every=0.5 if job.running else None)(show_grid_job)(job, circuit_next, job.running)
 
 # =========================================================
 # TAB 2: STRATEGY WORKBENCH (RESTORED)
@@ -158,18 +207,19 @@ with tab2:
         ]
         
         st.subheader(f"Strategic Report: {sel_driver} @ {sel_circuit}")
+        with st.spinner("Simulating all qualifying scenarios..."):
+            reports = run_scenario_analysis(driver_code, sel_circuit, [mode for _, mode, _ in scenarios])
         for title, mode, note in scenarios:
-            with st.spinner(f"Simulating {title}..."):
-                strategy_type, strategy_desc, race_time = run_scenario_analysis(driver_code, sel_circuit, mode)
-                with st.container():
-                    st.markdown(f"#### {title}")
-                    st.caption(note)
-                    col_a, col_b = st.columns([3, 1])
-                    with col_a:
-                        st.success(f"**{strategy_type}:** {strategy_desc}")
-                    with col_b:
-                        st.metric("Total Time", format_time(race_time))
-                    st.divider()
+            strategy_type, strategy_desc, race_time = reports[mode]
+            with st.container():
+                st.markdown(f"#### {title}")
+                st.caption(note)
+                col_a, col_b = st.columns([3, 1])
+                with col_a:
+                    st.success(f"**{strategy_type}:** {strategy_desc}")
+                with col_b:
+                    st.metric("Total Time", format_time(race_time))
+                st.divider()
 
 # =========================================================
 # TAB 3: AI RACE ENGINEER (FIXED LAYOUT)
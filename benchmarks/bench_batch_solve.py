@@ -0,0 +1,89 @@
+"""
+Benchmark: bulk strategy queries (driver x circuit x mode x pit loss x constraints rows).
+One-at-a-time = solve_scenario per row, what the interactive scripts do per input().
+Batch = src/batch_solve.py streaming the same file in chunks, in-process and on
+worker processes. Pit losses are salted per run so every scenario is solved
+(not answered by a result cache from an earlier run).
+Peak traced memory is compared for an input 4x as long.
+(Worker processes only pay off with spare cores: on a single core the
+2-worker run is slower than in-process, hence batch_solve's default of cpu_count - 1.)
+
+Run from the repo root:  python benchmarks/bench_batch_solve.py
+"""
+import csv
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.artifacts import REGISTRY
+from src.batch_solve import run
+from src.calendar_utils import DRIVER_GRID
+from src.inventory_solver import MODES
+from src.solve_strategy_battle import solve_scenario
+
+ROWS = 1500
+ONE_AT_A_TIME_ROWS = 100   # extrapolated, the full run takes minutes
+CIRCUITS = ["Sakhir", "Jeddah", "Monza", "Silverstone", "Spa", "Suzuka"]
+CONSTRAINTS = ['', 'SOFT:NEW:0', 'HARD:NEW:1']
+
+
+def write_input(path, n_rows, salt, seed=7):
+    rng = random.Random(seed)
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, ['driver', 'circuit', 'mode', 'pit_loss', 'constraints'])
+        writer.writeheader()
+        for _ in range(n_rows):
+            writer.writerow({'driver': rng.choice(DRIVER_GRID), 'circuit': rng.choice(CIRCUITS),
+                             'mode': rng.choice(MODES), 'pit_loss': rng.choice([21.0, 23.0]) + salt,
+                             'constraints': rng.choice(CONSTRAINTS)})
+
+
+def one_at_a_time(path, limit):
+    from src.batch_solve import _parse_constraints
+
+    model, encoder = REGISTRY.get(fast=True)
+    with open(path, newline='') as f:
+        for i, row in enumerate(csv.DictReader(f)):
+            if i == limit:
+                break
+            solve_scenario(model, encoder, row['driver'], row['circuit'], float(row['pit_loss']), 1.5, None,
+                           row['mode'], tyre_constraints=_parse_constraints(row['constraints']) or None)
+
+
+def timed_run(path, out, workers):
+    t0 = time.perf_counter()
+    solved, failed = run(path, out, workers=workers)
+    assert solved and not failed
+    return time.perf_counter() - t0
+
+
+if __name__ == "__main__":
+    REGISTRY.get(fast=True)
+    salt = (time.time() % 1000) / 1e4
+    with tempfile.TemporaryDirectory() as work:
+        path, out = os.path.join(work, 'in.csv'), os.path.join(work, 'out.jsonl')
+        print(f"{ROWS} scenarios, {len(CIRCUITS)} circuits, {len(DRIVER_GRID)} drivers")
+
+        write_input(path, ROWS, salt)
+        t0 = time.perf_counter()
+        one_at_a_time(path, ONE_AT_A_TIME_ROWS)
+        t_one = (time.perf_counter() - t0) / ONE_AT_A_TIME_ROWS * ROWS
+        print(f"One at a time (est.):   {t_one:7.1f}s  {ROWS / t_one:7.0f} rows/s")
+
+        for label, workers, run_salt in (("Batch, in-process:", 0, salt + 0.1), ("Batch, 2 workers:", 2, salt + 0.2)):
+            write_input(path, ROWS, run_salt)
+            t = timed_run(path, out, workers)
+            print(f"{label:22s}  {t:7.1f}s  {ROWS / t:7.0f} rows/s ({t_one / t:.0f}x)")
+
+        for n_rows, run_salt in ((ROWS, salt + 0.3), (4 * ROWS, salt + 0.4)):
+            write_input(path, n_rows, run_salt, seed=n_rows)
+            tracemalloc.start()
+            run(path, out, workers=0)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print(f"Peak traced memory, {n_rows:5d} rows: {peak / 1e6:6.1f} MB")
@@ -0,0 +1,97 @@
+"""
+Benchmark: weekly dataset update, single CSV vs the partitioned store.
+CSV   = the old auto_updater: read the whole race_data.csv, concat the new race, rewrite it.
+Store = dataset_store.write_partition: write one new season/round file.
+Also compares full loads, a projected load (3 columns, last season) and size on disk
+as the history grows to many seasons of synthetic race_data rows.
+
+Run from the repo root:  python benchmarks/bench_dataset_store.py
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+from src.dataset_store import RACE_DATA, dataset_size, read_dataset, write_partition
+
+SEASONS = (1, 3, 5, 10)
+ROUNDS = 24
+DRIVERS = ["VER", "HAD", "RUS", "ANT", "LEC", "HAM", "NOR", "PIA", "ALO", "STR", "GAS",
+           "COL", "SAI", "ALB", "LAW", "LIN", "OCO", "BEA", "HUL", "BOR", "PER", "BOT"]
+COMPOUNDS = ["SOFT", "MEDIUM", "HARD"]
+LAPS = 50   # green laps kept per driver
+
+
+def race_frame(season, round_num):
+    """One race in the auto_updater row format."""
+    rng = np.random.default_rng(season * 100 + round_num)
+    n = LAPS * len(DRIVERS)
+    laps = np.tile(np.arange(1, LAPS + 1), len(DRIVERS)).astype(float)
+    return pd.DataFrame({
+        'Driver': np.repeat(DRIVERS, LAPS),
+        'Circuit': f"Grand Prix {round_num}",
+        'Compound': rng.choice(COMPOUNDS, n),
+        'TyreLife': laps,
+        'LapNumber': laps,
+        'Rainfall': 0,
+        'FuelWeight': np.maximum(0, 110 - laps * 1.7),
+        'LapTime': np.round(90 + rng.normal(0, 0.8, n), 3),
+    })
+
+
+def timed(fn, repeats=3):
+    best = float('inf')
+    out = None
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, out
+
+
+def csv_append(path, df_new):
+    df_main = pd.read_csv(path) if os.path.exists(path) else pd.DataFrame()
+    pd.concat([df_main, df_new], ignore_index=True).to_csv(path, index=False)
+
+
+if __name__ == "__main__":
+    print(f"{'seasons':>7} {'rows':>8} | {'append: csv':>11} {'store':>8} | {'load: csv':>9} {'store':>8} "
+          f"{'projected':>9} | {'size: csv':>9} {'store':>8}")
+
+    for n_seasons in SEASONS:
+        with tempfile.TemporaryDirectory() as root:
+            csv_path = os.path.join(root, 'race_data.csv')
+            history = [(2000 + s, r) for s in range(n_seasons) for r in range(1, ROUNDS + 1)]
+            *old, new = history
+
+            # Existing history (not timed)
+            frames = [race_frame(s, r) for s, r in old]
+            pd.concat(frames, ignore_index=True).to_csv(csv_path, index=False)
+            for (s, r), df in zip(old, frames):
+                write_partition(df, RACE_DATA, s, r, root)
+            df_new = race_frame(*new)
+
+            # The weekly update: one new race (timed once: it changes the data)
+            t0 = time.perf_counter()
+            csv_append(csv_path, df_new)
+            t_csv_append = time.perf_counter() - t0
+            t0 = time.perf_counter()
+            write_partition(df_new, RACE_DATA, *new, root)
+            t_store_append = time.perf_counter() - t0
+
+            t_csv_load, csv_df = timed(lambda: pd.read_csv(csv_path))
+            t_store_load, store_df = timed(lambda: read_dataset(RACE_DATA, root=root))
+            t_proj, proj = timed(lambda: read_dataset(RACE_DATA, columns=['Driver', 'Compound', 'LapTime'],
+                                                      seasons=[new[0]], root=root))
+            assert len(csv_df) == len(store_df) and len(proj) == ROUNDS * LAPS * len(DRIVERS)
+
+            csv_mb = os.path.getsize(csv_path) / 1e6
+            store_mb = dataset_size(RACE_DATA, root) / 1e6
+            print(f"{n_seasons:>7} {len(csv_df):>8} | {t_csv_append*1000:9.0f}ms {t_store_append*1000:6.0f}ms | "
+                  f"{t_csv_load*1000:7.0f}ms {t_store_load*1000:6.0f}ms {t_proj*1000:7.0f}ms | "
+                  f"{csv_mb:7.1f}MB {store_mb:6.1f}MB")
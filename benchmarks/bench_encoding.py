@@ -0,0 +1,52 @@
+"""
+Benchmark: OrdinalEncoder.transform on a DataFrame vs the compiled
+CategoryCodes lookups in src/features.py, for one row and a full table.
+
+Run from the repo root:  python benchmarks/bench_encoding.py
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.artifacts import REGISTRY
+from src.dataset_store import RACE_DATA, read_dataset
+from src.features import CAT_COLS, FEATURES, feature_matrix
+from src.schema import RACE_COLUMNS
+
+
+def sklearn_encode(encoder, df):
+    out = df[FEATURES].copy()
+    out[CAT_COLS] = encoder.transform(df[CAT_COLS])
+    return out.to_numpy(dtype=float)
+
+
+def latency(fn, repeats):
+    fn()
+    t0 = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - t0) / repeats
+
+
+if __name__ == "__main__":
+    _, encoder = REGISTRY.get()
+    df = read_dataset(RACE_DATA, columns=RACE_COLUMNS)
+    row = {'Driver': 'VER', 'Circuit': 'Sakhir', 'Compound': 'SOFT', 'TyreLife': 5,
+           'LapNumber': 12, 'Rainfall': 0, 'FuelWeight': 86.8}
+    row_df = pd.DataFrame([row])
+
+    assert np.array_equal(sklearn_encode(encoder, df), feature_matrix(encoder, df))
+    assert np.array_equal(sklearn_encode(encoder, row_df), feature_matrix(encoder, row))
+
+    print(f"{'':14}{'OrdinalEncoder':>16}{'lookups':>12}{'speedup':>10}")
+    for label, a, b, reps in (
+        ("1 row", lambda: sklearn_encode(encoder, row_df), lambda: feature_matrix(encoder, row), 500),
+        (f"{len(df)} rows", lambda: sklearn_encode(encoder, df), lambda: feature_matrix(encoder, df), 50),
+    ):
+        t_a, t_b = latency(a, reps), latency(b, reps)
+        print(f"{label:<14}{t_a*1e6:>13.1f} us{t_b*1e6:>9.1f} us{t_a / t_b:>9.1f}x")
@@ -0,0 +1,55 @@
+"""
+Benchmark: sklearn model.predict vs the array-backed FastPredictor.
+Checks parity and compares per-row and per-batch latency for the shipped
+model and for a HistGradientBoostingRegressor trained like train_baseline.py.
+
+Run from the repo root:  python benchmarks/bench_fast_predictor.py
+"""
+import os
+import sys
+import time
+
+import numpy as np
+from sklearn.ensemble import HistGradientBoostingRegressor
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.artifacts import REGISTRY
+from src.dataset_store import RACE_DATA, read_dataset
+from src.fast_predictor import BATCH_CROSSOVER, FastPredictor
+from src.features import FEATURES, encode_features
+from src.schema import RACE_COLUMNS
+
+
+def latency(fn, X, repeats):
+    fn(X)  # warm-up
+    t0 = time.perf_counter()
+    for _ in range(repeats):
+        fn(X)
+    return (time.perf_counter() - t0) / repeats
+
+
+def report(name, model, X):
+    fast = FastPredictor(model, batch_crossover=None)   # always traverse, for parity + timing
+    a, b = model.predict(X), fast.predict(X)
+    print(f"\n== {name} ({len(fast.roots)} trees, depth {fast.max_depth}) ==")
+    print(f"Parity: bit-exact={np.array_equal(a, b)} | max |diff| = {np.abs(a - b).max():.2e}s")
+    print(f"{'':12}{'sklearn':>14}{'traversal':>14}{'speedup':>10}")
+    for n_rows, reps in ((1, 200), (22, 100), (330, 20), (len(X), 3)):
+        data = X.iloc[:n_rows]
+        t_sk = latency(model.predict, data, reps)
+        t_fast = latency(fast.predict, data, reps)
+        print(f"{str(n_rows) + ' rows':<12}{t_sk*1e3:>11.3f} ms{t_fast*1e3:>11.3f} ms{t_sk / t_fast:>9.1f}x")
+
+
+if __name__ == "__main__":
+    model, encoder = REGISTRY.get()
+    df = read_dataset(RACE_DATA, columns=RACE_COLUMNS)
+    X = encode_features(encoder, df)
+
+    report(type(model).__name__ + " (models/)", model, X)
+    print(f"(FastPredictor hands batches over {BATCH_CROSSOVER} rows back to sklearn)")
+
+    hist = HistGradientBoostingRegressor(max_iter=300, learning_rate=0.05, max_depth=15, random_state=12)
+    hist.fit(X, df['LapTime'])
+    report("HistGradientBoostingRegressor (train_baseline params)", hist, X[FEATURES])
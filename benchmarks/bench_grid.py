@@ -0,0 +1,111 @@
+"""
+Benchmark: full 22-car grid prediction.
+Legacy path = evenly split STRATEGY_OPTIONS, one model.predict per stint
+(what solve_scenario used to do).
+Current path = solve_grid: one model.predict for the whole grid's stint tables,
+then an exact search over each driver's real tyre sets and pit laps.
+Also checks the search's pruning: on a few drivers' inventories (every qualifying
+mode, with and without tyre constraints) the pruned search must find the same
+plans as searching every branch.
+
+Run from the repo root:  python benchmarks/bench_grid.py
+"""
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.artifacts import REGISTRY
+from src.physics import get_pit_loss
+from src.features import feature_matrix, predict_matrix
+from src.inventory_solver import (MODES, apply_constraints, fastest_lap, inventory_signature, search_inventory,
+                                  stint_cost_matrix)
+from src.stint_tables import get_stint_tables
+from src.tyre_strategy import get_race_start_tyres
+from src.solve_strategy_battle import STRATEGY_OPTIONS, plan_stints, solve_grid
+
+GRID = ["VER", "HAD", "RUS", "ANT", "LEC", "HAM", "NOR", "PIA", "ALO", "STR", "GAS",
+        "COL", "SAI", "ALB", "LAW", "LIN", "OCO", "BEA", "HUL", "BOR", "PER", "BOT"]
+CIRCUIT = "Sakhir"
+CONSTRAINTS = [None, [{'compound': 'HARD', 'status': 'NEW', 'limit': 0}],
+               [{'compound': 'MEDIUM', 'status': 'NEW', 'limit': 0}, {'compound': 'SOFT', 'status': 'USED', 'limit': 1}]]
+
+
+def get_stint_time(model, encoder, driver_code, circuit, compound, laps, start_lap):
+    """The old average-lap stint estimate: one predict for the middle of the stint x laps."""
+    fuel_start = 110 - (start_lap * 1.7)
+    fuel_end = 110 - ((start_lap + laps) * 1.7)
+    X = feature_matrix(encoder, {
+        'Driver': driver_code,
+        'Circuit': circuit,
+        'Compound': compound,
+        'TyreLife': (laps / 2) + 1,
+        'LapNumber': start_lap + (laps / 2),
+        'Rainfall': 0,
+        'FuelWeight': max(0, (fuel_start + fuel_end) / 2),
+    })
+    return predict_matrix(model, X)[0] * laps
+
+
+def legacy_grid(model, encoder, circuit):
+    pit_loss = get_pit_loss(circuit)
+    results = {}
+    for code in GRID:
+        best = float('inf')
+        for compounds in STRATEGY_OPTIONS:
+            stints, _ = plan_stints(compounds)
+            total = 0
+            for i, (compound, stint_len, start_lap) in enumerate(stints):
+                if i > 0:
+                    total += pit_loss
+                total += get_stint_time(model, encoder, code, circuit, compound, stint_len, start_lap)
+            best = min(best, total)
+        results[code] = best
+    return results
+
+
+def check_pruning(model, encoder, drivers=("VER", "ALO", "BOT"), circuit=CIRCUIT):
+    """Pruned vs exhaustive search_inventory on every mode x constraint inventory; returns how many were compared."""
+    pit_loss = get_pit_loss(circuit)
+    n_inventories = 0
+    for driver in drivers:
+        tables = get_stint_tables(model, encoder, driver, circuit, ["SOFT", "MEDIUM", "HARD"])
+        for mode in MODES:
+            for constraints in CONSTRAINTS:
+                signature = inventory_signature(apply_constraints(get_race_start_tyres(driver, mode), constraints))
+                costs = {set_type: stint_cost_matrix(tables[set_type[0]], set_type[1]) for set_type, _ in signature}
+                min_lap = min(fastest_lap(tables[compound]) for (compound, _), _ in signature)
+                pruned = search_inventory(costs, signature, pit_loss, min_lap=min_lap)
+                full = search_inventory(costs, signature, pit_loss, prune=False)
+                assert (pruned is None) == (full is None), (driver, mode, constraints)
+                if full is not None:
+                    # Pruning may skip stop counts that cannot win, never the winner itself
+                    assert pruned['total_time'] == full['total_time'] and pruned['sets'] == full['sets'] \
+                        and pruned['pit_laps'] == full['pit_laps'], (driver, mode, constraints)
+                n_inventories += 1
+    return n_inventories
+
+
+def timed(fn, repeats=3):
+    best = float('inf')
+    out = None
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, out
+
+
+if __name__ == "__main__":
+    model, encoder = REGISTRY.get()
+
+    t_legacy, legacy = timed(lambda: legacy_grid(model, encoder, CIRCUIT))
+    t_batch, batch = timed(lambda: solve_grid(model, encoder, GRID, [CIRCUIT]), repeats=1)
+
+    print(f"Grid: {len(GRID)} drivers @ {CIRCUIT}")
+    print(f"Legacy (per-stint predict): {t_legacy*1000:9.1f} ms")
+    print(f"Current (solve_grid):       {t_batch*1000:9.1f} ms (first call, tables + search)")
+    print(f"Speedup: {t_legacy / t_batch:.1f}x (the answers differ: per-lap tables vs average-lap stints)")
+
+    print(f"Pruned search == exhaustive search on {check_pruning(model, encoder)} inventories")
@@ -0,0 +1,55 @@
+"""
+Benchmark: the Next Race grid (22 drivers at one circuit), solved uncached.
+Blocking = one simulate_grid call (the old Tab 1: nothing to show until it returns).
+GridJob = background job in steps of STREAM_DRIVERS (src/grid_job.py): first
+rows, full grid, and how fast cancel() stops it.
+Pit losses are salted per run so the result cache cannot answer.
+
+Run from the repo root:  python benchmarks/bench_grid_job.py
+"""
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.artifacts import REGISTRY
+from src.calendar_utils import DRIVER_GRID
+from src.grid_job import STREAM_DRIVERS, GridJob
+from src.parallel_grid import simulate_grid
+
+# A different circuit per run: stint tables are cached in memory per (driver, circuit)
+CIRCUITS = ["Monza", "Spa", "Suzuka"]
+
+
+def first_rows(job):
+    while job.running and not job.snapshot()['done']:
+        time.sleep(0.005)
+    return time.perf_counter()
+
+
+if __name__ == "__main__":
+    REGISTRY.get(fast=True, batched=True)
+    salt = 20 + (time.time() % 1000) / 1e4
+
+    t0 = time.perf_counter()
+    simulate_grid(DRIVER_GRID, [CIRCUITS[0]], ["Standard Q3"], workers=0, pit_loss=salt)
+    t_block = time.perf_counter() - t0
+    print(f"Blocking simulate_grid:   first rows {t_block:6.2f}s, full grid {t_block:6.2f}s")
+
+    t0 = time.perf_counter()
+    job = GridJob(DRIVER_GRID, CIRCUITS[1], pit_loss=salt, workers=0).start()
+    t_first = first_rows(job) - t0
+    job.wait()
+    t_full = time.perf_counter() - t0
+    assert job.status == 'done' and job.snapshot()['done'] == len(DRIVER_GRID)
+    print(f"GridJob ({STREAM_DRIVERS} per step):     first rows {t_first:6.2f}s, full grid {t_full:6.2f}s")
+
+    job = GridJob(DRIVER_GRID, CIRCUITS[2], pit_loss=salt, workers=0).start()
+    first_rows(job)
+    t0 = time.perf_counter()
+    job.cancel()
+    job.wait()
+    snap = job.snapshot()
+    print(f"cancel() stopped the job in {time.perf_counter() - t0:.2f}s "
+          f"({snap['status']}, {snap['done']}/{snap['total']} drivers kept)")
@@ -0,0 +1,129 @@
+"""
+Benchmark: season ingestion throughput, offline.
+A fake fastf1 provider serves synthetic race sessions after a fixed delay
+(standing in for the network/API time of session.load). Sequential (1 worker)
+vs the thread pool, then an interrupted run resumed from the manifest, and a
+resume over race folders that were published but never marked done (killed
+between the rename and the manifest write, or failed after a partial write).
+
+Run from the repo root:  python benchmarks/bench_ingest.py
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+from src.ingest_data import MANIFEST_FILE, ingest, print_report
+
+YEARS = range(2023, 2026)
+ROUNDS = 22
+LOAD_DELAY = 0.25   # s per session.load
+DRIVERS = ["VER", "NOR", "LEC", "HAM", "PIA", "RUS", "ALO", "SAI", "GAS", "OCO",
+           "ALB", "STR", "HUL", "TSU", "BOT", "ZHO", "MAG", "RIC", "SAR", "PER"]
+
+
+class FakeSession:
+    def __init__(self, year, round_num, laps=57):
+        rng = np.random.default_rng(year * 100 + round_num)
+        n = laps * len(DRIVERS)
+        self.laps = pd.DataFrame({
+            'Driver': np.repeat(DRIVERS, laps),
+            'LapTime': pd.to_timedelta(90 + rng.normal(0, 0.5, n), unit='s'),
+            'LapNumber': np.tile(np.arange(1, laps + 1), len(DRIVERS)),
+            'Stint': 1,
+            'PitOutTime': pd.NaT,
+            'PitInTime': pd.NaT,
+            'Compound': 'MEDIUM',
+            'TyreLife': np.tile(np.arange(1, laps + 1), len(DRIVERS)),
+            'TrackStatus': 1,
+            'Time': pd.to_timedelta(np.tile(np.arange(1, laps + 1) * 90.0, len(DRIVERS)), unit='s'),
+        })
+        self.weather_data = pd.DataFrame({
+            'Time': pd.to_timedelta(np.arange(0, laps * 90, 60), unit='s'),
+            'AirTemp': 25.0, 'TrackTemp': 35.0, 'Rainfall': False,
+        })
+        self.results = pd.DataFrame({
+            'Abbreviation': DRIVERS, 'TeamName': 'Team', 'Position': np.arange(1, len(DRIVERS) + 1),
+            'GridPosition': np.arange(1, len(DRIVERS) + 1), 'Status': 'Finished', 'Points': 0.0,
+        })
+
+
+class FakeProvider:
+    """Same interface as ingest_data.FastF1Provider, no network."""
+
+    def __init__(self, delay=LOAD_DELAY, fail_after=None):
+        self.delay = delay
+        self.fail_after = fail_after   # simulate a killed run after this many loads
+        self.loads = 0
+
+    def get_event_schedule(self, year):
+        return pd.DataFrame({
+            'RoundNumber': np.arange(1, ROUNDS + 1),
+            'Country': [f"Country {r}" for r in range(1, ROUNDS + 1)],
+            'Location': [f"Track {r}" for r in range(1, ROUNDS + 1)],
+            'Session5Date': pd.Timestamp(f"{year}-03-01") + pd.to_timedelta(np.arange(ROUNDS) * 14, unit='D'),
+        })
+
+    def load_race(self, year, round_num):
+        self.loads += 1
+        if self.fail_after is not None and self.loads > self.fail_after:
+            raise ConnectionError("simulated network failure")
+        time.sleep(self.delay)
+        return FakeSession(year, round_num)
+
+
+def count_races(raw_dir):
+    return sum(1 for name in os.listdir(raw_dir) if name != MANIFEST_FILE)
+
+
+if __name__ == "__main__":
+    quiet = open(os.devnull, 'w')
+    total = len(YEARS) * ROUNDS
+    print(f"Ingest: {total} races, {LOAD_DELAY * 1000:.0f} ms per session load ({os.cpu_count()} cores)")
+
+    for workers in (1, 4, 8):
+        with tempfile.TemporaryDirectory() as raw_dir:
+            stdout, sys.stdout = sys.stdout, quiet
+            report = ingest(YEARS, FakeProvider(), workers=workers, raw_dir=raw_dir)
+            sys.stdout = stdout
+            assert count_races(raw_dir) == total
+            print(f"{workers} workers: {report['elapsed']:6.2f}s | {report['races_per_minute']:7.1f} races/min")
+
+    # Resume: the first run dies after 20 loads, the second only fetches the rest
+    with tempfile.TemporaryDirectory() as raw_dir:
+        stdout, sys.stdout = sys.stdout, quiet
+        first = ingest(YEARS, FakeProvider(fail_after=20), workers=4, raw_dir=raw_dir)
+        provider = FakeProvider()
+        second = ingest(YEARS, provider, workers=4, raw_dir=raw_dir)
+        sys.stdout = stdout
+        assert count_races(raw_dir) == total and provider.loads == total - first['done']
+        print(f"\nResume: run 1 saved {first['done']} races ({first['failed']} failed); "
+              f"run 2 loaded only the missing {provider.loads}")
+        print_report(second)
+
+    # Killed after publishing a folder but before marking it done, and a failed retry over a
+    # stale folder: both are fetched again instead of crashing the rename or being trusted
+    with tempfile.TemporaryDirectory() as raw_dir:
+        stdout, sys.stdout = sys.stdout, quiet
+        ingest(YEARS, FakeProvider(delay=0), workers=4, raw_dir=raw_dir)
+        manifest_path = os.path.join(raw_dir, MANIFEST_FILE)
+        with open(manifest_path) as f:
+            races = json.load(f)
+        unmarked, failed = sorted(races)[:2]
+        del races[unmarked]
+        races[failed] = {'status': 'failed', 'error': 'simulated'}
+        with open(manifest_path, 'w') as f:
+            json.dump(races, f)
+        os.remove(os.path.join(raw_dir, failed, 'results.csv'))   # partial write
+        provider = FakeProvider(delay=0)
+        third = ingest(YEARS, provider, workers=4, raw_dir=raw_dir)
+        sys.stdout = stdout
+        assert third['done'] == provider.loads == 2 and third['failed'] == 0
+        assert os.path.exists(os.path.join(raw_dir, failed, 'results.csv'))
+        print(f"Unmarked + failed folders: re-fetched {third['done']}, skipped {third['skipped']}")
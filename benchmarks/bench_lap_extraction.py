@@ -0,0 +1,89 @@
+"""
+Benchmark: auto_updater lap extraction over a full synthetic season of FastF1-style laps.
+Legacy = laps.iterrows() + one dict per lap (old update_dataset_and_train).
+Columnar = auto_updater.race_rows.
+
+Run from the repo root:  python benchmarks/bench_lap_extraction.py
+"""
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+from src.auto_updater import race_rows
+from src.features import fuel_weight
+
+ROUNDS = 24
+RACE_LAPS = 57
+DRIVERS = ["VER", "HAD", "RUS", "ANT", "LEC", "HAM", "NOR", "PIA", "ALO", "STR", "GAS",
+           "COL", "SAI", "ALB", "LAW", "LIN", "OCO", "BEA", "HUL", "BOR", "PER", "BOT"]
+
+
+def session_laps(round_num):
+    """One race's quick laps as FastF1 returns them (Timedelta lap times, nullable Rainfall)."""
+    rng = np.random.default_rng(round_num)
+    n = RACE_LAPS * len(DRIVERS)
+    rainfall = pd.Series(rng.random(n) < 0.05, dtype=object)
+    rainfall[rng.random(n) < 0.01] = np.nan
+    return pd.DataFrame({
+        'Driver': np.repeat(DRIVERS, RACE_LAPS),
+        'Compound': rng.choice(["SOFT", "MEDIUM", "HARD"], n),
+        'TyreLife': np.tile(np.arange(1, RACE_LAPS + 1), len(DRIVERS)).astype(float),
+        'LapNumber': np.tile(np.arange(1, RACE_LAPS + 1), len(DRIVERS)).astype(float),
+        'Rainfall': rainfall,
+        'LapTime': pd.to_timedelta(90 + rng.normal(0, 0.8, n), unit='s'),
+    })
+
+
+def legacy_rows(laps, race_name):
+    new_data = []
+    for index, lap in laps.iterrows():
+        new_data.append({
+            'Driver': lap['Driver'],
+            'Circuit': race_name,
+            'Compound': lap['Compound'],
+            'TyreLife': lap['TyreLife'],
+            'LapNumber': lap['LapNumber'],
+            'Rainfall': 1 if lap['Rainfall'] else 0,
+            'FuelWeight': max(0, 110 - (lap['LapNumber'] * 1.7)),
+            'LapTime': lap['LapTime'].total_seconds()
+        })
+    return pd.DataFrame(new_data)
+
+
+def timed(fn, repeats=3):
+    best = float('inf')
+    out = None
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, out
+
+
+if __name__ == "__main__":
+    season = [(f"Grand Prix {r}", session_laps(r)) for r in range(1, ROUNDS + 1)]
+    n_laps = sum(len(laps) for _, laps in season)
+    print(f"Season: {ROUNDS} races, {n_laps} laps")
+
+    t_legacy, legacy = timed(lambda: [legacy_rows(laps, name) for name, laps in season], repeats=1)
+    t_fast, fast = timed(lambda: [race_rows(laps, name, RACE_LAPS) for name, laps in season])
+
+    for old, new in zip(legacy, fast):
+        same = ['Driver', 'Circuit', 'Compound', 'TyreLife', 'LapNumber', 'LapTime']
+        pd.testing.assert_frame_equal(old[same], new[same])
+        # Legacy counted a missing Rainfall (NaN is truthy) as wet; now it is dry
+        assert (old['Rainfall'] >= new['Rainfall']).all()
+        assert np.allclose(new['FuelWeight'], fuel_weight(new['LapNumber'], RACE_LAPS))
+
+    print(f"Legacy iterrows: {t_legacy*1000:9.1f} ms")
+    print(f"Columnar:        {t_fast*1000:9.1f} ms ({t_legacy / t_fast:.0f}x)")
+
+    old_fuel = pd.concat(legacy)['FuelWeight']
+    new_fuel = pd.concat(fast)['FuelWeight']
+    print(f"FuelWeight on the last lap: {old_fuel.iloc[-1]:.1f} kg (1.7 kg/lap) -> {new_fuel.iloc[-1]:.1f} kg "
+          f"(race length) | laps at the 0 kg floor before: {(old_fuel == 0).mean():.0%}")
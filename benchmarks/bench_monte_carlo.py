@@ -0,0 +1,41 @@
+"""
+Benchmark: Monte Carlo race simulation, 10k samples x 22 drivers x 6 strategies.
+Cold = lap-time tensor built from the model (stint tables empty).
+Warm = tables cached, so the time is the vectorized sampling itself.
+
+Run from the repo root:  python benchmarks/bench_monte_carlo.py
+"""
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.artifacts import REGISTRY
+from src.monte_carlo import N_SAMPLES, simulate
+from src.stint_tables import STINT_TABLES
+
+GRID = ["VER", "HAD", "RUS", "ANT", "LEC", "HAM", "NOR", "PIA", "ALO", "STR", "GAS",
+        "COL", "SAI", "ALB", "LAW", "LIN", "OCO", "BEA", "HUL", "BOR", "PER", "BOT"]
+CIRCUIT = "Singapore"
+
+
+if __name__ == "__main__":
+    model, encoder = REGISTRY.get(fast=True)
+
+    STINT_TABLES.clear()
+    t0 = time.perf_counter()
+    result = simulate(model, encoder, GRID, CIRCUIT, seed=0)
+    t_cold = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    simulate(model, encoder, GRID, CIRCUIT, seed=1)
+    t_warm = time.perf_counter() - t0
+
+    n_samples, n_drivers, n_plans = result['times'].shape
+    print(f"Monte Carlo: {n_samples} samples x {n_drivers} drivers x {n_plans} strategies @ {CIRCUIT}")
+    print(f"Cold (tensor + sampling): {t_cold*1000:9.1f} ms")
+    print(f"Warm (sampling only):     {t_warm*1000:9.1f} ms")
+    print(f"Per race realisation:     {t_warm / N_SAMPLES * 1e6:9.2f} us")
+    top = sorted(result['win_prob'].items(), key=lambda kv: -kv[1])[:3]
+    print("Top win probabilities: " + ", ".join(f"{d} {p:.1%}" for d, p in top))
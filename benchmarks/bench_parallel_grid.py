@@ -0,0 +1,54 @@
+"""
+Benchmark: multi-circuit sweep (every driver at every circuit), cache disabled.
+In-process = one batched solve_grid per circuit in this process.
+Pool = simulate_grid on N worker processes (model loaded once per worker;
+the pool is warmed first so start-up is not counted).
+
+Run from the repo root:  python benchmarks/bench_parallel_grid.py
+"""
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.parallel_grid import shutdown_pools, simulate_grid
+
+GRID = ["VER", "HAD", "RUS", "ANT", "LEC", "HAM", "NOR", "PIA", "ALO", "STR", "GAS",
+        "COL", "SAI", "ALB", "LAW", "LIN", "OCO", "BEA", "HUL", "BOR", "PER", "BOT"]
+CIRCUITS = ["Sakhir", "Jeddah", "Albert Park", "Suzuka", "Shanghai", "Miami",
+            "Imola", "Monaco", "Montreal", "Barcelona", "Red Bull Ring",
+            "Silverstone", "Hungaroring", "Spa", "Zandvoort", "Monza",
+            "Baku", "Singapore", "Austin", "Mexico City", "Las Vegas", "Yas Marina"]
+MODES = ["Standard Q3", "Knocked out in Q2", "Knocked out in Q1"]
+
+
+def timed(fn, repeats=3):
+    best = float('inf')
+    out = None
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, out
+
+
+if __name__ == "__main__":
+    cores = os.cpu_count() or 1
+    print(f"Sweep: {len(GRID)} drivers x {len(CIRCUITS)} circuits x {len(MODES)} modes ({cores} cores)")
+
+    t_serial, serial = timed(lambda: simulate_grid(GRID, CIRCUITS, MODES, workers=0, cache=None))
+    print(f"In-process batched:            {t_serial*1000:9.1f} ms")
+
+    for workers in sorted({1, 2, 4, cores}):
+        # Warm the pool: spawn + model load happen once per worker, not per sweep
+        simulate_grid(GRID, CIRCUITS[:workers], MODES, workers=workers, drivers_per_task=len(GRID), cache=None)
+        for per_task in (1, len(GRID)):
+            t_pool, pooled = timed(lambda: simulate_grid(GRID, CIRCUITS, MODES, workers=workers,
+                                                          drivers_per_task=per_task, cache=None))
+            assert list(pooled) == list(serial), "grid order changed"
+            max_diff = max(abs(pooled[k][2] - serial[k][2]) for k in serial)
+            print(f"Pool {workers} workers, {per_task:2d} drivers/task: {t_pool*1000:9.1f} ms "
+                  f"({t_serial / t_pool:.2f}x) | max |diff| = {max_diff:.2e}s")
+
+    shutdown_pools()
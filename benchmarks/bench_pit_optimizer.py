@@ -0,0 +1,78 @@
+"""
+Benchmark: legacy coarse pit-window search (solve_2stop before the DP)
+vs the exact DP optimizer in src/pit_optimizer.py.
+
+Run from the repo root:  python benchmarks/bench_pit_optimizer.py
+"""
+import itertools
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+from src.artifacts import REGISTRY
+from src.features import fuel_weight, predict_rows
+from src.pit_optimizer import COMPOUNDS, TOTAL_LAPS, lap_time_tensor, optimize_pit_stops
+from src.solve_2stop import PIT_LOSS_SECONDS
+from src.stint_tables import STINT_TABLES
+
+DRIVER = "VER"
+CIRCUIT = "Sakhir"
+
+
+def get_stint_time(model, encoder, driver, circuit, compound, start_lap, end_lap):
+    """The old per-call stint prediction: new DataFrame + predict every time."""
+    laps = list(range(start_lap, end_lap + 1))
+    data = pd.DataFrame({
+        'Driver': driver,
+        'Circuit': circuit,
+        'Compound': compound,
+        'TyreLife': range(len(laps)),
+        'LapNumber': laps,
+        'Rainfall': 0,
+        'FuelWeight': fuel_weight(laps, TOTAL_LAPS),
+    })
+    return predict_rows(model, encoder, data).sum()
+
+
+def legacy_search(model, encoder):
+    """The old solve_2stop loop: compound triples x pit windows with step 3."""
+    best = (None, None, None, float('inf'))
+    for c1, c2, c3 in itertools.product(COMPOUNDS, repeat=3):
+        if len(set([c1, c2, c3])) < 2:
+            continue
+        for pit1 in range(10, 26, 3):
+            time_s1 = get_stint_time(model, encoder, DRIVER, CIRCUIT, c1, 1, pit1)
+            for pit2 in range(pit1 + 15, 51, 3):
+                time_s2 = get_stint_time(model, encoder, DRIVER, CIRCUIT, c2, pit1 + 1, pit2)
+                time_s3 = get_stint_time(model, encoder, DRIVER, CIRCUIT, c3, pit2 + 1, TOTAL_LAPS)
+                total_time = time_s1 + time_s2 + time_s3 + (PIT_LOSS_SECONDS * 2)
+                if total_time < best[3]:
+                    best = ((c1, c2, c3), pit1, pit2, total_time)
+    return best
+
+
+if __name__ == "__main__":
+    model, encoder = REGISTRY.get()
+
+    t0 = time.perf_counter()
+    legacy = legacy_search(model, encoder)
+    t_legacy = time.perf_counter() - t0
+
+    STINT_TABLES.clear()     # time the cold path, table build included
+    t0 = time.perf_counter()
+    T = lap_time_tensor(model, encoder, DRIVER, CIRCUIT)
+    plans = optimize_pit_stops(T, PIT_LOSS_SECONDS, max_stops=3)
+    t_dp = time.perf_counter() - t0
+    two_stop = next(p for p in plans if p['stops'] == 2)
+
+    print(f"{DRIVER} @ {CIRCUIT}, {TOTAL_LAPS} laps, pit loss {PIT_LOSS_SECONDS}s")
+    print(f"Legacy 2-stop search: {t_legacy*1000:9.1f} ms | {' -> '.join(legacy[0])} pit {legacy[1]},{legacy[2]} | {legacy[3]:.2f}s")
+    print(f"DP (0-3 stops):       {t_dp*1000:9.1f} ms | {' -> '.join(two_stop['compounds'])} pit "
+          f"{','.join(map(str, two_stop['pit_laps']))} | {two_stop['total_time']:.2f}s (best 2-stop)")
+    print(f"Overall optimum: {plans[0]['stops']} stop {' -> '.join(plans[0]['compounds'])} "
+          f"pit {plans[0]['pit_laps']} | {plans[0]['total_time']:.2f}s")
+    print(f"Speedup: {t_legacy / t_dp:.0f}x | 2-stop improvement: {legacy[3] - two_stop['total_time']:.2f}s")
@@ -0,0 +1,80 @@
+"""
+Benchmark: N concurrent simulated sessions, each scoring one stint at a time
+(`STINT_ROWS` feature rows per call, the race_engine.stint_time shape).
+Direct = every session calls model.predict itself.
+Broker = every session calls predict_broker.PredictBroker, with no extra window
+(flush as soon as the model is free) and with a 2 ms window.
+Both for the sklearn model in models/ and its compiled FastPredictor.
+Reports throughput (calls/s, rows/s) and per-call p50 / p99 latency.
+
+Run from the repo root:  python benchmarks/bench_predict_broker.py
+"""
+import os
+import sys
+import threading
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import joblib
+import numpy as np
+
+from src.fast_predictor import FastPredictor
+from src.features import predict_matrix
+from src.predict_broker import PredictBroker
+from src.race_engine import lap_matrix
+
+SESSIONS = (1, 4, 16)
+WINDOWS_MS = (0, 2)
+CALLS_PER_SESSION = 60
+STINT_ROWS = 20
+
+
+def stint_rows(encoder, i):
+    lap = np.arange(1 + i % 30, 1 + i % 30 + STINT_ROWS)
+    return lap_matrix(encoder, 'VER', 'Bahrain', ['SOFT', 'MEDIUM', 'HARD'][i % 3], lap, lap - lap[0])
+
+
+def run_sessions(model, jobs, n_sessions):
+    latencies = [[] for _ in range(n_sessions)]
+    start = threading.Barrier(n_sessions + 1)
+
+    def session(k):
+        start.wait()
+        for X in jobs:
+            t0 = time.perf_counter()
+            predict_matrix(model, X)
+            latencies[k].append(time.perf_counter() - t0)
+
+    threads = [threading.Thread(target=session, args=(k,)) for k in range(n_sessions)]
+    for t in threads:
+        t.start()
+    start.wait()
+    t0 = time.perf_counter()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - t0
+    lat = np.concatenate(latencies) * 1000
+    return len(lat) / elapsed, np.percentile(lat, 50), np.percentile(lat, 99)
+
+
+if __name__ == "__main__":
+    model = joblib.load(os.path.join('models', 'f1_baseline_model.pkl'))
+    encoder = joblib.load(os.path.join('models', 'encoder.pkl'))
+    jobs = [stint_rows(encoder, i) for i in range(CALLS_PER_SESSION)]
+    print(f"{CALLS_PER_SESSION} calls x {STINT_ROWS} rows per session, {os.cpu_count()} cores\n")
+
+    for label, target in ((type(model).__name__, model), ("FastPredictor", FastPredictor(model))):
+        print(f"--- {label} ---")
+        print(f"{'sessions':>8} {'mode':>12} {'calls/s':>9} {'rows/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'calls/batch':>12}")
+        for n in SESSIONS:
+            rate, p50, p99 = run_sessions(target, jobs, n)
+            print(f"{n:>8} {'direct':>12} {rate:9.0f} {rate * STINT_ROWS:9.0f} {p50:8.2f} {p99:8.2f}")
+            for window in WINDOWS_MS:
+                broker = PredictBroker(target, max_wait=window / 1000)
+                rate, p50, p99 = run_sessions(broker, jobs, n)
+                broker.close()
+                per_batch = broker.stats()['requests_per_batch']
+                mode = f"broker {window}ms"
+                print(f"{n:>8} {mode:>12} {rate:9.0f} {rate * STINT_ROWS:9.0f} {p50:8.2f} {p99:8.2f} {per_batch:12.1f}")
+        print()
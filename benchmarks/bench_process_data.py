@@ -0,0 +1,99 @@
+"""
+Benchmark: process_data over synthetic raw race folders (3 seasons from the fake ingest provider).
+Legacy = every folder re-read and re-merged, per-row LapTime apply, one big in-memory concat + CSV.
+Incremental = process_data: hashed inputs, process pool, one partition per race.
+Cold run, warm run (nothing changed) and one edited race.
+
+Run from the repo root:  python benchmarks/bench_process_data.py
+"""
+import contextlib
+import glob
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+import pandas as pd
+
+from benchmarks.bench_ingest import FakeProvider
+from src.dataset_store import TRAINING, list_partitions, read_dataset
+from src.ingest_data import ingest
+from src.process_data import RAW_FILES, load_index, process_data, process_race, timedelta_seconds
+
+YEARS = range(2023, 2026)
+
+
+def legacy_process(raw_dir, output_file):
+    all_races_data = []
+    for folder in glob.glob(os.path.join(raw_dir, '*')):
+        if not all(os.path.exists(os.path.join(folder, name)) for name in RAW_FILES):
+            continue
+        merged = process_race(folder)
+        # The old per-row conversion (process_race now parses the whole column at once)
+        merged['LapTime_Seconds'] = merged['LapTime'].apply(lambda x: pd.to_timedelta(x).total_seconds())
+        all_races_data.append(merged)
+    pd.concat(all_races_data, ignore_index=True).to_csv(output_file, index=False)
+
+
+def timed_quiet(fn):
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+        t0 = time.perf_counter()
+        out = fn()
+        return time.perf_counter() - t0, out
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as work:
+        os.chdir(work)   # process_data reads data/raw and writes data/store relative to the cwd
+        timed_quiet(lambda: ingest(YEARS, FakeProvider(delay=0), workers=4, raw_dir='data/raw'))
+        n_races = len([p for p in glob.glob(os.path.join('data', 'raw', '*')) if os.path.isdir(p)])
+        cores = os.cpu_count() or 1
+        print(f"process_data: {n_races} races ({cores} cores)")
+
+        t_legacy, _ = timed_quiet(lambda: legacy_process('data/raw', 'legacy.csv'))
+        print(f"Legacy full rebuild:         {t_legacy:6.2f}s")
+
+        laps = pd.read_csv(glob.glob(os.path.join('data', 'raw', '*', 'laps.csv'))[0])['LapTime']
+        t0 = time.perf_counter()
+        slow = laps.apply(lambda x: pd.to_timedelta(x).total_seconds())
+        t_apply = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        fast = timedelta_seconds(laps)
+        t_vec = time.perf_counter() - t0
+        assert (slow - fast).abs().max() < 1e-6
+        print(f"LapTime, one race:           {t_apply*1000:6.1f}ms apply -> {t_vec*1000:.1f}ms column ({t_apply / t_vec:.0f}x)")
+
+        for workers in sorted({1, cores}):
+            t_cold, done = timed_quiet(lambda: process_data(workers=workers))
+            assert done == n_races
+            print(f"Incremental cold, {workers} workers: {t_cold:6.2f}s ({t_legacy / t_cold:.1f}x)")
+            if workers != cores:
+                for path in glob.glob(os.path.join('data', 'store', TRAINING, '*')):
+                    os.rename(path, path + '.old')   # force the next cold run
+
+        t_warm, done = timed_quiet(lambda: process_data())
+        assert done == 0
+        print(f"Incremental, nothing new:    {t_warm:6.2f}s ({t_legacy / t_warm:.0f}x)")
+
+        edited = sorted(glob.glob(os.path.join('data', 'raw', '*', 'weather.csv')))[-1]
+        edited = os.path.dirname(edited)
+        weather = pd.read_csv(os.path.join(edited, 'weather.csv'))
+        weather['AirTemp'] += 1
+        weather.to_csv(os.path.join(edited, 'weather.csv'), index=False)
+        t_one, done = timed_quiet(lambda: process_data())
+        assert done == 1
+        print(f"Incremental, one race edited:{t_one:6.2f}s ({t_legacy / t_one:.0f}x)")
+
+        legacy = pd.read_csv('legacy.csv')
+        assert len(read_dataset(TRAINING, columns=['RaceID'])) == len(legacy)
+
+        # A deleted raw folder drops its partition, and the index remembers it
+        shutil.rmtree(edited)
+        assert timed_quiet(lambda: process_data())[1] == 0
+        assert os.path.basename(edited) not in load_index()
+        assert len(list_partitions(TRAINING)) == n_races - 1
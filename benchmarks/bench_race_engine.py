@@ -0,0 +1,64 @@
+"""
+Benchmark: lap-by-lap race simulation.
+Legacy path = one feature row + model.predict per lap (old simulate_race.py).
+Engine path = race_engine.simulate, every lap of every race in one predict.
+
+Run from the repo root:  python benchmarks/bench_race_engine.py
+"""
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+from src.artifacts import REGISTRY
+from src.features import FEATURES, encode_features, fuel_weight
+from src.race_engine import TOTAL_LAPS, simulate
+
+DRIVER = "VER"
+CIRCUIT = "Sakhir"
+PIT_LOSS = 22.0
+
+
+def legacy_race(model, encoder, start_compound, pit_lap, end_compound):
+    total = 0.0
+    compound, age = start_compound, 0
+    for lap in range(1, TOTAL_LAPS + 1):
+        row = pd.DataFrame([{
+            'Driver': DRIVER, 'Circuit': CIRCUIT, 'Compound': compound, 'TyreLife': age,
+            'LapNumber': lap, 'Rainfall': 0, 'FuelWeight': float(fuel_weight(lap, TOTAL_LAPS)),
+        }])[FEATURES]
+        total += model.predict(encode_features(encoder, row))[0]
+        if lap == pit_lap:
+            total += PIT_LOSS
+            compound, age = end_compound, 0
+        else:
+            age += 1
+    return total
+
+
+def timed(fn, repeats=3):
+    best = float('inf')
+    out = None
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, out
+
+
+if __name__ == "__main__":
+    model, encoder = REGISTRY.get()
+    window = range(10, 51)
+    races = [{'driver': DRIVER, 'circuit': CIRCUIT, 'compounds': ['MEDIUM', 'HARD'], 'pit_laps': [p]} for p in window]
+
+    t_legacy, legacy = timed(lambda: [legacy_race(model, encoder, 'MEDIUM', p, 'HARD') for p in window], repeats=1)
+    t_engine, traces = timed(lambda: simulate(model, encoder, races, PIT_LOSS))
+
+    max_diff = max(abs(a - t['total_time']) for a, t in zip(legacy, traces))
+    print(f"{len(races)} races x {TOTAL_LAPS} laps ({DRIVER} @ {CIRCUIT}, MEDIUM -> HARD, pit 10..50)")
+    print(f"Legacy (predict per lap):   {t_legacy*1000:9.1f} ms")
+    print(f"Engine (one predict):       {t_engine*1000:9.1f} ms")
+    print(f"Speedup: {t_legacy / t_engine:.0f}x | max |diff| = {max_diff:.2e}s")
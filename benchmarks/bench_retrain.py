@@ -0,0 +1,107 @@
+"""
+Benchmark: auto_updater retraining, replaying race weekends one at a time.
+Full = the original GradientBoostingRegressor(n_estimators=100) refit on everything.
+Fast = retrain.py: histogram boosting with early stopping, warm-started from last
+week's model once every Driver/Circuit/Compound has been seen (cold fit otherwise).
+MAE is on 20% of each race's laps held out of every fit (all races so far, and the new one).
+
+Two calendars: data/store/race_data (every race is a new circuit, so fast = cold
+histogram fits) and a synthetic 2-season one whose second season revisits the circuits.
+
+Run from the repo root:  python benchmarks/bench_retrain.py
+"""
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+from src.dataset_store import RACE_DATA, read_dataset
+from src.features import fuel_weight
+from src.retrain import encode, retrain
+from src.schema import RACE_COLUMNS, RACE_DTYPES, apply_schema
+
+FEATURE_COLS = RACE_COLUMNS[:-1]
+DRIVERS = ["VER", "HAD", "RUS", "ANT", "LEC", "HAM", "NOR", "PIA", "ALO", "STR", "GAS",
+           "COL", "SAI", "ALB", "LAW", "LIN", "OCO", "BEA", "HUL", "BOR"]
+ROUNDS = 10
+RACE_LAPS = 55
+
+
+def synthetic_race(season, round_num):
+    """Lap times with a circuit base, driver pace, tyre wear and fuel burn."""
+    rng = np.random.default_rng(season * 100 + round_num)
+    lap = np.tile(np.arange(1, RACE_LAPS + 1), len(DRIVERS)).astype(float)
+    driver = np.repeat(DRIVERS, RACE_LAPS)
+    hard = lap > 25
+    tyre_life = np.where(hard, lap - 25, lap)
+    pace = np.repeat(np.linspace(0, 1.5, len(DRIVERS)), RACE_LAPS)
+    fuel = fuel_weight(lap, RACE_LAPS)
+    lap_time = (75 + 2.5 * round_num + pace + np.where(hard, 0.04, 0.08) * tyre_life
+                + 0.03 * fuel + rng.normal(0, 0.3, len(lap)))
+    return pd.DataFrame({
+        'Driver': driver, 'Circuit': f"Track_{round_num}", 'Compound': np.where(hard, 'HARD', 'MEDIUM'),
+        'TyreLife': tyre_life, 'LapNumber': lap, 'Rainfall': 0, 'FuelWeight': fuel, 'LapTime': lap_time,
+        'Season': season, 'Round': round_num,
+    })
+
+
+def held_out_mae(model, encoder, df):
+    return float(np.mean(np.abs(model.predict(encode(encoder, df, FEATURE_COLS)) - df['LapTime'].to_numpy())))
+
+
+def replay(df, first_updates):
+    """Fits both modes after every race; races before `first_updates` are the initial history."""
+    df = df.copy()
+    for col in ['Driver', 'Circuit', 'Compound']:
+        df[col] = df[col].astype(str)
+    df['LapTime'] = df['LapTime'].fillna(90)
+    df['race'] = df['Season'].astype(int) * 100 + df['Round'].astype(int)
+    test = np.random.default_rng(0).random(len(df)) < 0.2
+    races = sorted(df['race'].unique())
+    print(f"{len(races)} races, {len(df)} laps ({test.sum()} held out)")
+    print(f"{'race':>8} {'mode':>5} {'fit':>11} {'trees':>10} {'time (s)':>9} {'MAE all':>8} {'MAE new':>8}")
+
+    totals = {'full': [0.0, []], 'fast': [0.0, []]}
+    fast_model = fast_encoder = None
+    for race in races:
+        if race < first_updates and race != races[0] and race != max(r for r in races if r < first_updates):
+            continue   # initial history: fitted once, at its last race
+        seen = (df['race'] <= race).to_numpy()
+        train = df[seen & ~test].reset_index(drop=True)
+        new_rows = (train['race'] == race).to_numpy()
+        held_out = df[seen & test]
+
+        for mode in ('full', 'fast'):
+            if mode == 'full':
+                model, encoder, report = retrain(train, FEATURE_COLS, 'LapTime', new_rows, mode='full')
+            else:
+                model, encoder, report = retrain(train, FEATURE_COLS, 'LapTime', new_rows,
+                                                 fast_model, fast_encoder, mode='fast')
+                fast_model, fast_encoder = model, encoder
+            mae_all = held_out_mae(model, encoder, held_out)
+            mae_new = held_out_mae(model, encoder, held_out[held_out['race'] == race])
+            if race >= first_updates:
+                totals[mode][0] += report['seconds']
+                totals[mode][1].append(mae_all)
+            trees = f"{report['trees_before']}->{report['trees']}"
+            print(f"{race:>8} {mode:>5} {report['fit']:>11} {trees:>10} {report['seconds']:9.2f} "
+                  f"{mae_all:8.3f} {mae_new:8.3f}")
+
+    (t_full, mae_full), (t_fast, mae_fast) = totals['full'], totals['fast']
+    print(f"Weekly updates: full {t_full:.2f}s, fast {t_fast:.2f}s ({t_full / t_fast:.1f}x faster); "
+          f"mean held-out MAE full {np.mean(mae_full):.3f}s, fast {np.mean(mae_fast):.3f}s\n")
+
+
+if __name__ == "__main__":
+    print(f"=== {RACE_DATA} ===")
+    stored = apply_schema(read_dataset(RACE_DATA, columns=RACE_COLUMNS + ['Season', 'Round']),
+                          RACE_COLUMNS, RACE_DTYPES, RACE_DATA)
+    replay(stored, first_updates=0)
+
+    print("=== synthetic, 2 seasons (weekly updates through season 2) ===")
+    synthetic = pd.concat([synthetic_race(s, r) for s in (2024, 2025) for r in range(1, ROUNDS + 1)],
+                          ignore_index=True)
+    replay(synthetic, first_updates=2025 * 100 + 1)
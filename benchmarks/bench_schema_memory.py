@@ -0,0 +1,142 @@
+"""
+Benchmark: memory of the training pipeline's load + encode step on a multi-season
+feature dataset (synthetic f1_training_data_v2.csv, same columns as add_feature writes).
+Before = pd.read_csv of everything (object strings, float64/int64).
+After  = schema.read_csv_typed of the model columns (categories, float32/int16).
+Peak = tracemalloc peak over load + year split + encoding, each the way
+train_baseline does it (before: encoder.fit_transform; after: fit on the distinct
+rows + features.feature_matrix).
+Also checks that FuelWeight, computed the way add_feature does from a typed
+(float32 LapNumber) race, round-trips through the CSV and the trained encoder:
+every predict-time features.fuel_weight value must hit a category, not -1.
+
+Run from the repo root:  python benchmarks/bench_schema_memory.py
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import OrdinalEncoder
+
+from src.features import feature_matrix, fuel_weight, get_codes, race_fuel_weight
+from src.schema import MODEL_COLUMNS, TRAINING_COLUMNS, apply_schema, memory_mb, read_csv_typed
+from src.training_matrix import load_matrix, write_matrix
+
+SEASONS = (2021, 2022, 2023, 2024, 2025)
+ROUNDS = 24
+RACE_LAPS = 57
+DRIVERS = ["VER", "HAD", "RUS", "ANT", "LEC", "HAM", "NOR", "PIA", "ALO", "STR", "GAS",
+           "COL", "SAI", "ALB", "LAW", "LIN", "OCO", "BEA", "HUL", "BOR"]
+FEATURES = ['Driver', 'Circuit', 'Compound', 'TyreLife', 'LapNumber', 'Rainfall', 'FuelWeight']
+
+
+def race(season, round_num):
+    rng = np.random.default_rng(season * 100 + round_num)
+    n = RACE_LAPS * len(DRIVERS)
+    lap = np.tile(np.arange(1, RACE_LAPS + 1), len(DRIVERS))
+    lap_time = 90 + rng.normal(0, 0.8, n)
+    circuit = f"Track_{round_num}"
+    return pd.DataFrame({
+        'Driver': np.repeat(DRIVERS, RACE_LAPS),
+        'LapTime': pd.to_timedelta(lap_time, unit='s').astype(str),
+        'LapNumber': lap.astype(float),
+        'Stint': (lap > 25).astype(float) + 1,
+        'PitOutTime': np.nan,
+        'PitInTime': np.nan,
+        'Compound': np.where(lap > 25, 'HARD', 'MEDIUM'),
+        'TyreLife': np.where(lap > 25, lap - 25, lap).astype(float),
+        'TrackStatus': 1,
+        'Time': pd.to_timedelta(lap * 90.0, unit='s').astype(str),
+        'AirTemp': 25 + rng.normal(0, 1, n),
+        'TrackTemp': 35 + rng.normal(0, 2, n),
+        'Rainfall': False,
+        'Abbreviation': np.repeat(DRIVERS, RACE_LAPS),
+        'TeamName': np.repeat([f"Team {i // 2}" for i in range(len(DRIVERS))], RACE_LAPS),
+        'FinalPosition': np.repeat(np.arange(1, len(DRIVERS) + 1), RACE_LAPS).astype(float),
+        'GridPosition': np.repeat(np.arange(1, len(DRIVERS) + 1), RACE_LAPS).astype(float),
+        'Status': 'Finished',
+        'RaceID': f"{season}_{round_num:02d}_{circuit}",
+        'Year': season,
+        'Round': round_num,
+        'Circuit': circuit,
+        'LapTime_Seconds': lap_time,
+        'FuelWeight': 110 * (1 - lap / RACE_LAPS),
+    })
+
+
+def before():
+    df = pd.read_csv(path)
+    train = df[df['Year'] < 2025].copy()
+    encoder = OrdinalEncoder(handle_unknown='use_encoded_value', unknown_value=-1)
+    X = encoder.fit_transform(train[FEATURES])
+    return df, encoder, X
+
+
+def after():
+    df = read_csv_typed(path, MODEL_COLUMNS, required=MODEL_COLUMNS)
+    train = df[df['Year'] < 2025].copy()
+    encoder = OrdinalEncoder(handle_unknown='use_encoded_value', unknown_value=-1)
+    encoder.fit(train[FEATURES].drop_duplicates())
+    X = feature_matrix(encoder, train[FEATURES])
+    return df, encoder, X
+
+
+def check_fuel_round_trip(work):
+    """add_feature's FuelWeight -> CSV -> matrix encoder, then encode predict-time fuel weights."""
+    laps = pd.concat([race(2024, 1), race(2025, 1)])
+    laps = apply_schema(laps[TRAINING_COLUMNS], TRAINING_COLUMNS)   # as add_feature reads a partition
+    laps['FuelWeight'] = race_fuel_weight(laps)
+    csv_path, matrix_dir = os.path.join(work, 'fuel.csv'), os.path.join(work, 'fuel_matrix')
+    laps.to_csv(csv_path, index=False)
+    write_matrix(read_csv_typed(csv_path, MODEL_COLUMNS, required=MODEL_COLUMNS), matrix_dir)
+    encoder = load_matrix(matrix_dir, source=None).encoder()
+
+    predicted = fuel_weight(np.arange(1, RACE_LAPS + 1), RACE_LAPS)   # as race_engine / predict_lap
+    codes = np.asarray(get_codes(encoder).encode('FuelWeight', predicted))
+    assert (codes >= 0).all(), f"{(codes < 0).sum()} of {len(codes)} predict-time fuel weights are unknown"
+    return len(codes)
+
+
+def measure(step):
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    df, encoder, X = step()
+    elapsed = time.perf_counter() - t0
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return df, encoder, X, elapsed, peak / 1e6
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as work:
+        path = os.path.join(work, 'f1_training_data_v2.csv')   # read by before() / after()
+        pd.concat([race(s, r) for s in SEASONS for r in range(1, ROUNDS + 1)]).to_csv(path, index=False)
+        print(f"Dataset: {len(SEASONS)} seasons, {os.path.getsize(path) / 1e6:.0f} MB CSV")
+
+        old_df, old_enc, old_X, t_old, peak_old = measure(before)
+        new_df, new_enc, new_X, t_new, peak_new = measure(after)
+
+        # Same model input: identical codes and numeric features. Category values too, except
+        # that plain read_csv can be 1 ulp off on FuelWeight where read_csv_typed is exact
+        assert np.array_equal(old_X, new_X)
+        assert all(np.allclose(a, b, rtol=1e-15, atol=0) if a.dtype.kind == 'f' else
+                   np.array_equal(a.astype(object), b.astype(object))
+                   for a, b in zip(old_enc.categories_, new_enc.categories_))
+
+        print(f"{'':24}{'before':>10}{'after':>10}")
+        print(f"{'rows x columns':24}{f'{old_df.shape[0]}x{old_df.shape[1]}':>10}{f'{new_df.shape[0]}x{new_df.shape[1]}':>10}")
+        print(f"{'frame memory (MB)':24}{memory_mb(old_df):10.1f}{memory_mb(new_df):10.1f}"
+              f"   ({memory_mb(old_df) / memory_mb(new_df):.1f}x smaller)")
+        same_cols = list(new_df.columns)
+        print(f"{'  same 9 columns (MB)':24}{memory_mb(old_df[same_cols]):10.1f}{memory_mb(new_df):10.1f}")
+        print(f"{'peak load+encode (MB)':24}{peak_old:10.1f}{peak_new:10.1f}   ({peak_old / peak_new:.1f}x lower)")
+        print(f"{'time (s)':24}{t_old:10.2f}{t_new:10.2f}")
+        n_fuel = check_fuel_round_trip(work)
+        print(f"\nFuelWeight round trip: {n_fuel} of {n_fuel} predict-time values are encoder categories")
+        print("Per-column dtypes after:", {c: str(t) for c, t in new_df.dtypes.items()})
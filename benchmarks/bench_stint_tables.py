@@ -0,0 +1,54 @@
+"""
+Benchmark: stint time lookups.
+Legacy = DataFrame + model.predict for every [start_lap, end_lap] asked.
+Tables = one vectorized predict per (driver, circuit), then O(1) prefix-sum lookups.
+
+Run from the repo root:  python benchmarks/bench_stint_tables.py
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.artifacts import REGISTRY
+from src.stint_tables import STINT_TABLES, TOTAL_LAPS, get_stint_tables
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from bench_pit_optimizer import get_stint_time as legacy_stint_time
+
+DRIVER = "VER"
+CIRCUIT = "Sakhir"
+COMPOUNDS = ['SOFT', 'MEDIUM', 'HARD']
+N_QUERIES = 300
+
+
+if __name__ == "__main__":
+    model, encoder = REGISTRY.get()
+    rng = random.Random(7)
+    queries = []
+    for _ in range(N_QUERIES):
+        start = rng.randint(1, TOTAL_LAPS - 5)
+        end = rng.randint(start, TOTAL_LAPS)
+        queries.append((rng.choice(COMPOUNDS), start, end))
+
+    t0 = time.perf_counter()
+    legacy = [legacy_stint_time(model, encoder, DRIVER, CIRCUIT, c, s, e) for c, s, e in queries]
+    t_legacy = time.perf_counter() - t0
+
+    STINT_TABLES.clear()
+    t0 = time.perf_counter()
+    tables = get_stint_tables(model, encoder, DRIVER, CIRCUIT, COMPOUNDS)
+    t_build = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    fast = [tables[c].stint_time(s, e - s + 1) for c, s, e in queries]
+    t_lookup = time.perf_counter() - t0
+
+    max_diff = max(abs(a - b) for a, b in zip(legacy, fast))
+    print(f"{N_QUERIES} random stints for {DRIVER} @ {CIRCUIT}")
+    print(f"Legacy per-stint predict: {t_legacy*1000:9.1f} ms total | {t_legacy/N_QUERIES*1e6:9.1f} us/stint")
+    print(f"Table build (3 compounds):{t_build*1000:9.1f} ms (once)")
+    print(f"Table lookups:            {t_lookup*1000:9.3f} ms total | {t_lookup/N_QUERIES*1e6:9.2f} us/stint")
+    print(f"max |diff| = {max_diff:.2e}s | cache: {STINT_TABLES.stats()}")
@@ -0,0 +1,76 @@
+"""
+Benchmark: train_baseline's data loading on a multi-season feature dataset
+(synthetic f1_training_data_v2.csv, same generator as bench_schema_memory.py).
+CSV    = read_csv_typed + outlier filter + encoder fit + feature_matrix + year split.
+Matrix = training_matrix.load_matrix (np.load mmap) + split (views of the file).
+Both end with the arrays handed to model.fit; the result must be identical.
+
+Run from the repo root:  python benchmarks/bench_training_matrix.py
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import OrdinalEncoder
+
+from benchmarks.bench_schema_memory import ROUNDS, race
+from src.features import FEATURES, feature_matrix
+from src.schema import MODEL_COLUMNS, read_csv_typed
+from src.training_matrix import TEST_YEAR, load_matrix, write_matrix
+
+SEASONS = (2021, 2022, 2023, 2024, 2025)
+
+
+def from_csv(path):
+    df = read_csv_typed(path, MODEL_COLUMNS, required=MODEL_COLUMNS)
+    median_time = df['LapTime_Seconds'].median()
+    df = df[df['LapTime_Seconds'] < median_time * 1.15]
+    train_data = df[df['Year'] < TEST_YEAR]
+    test_data = df[df['Year'] == TEST_YEAR]
+    encoder = OrdinalEncoder(handle_unknown='use_encoded_value', unknown_value=-1)
+    encoder.fit(train_data[FEATURES].drop_duplicates())
+    return (feature_matrix(encoder, train_data[FEATURES]), train_data['LapTime_Seconds'].to_numpy(),
+            feature_matrix(encoder, test_data[FEATURES]), test_data['LapTime_Seconds'].to_numpy())
+
+
+def from_matrix(matrix_dir):
+    matrix = load_matrix(matrix_dir, source=None)
+    return matrix.split()
+
+
+def timed(fn, *args, repeat=3):
+    best, out = float('inf'), None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn(*args)
+        best = min(best, time.perf_counter() - t0)
+    return best, out
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as work:
+        path = os.path.join(work, 'f1_training_data_v2.csv')
+        matrix_dir = os.path.join(work, 'matrix')
+        pd.concat([race(s, r) for s in SEASONS for r in range(1, ROUNDS + 1)]).to_csv(path, index=False)
+
+        t0 = time.perf_counter()
+        n_rows = write_matrix(read_csv_typed(path, MODEL_COLUMNS, required=MODEL_COLUMNS), matrix_dir, source=path)
+        t_build = time.perf_counter() - t0
+        npy_mb = sum(os.path.getsize(os.path.join(matrix_dir, f)) for f in os.listdir(matrix_dir)) / 1e6
+        print(f"Dataset: {len(SEASONS)} seasons, {os.path.getsize(path) / 1e6:.0f} MB CSV -> "
+              f"{n_rows} rows, {npy_mb:.1f} MB of .npy (pipeline build {t_build:.2f}s, once)")
+
+        t_csv, (Xa, ya, Xb, yb) = timed(from_csv, path)
+        t_mat, (Ma, ma, Mb, mb) = timed(from_matrix, matrix_dir)
+        assert np.array_equal(Xa, Ma) and np.array_equal(Xb, Mb)
+        assert np.array_equal(ya, ma) and np.array_equal(yb, mb)
+        assert isinstance(Ma, np.memmap)
+
+        print(f"CSV parse + filter + encode: {t_csv * 1000:8.1f}ms")
+        print(f"mmap matrix + split:         {t_mat * 1000:8.1f}ms ({t_csv / t_mat:.0f}x faster)")
+        print(f"Train {len(ma)} x {Ma.shape[1]} / test {len(mb)} rows, identical arrays")
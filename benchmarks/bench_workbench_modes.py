@@ -0,0 +1,80 @@
+"""
+Benchmark: the Workbench report (one driver at one circuit, all 3 qualifying modes).
+Per mode = the old tab: three solve_grid_cached calls, one per mode.
+One pass = a single call with all three modes (app.run_scenario_analysis now):
+one cache round trip, one stint-table lookup, shared cost matrices, and modes
+left with the same tyre sets searched once.
+Cold = stint tables and inventory searches not in memory yet (first look at a
+driver / circuit), each run with its own empty result cache.
+
+Run from the repo root:  python benchmarks/bench_workbench_modes.py
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.artifacts import REGISTRY
+from src.calendar_utils import DRIVER_GRID
+from src.inventory_solver import INVENTORY_MEMO, MODES
+from src.result_cache import ResultCache, solve_grid_cached
+from src.stint_tables import STINT_TABLES
+
+CIRCUITS = ["Sakhir", "Jeddah", "Monza", "Silverstone", "Spa", "Suzuka"]
+PIT_LOSS = 21.0   # not the circuits' own, so the season table does not answer either
+
+
+class CountingModel:
+    """Counts the rows the solver sends to the model."""
+
+    def __init__(self, model):
+        self.model = model
+        self.rows = 0
+        self.feature_names_in_ = getattr(model, 'feature_names_in_', None)
+        self.n_features_in_ = getattr(model, 'n_features_in_', None)
+
+    def predict(self, X):
+        self.rows += len(X)
+        return self.model.predict(X)
+
+
+def per_mode(model, encoder, driver, circuit, cache):
+    return {mode: solve_grid_cached(model, encoder, [driver], [circuit], [mode], pit_loss=PIT_LOSS,
+                                    cache=cache)[(driver, circuit, mode)]
+            for mode in MODES}
+
+
+def one_pass(model, encoder, driver, circuit, cache):
+    results = solve_grid_cached(model, encoder, [driver], [circuit], MODES, pit_loss=PIT_LOSS, cache=cache)
+    return {mode: results[(driver, circuit, mode)] for mode in MODES}
+
+
+def run(fn, model, encoder, cache):
+    elapsed, answers = 0.0, []
+    for i, circuit in enumerate(CIRCUITS):
+        driver = DRIVER_GRID[i]
+        STINT_TABLES.clear()
+        INVENTORY_MEMO.clear()
+        t0 = time.perf_counter()
+        answers.append(fn(model, encoder, driver, circuit, cache))
+        elapsed += time.perf_counter() - t0
+    return elapsed / len(CIRCUITS), answers
+
+
+if __name__ == "__main__":
+    fast_model, encoder = REGISTRY.get(fast=True)
+    print(f"Workbench report, {len(MODES)} modes, cold, mean of {len(CIRCUITS)} driver/circuit pairs")
+
+    model = CountingModel(fast_model)
+    with tempfile.TemporaryDirectory() as work:
+        t_old, old = run(per_mode, model, encoder, ResultCache(os.path.join(work, 'old.sqlite')))
+        rows_old, model.rows = model.rows, 0
+        t_new, new = run(one_pass, model, encoder, ResultCache(os.path.join(work, 'new.sqlite')))
+        rows_new = model.rows
+    assert old == new
+
+    print(f"Per mode (3 calls): {t_old * 1000:7.1f}ms  {rows_old / len(CIRCUITS):8.0f} rows predicted")
+    print(f"One pass (1 call):  {t_new * 1000:7.1f}ms  {rows_new / len(CIRCUITS):8.0f} rows predicted "
+          f"({t_old / t_new:.1f}x)")
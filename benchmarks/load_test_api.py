@@ -0,0 +1,112 @@
+"""
+Load test for src/api_server.py: CLIENTS concurrent keep-alive clients send a
+mix of scenario (80%), grid (15%) and next-race (5%) queries.
+Pass 1 uses unique pit losses (every scenario is solved); pass 2 replays the
+same requests (answered from the result cache). Reports requests/sec, status
+codes and latency percentiles per endpoint.
+
+Run from the repo root:  python benchmarks/load_test_api.py [http://host:port]
+(without a URL it starts the server in-process on a free port)
+"""
+import http.client
+import json
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from urllib.parse import urlparse
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from src.calendar_utils import DRIVER_GRID
+from src.inventory_solver import MODES
+
+CLIENTS = 8
+REQUESTS_PER_CLIENT = 25
+CIRCUITS = ["Sakhir", "Jeddah", "Monza", "Silverstone", "Spa", "Suzuka", "Monaco", "Interlagos"]
+
+
+def workload(seed):
+    rng = random.Random(seed)
+    requests = []
+    for i in range(REQUESTS_PER_CLIENT):
+        pit_loss = round(18 + rng.random() * 10, 6)   # unique -> a real solve on the first pass
+        roll = rng.random()
+        if roll < 0.80:
+            body = {'driver': rng.choice(DRIVER_GRID), 'circuit': rng.choice(CIRCUITS),
+                    'mode': rng.choice(MODES), 'pit_loss': pit_loss}
+            requests.append(('POST', '/v1/scenario', body))
+        elif roll < 0.95:
+            body = {'circuit': rng.choice(CIRCUITS), 'drivers': rng.sample(DRIVER_GRID, 10), 'pit_loss': pit_loss}
+            requests.append(('POST', '/v1/grid', body))
+        else:
+            requests.append(('GET', '/v1/next-race', None))
+    return requests
+
+
+def client(host, port, requests, results):
+    conn = http.client.HTTPConnection(host, port, timeout=120)
+    for method, path, body in requests:
+        data = None if body is None else json.dumps(body).encode()
+        t0 = time.perf_counter()
+        conn.request(method, path, body=data, headers={'Content-Type': 'application/json'})
+        response = conn.getresponse()
+        response.read()
+        results.append((path, response.status, time.perf_counter() - t0))
+    conn.close()
+
+
+def run_pass(host, port, workloads):
+    results = []
+    threads = [threading.Thread(target=client, args=(host, port, w, results)) for w in workloads]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results, time.perf_counter() - t0
+
+
+def report(label, results, elapsed):
+    print(f"\n{label}: {len(results)} requests in {elapsed:.2f}s = {len(results) / elapsed:.1f} req/s, "
+          f"status {dict(Counter(status for _, status, _ in results))}")
+    print(f"{'endpoint':>14} {'n':>5} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    by_path = defaultdict(list)
+    for path, _, seconds in results:
+        by_path[path].append(seconds * 1000)
+        by_path['all'].append(seconds * 1000)
+    for path, lat in by_path.items():
+        p50, p95, p99 = np.percentile(lat, [50, 95, 99])
+        print(f"{path:>14} {len(lat):>5} {p50:8.1f} {p95:8.1f} {p99:8.1f} {max(lat):8.1f}")
+
+
+if __name__ == "__main__":
+    server = None
+    if len(sys.argv) > 1:
+        url = urlparse(sys.argv[1])
+        host, port = url.hostname, url.port or 80
+    else:
+        from src.api_server import QUEUE, WORKERS, make_server
+
+        server = make_server(port=0)
+        host, port = server.server_address[:2]
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        print(f"In-process server on {host}:{port} ({WORKERS} solver workers, queue {QUEUE})")
+
+    conn = http.client.HTTPConnection(host, port, timeout=120)
+    conn.request('GET', '/health')
+    print("health:", conn.getresponse().read().decode())   # also loads the model before timing
+    conn.close()
+
+    workloads = [workload(seed) for seed in range(CLIENTS)]
+    print(f"{CLIENTS} clients x {REQUESTS_PER_CLIENT} requests")
+    report("Pass 1 (solved)", *run_pass(host, port, workloads))
+    report("Pass 2 (cached)", *run_pass(host, port, workloads))
+
+    if server is not None:
+        server.shutdown()
+        server.RequestHandlerClass.pool.shutdown()
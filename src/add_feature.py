@@ -1,31 +1,53 @@
-import pandas as pd
 import os
+import sys
 
-# 1. Load the existing data
-input_path = os.path.join('data', 'processed', 'f1_training_data.csv')
+# Allow `python src/add_feature.py` from the repo root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.dataset_store import TRAINING, dataset_columns, iter_partitions
+from src.features import race_fuel_weight
+from src.schema import MODEL_COLUMNS, TRAINING_COLUMNS, apply_schema, read_csv_typed
+from src.training_matrix import MATRIX_DIR, write_matrix
+
+# 1. Stream the existing data (process_data's partitioned store), one race at a time
 output_path = os.path.join('data', 'processed', 'f1_training_data_v2.csv')
+os.makedirs(os.path.dirname(output_path), exist_ok=True)
+tmp_path = output_path + '.tmp'
+
+print("Loading data + engineering features...")
+# Races can lack a column (e.g. a speed trap): every chunk gets the same header
+columns = [c for c in dataset_columns(TRAINING) if c != 'Season']
+n_laps = 0
+sample = None
+for df in iter_partitions(TRAINING):
+    df = apply_schema(df.reindex(columns=columns), TRAINING_COLUMNS, name='training partition')
 
-print("Loading data...")
-df = pd.read_csv(input_path)
+    # 2. Calculate "Race Progress" and "Fuel Load"
+    # Logic: We find the max laps for each specific race to know how 'done' the race is.
+    # Every partition is one race, so its own max LapNumber is the race length
 
-# 2. Calculate "Race Progress" and "Fuel Load"
-# Logic: We find the max laps for each specific race to know how 'done' the race is.
-print("Engineering features...")
+    # F1 cars start with ~110kg of fuel. 
+    # We assume they finish with near 0kg.
+    # Formula: CurrentFuel = 110kg * (1 - (CurrentLap / TotalLaps))
+    # (in float64, as at predict time: LapNumber is float32 here)
+    df['FuelWeight'] = race_fuel_weight(df)
 
-# Group by RaceID to find the total laps for that specific race
-race_lengths = df.groupby('RaceID')['LapNumber'].max().rename('TotalLaps')
-df = df.merge(race_lengths, on='RaceID', how='left')
+    # 3. Append to the new "Smart" dataset (header only once)
+    df.to_csv(tmp_path, index=False, mode='a' if n_laps else 'w', header=not n_laps)
+    n_laps += len(df)
+    if sample is None:
+        sample = df[['LapNumber', 'FuelWeight']].head()
 
-# F1 cars start with ~110kg of fuel. 
-# We assume they finish with near 0kg.
-# Formula: CurrentFuel = 110kg * (1 - (CurrentLap / TotalLaps))
-df['FuelWeight'] = 110 * (1 - (df['LapNumber'] / df['TotalLaps']))
+if not n_laps:
+    print("No processed races found! Run process_data.py first.")
+    sys.exit(1)
 
-# 3. Save the new "Smart" dataset
-# We drop 'TotalLaps' because the AI doesn't need to know it directly, 
-# it just needs the FuelWeight result.
-df.drop(columns=['TotalLaps'], inplace=True)
+os.replace(tmp_path, output_path)
+print(f"SUCCESS! Enhanced data ({n_laps} laps) saved to: {output_path}")
+print(f"Added 'FuelWeight' column. Sample values:\n{sample}")
 
-df.to_csv(output_path, index=False)
-print(f"SUCCESS! Enhanced data saved to: {output_path}")
-print(f"Added 'FuelWeight' column. Sample values:\n{df[['LapNumber', 'FuelWeight']].head()}")
\ No newline at end of file
+# 4. Pre-encoded float32 matrix for train_baseline (memory-mapped .npy, see training_matrix.py),
+# built from the CSV just written so the loop above only ever holds one race
+model_df = read_csv_typed(output_path, MODEL_COLUMNS, required=MODEL_COLUMNS)
+n_rows = write_matrix(model_df, source=output_path)
+print(f"Training matrix ({n_rows} clean laps) saved to: {MATRIX_DIR}")
@@ -2,7 +2,9 @@ import random
 import re
 import pandas as pd
 from src.physics import get_pit_loss
-from src.solve_strategy_battle import solve_scenario, load_artifacts
+from src.artifacts import REGISTRY
+from src.result_cache import solve_grid_cached
+from src.parallel_grid import DEFAULT_WORKERS, simulate_grid
 
 # "Personality" responses
 GREETINGS = [
@@ -28,7 +30,13 @@ DRIVERS = {
 
 class RaceEngineerAI:
     def __init__(self):
-        self.model, self.encoder = load_artifacts()
+        # Warm the shared registry now so a missing model fails at startup
+        REGISTRY.get()
+
+    # Always ask the registry so a retrained model is picked up without a restart.
+    # One get() per query: model and encoder always come from the same load.
+    def artifacts(self):
+        return REGISTRY.get(fast=True, batched=True)
 
     def extract_constraints(self, text):
         """
@@ -133,11 +141,13 @@ class RaceEngineerAI:
     def run_single_strategy(self, driver_code, driver_name, circuit_name, constraints=[]):
         try:
             # Pass constraints to the solver
-            strat, desc, time = solve_scenario(
-                self.model, self.encoder, driver_code, circuit_name, 
-                get_pit_loss(circuit_name), 1.5, "", "Standard Q3", 
-                fast_mode=False, tyre_constraints=constraints # <--- PASSING CONSTRAINTS
+            model, encoder = self.artifacts()
+            results = solve_grid_cached(
+                model, encoder, [driver_code], [circuit_name], ["Standard Q3"],
+                pit_loss=get_pit_loss(circuit_name), traffic=1.5,
+                tyre_constraints=constraints # <--- PASSING CONSTRAINTS
             )
+            strat, desc, time = results[(driver_code, circuit_name, "Standard Q3")]
             
             constraint_note = ""
             if constraints:
@@ -158,11 +168,13 @@ class RaceEngineerAI:
         try:
             results = []
             pit_loss = get_pit_loss(circuit_name)
+            # Whole grid: one batched prediction, or spread over F1_GRID_WORKERS processes
+            grid = simulate_grid(
+                list(DRIVERS.values()), [circuit_name], ["Standard Q3"],
+                workers=DEFAULT_WORKERS, pit_loss=pit_loss, traffic=1.5
+            )
             for name, code in DRIVERS.items():
-                strat, desc, time = solve_scenario(
-                    self.model, self.encoder, code, circuit_name, 
-                    pit_loss, 1.5, "", "Standard Q3", fast_mode=True
-                )
+                strat, desc, time = grid[(code, circuit_name, "Standard Q3")]
                 bias = 0
                 if code in ["VER", "HAM", "LEC", "NOR"]: bias = -5
                 elif code in ["BOT", "HUL", "OCO"]: bias = +10
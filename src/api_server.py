@@ -0,0 +1,269 @@
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+# Allow `python src/api_server.py` from the repo root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.artifacts import REGISTRY
+from src.calendar_utils import DRIVER_GRID, get_next_race
+from src.inventory_solver import MODES
+from src.parallel_grid import DEFAULT_WORKERS, simulate_grid
+from src.physics import get_pit_loss
+from src.result_cache import solve_grid_cached
+
+# --- CONFIGURATION ---
+HOST = os.environ.get('F1_API_HOST', '127.0.0.1')
+PORT = int(os.environ.get('F1_API_PORT', '8600'))
+WORKERS = int(os.environ.get('F1_API_WORKERS', '4'))     # solves running at once
+QUEUE = int(os.environ.get('F1_API_QUEUE', '16'))        # solves allowed to wait for a worker
+TIMEOUT = float(os.environ.get('F1_API_TIMEOUT', '30'))  # seconds before a request gets 504
+MAX_BODY = 64 * 1024
+TRAFFIC = 1.5   # same traffic factor as the app
+
+
+class ApiError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+# --- QUERIES (plain dict in, JSON-ready dict out) ---
+def _text(body, name, default=None):
+    value = body.get(name, default)
+    if not isinstance(value, str) or not value.strip():
+        raise ApiError(400, f"'{name}' must be a non-empty string")
+    return value.strip()
+
+
+def _mode(body):
+    mode = body.get('mode', MODES[0])
+    if mode not in MODES:
+        raise ApiError(400, f"'mode' must be one of {MODES}")
+    return mode
+
+
+def _pit_loss(body, circuit):
+    value = body.get('pit_loss')
+    if value is None:
+        return get_pit_loss(circuit)
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not 0 <= value <= 60:
+        raise ApiError(400, "'pit_loss' must be a number of seconds (0-60)")
+    return float(value)
+
+
+def _result(driver, result):
+    strategy, description, race_time = result
+    return {'driver': driver, 'strategy': strategy, 'description': description, 'race_time': race_time}
+
+
+def scenario(body):
+    """Best strategy for one driver / circuit / qualifying mode (the Workbench query)."""
+    driver, circuit, mode = _text(body, 'driver').upper(), _text(body, 'circuit'), _mode(body)
+    pit_loss = _pit_loss(body, circuit)
+    model, encoder = REGISTRY.get(fast=True, batched=True)
+    results = solve_grid_cached(model, encoder, [driver], [circuit], [mode], pit_loss=pit_loss, traffic=TRAFFIC)
+    return {'circuit': circuit, 'mode': mode, 'pit_loss': pit_loss, **_result(driver, results[(driver, circuit, mode)])}
+
+
+def grid(body):
+    """Every driver's best strategy at one circuit, fastest first."""
+    circuit, mode = _text(body, 'circuit'), _mode(body)
+    drivers = body.get('drivers', DRIVER_GRID)
+    if not isinstance(drivers, list) or not drivers or not all(isinstance(d, str) and d.strip() for d in drivers):
+        raise ApiError(400, "'drivers' must be a non-empty list of driver codes")
+    drivers = list(dict.fromkeys(d.strip().upper() for d in drivers))
+    pit_loss = _pit_loss(body, circuit)
+    results = simulate_grid(drivers, [circuit], [mode], workers=DEFAULT_WORKERS, pit_loss=pit_loss, traffic=TRAFFIC)
+    rows = sorted((_result(d, results[(d, circuit, mode)]) for d in drivers), key=lambda row: row['race_time'])
+    for position, row in enumerate(rows, 1):
+        row['position'] = position
+        row['gap'] = row['race_time'] - rows[0]['race_time']
+    return {'circuit': circuit, 'mode': mode, 'pit_loss': pit_loss, 'classification': rows}
+
+
+def next_race(body):
+    """The next calendar race and its predicted classification (the Next Race tab, without the app's bias)."""
+    race = get_next_race()
+    return {'round': race['round'], 'date': race['date'], **grid({**body, 'circuit': race['circuit']})}
+
+
+def health(body):
+    return {'status': 'ok', 'model_version': REGISTRY.version, **SERVER_STATS.snapshot()}
+
+
+ROUTES = {
+    ('GET', '/health'): (health, False),
+    ('POST', '/v1/scenario'): (scenario, True),
+    ('POST', '/v1/grid'): (grid, True),
+    ('GET', '/v1/next-race'): (next_race, True),
+    ('POST', '/v1/next-race'): (next_race, True),
+}
+
+
+# --- CONCURRENCY ---
+class SolverPool:
+    """
+    Bounded pool for the solves: WORKERS run at once, up to QUEUE more wait,
+    anything beyond that is rejected straight away (503) instead of piling up.
+    A caller waits at most `timeout` seconds (504); the solve itself still
+    finishes in the background and lands in the result cache.
+    """
+
+    def __init__(self, workers=WORKERS, queue=QUEUE, timeout=TIMEOUT):
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='api-solver')
+        self._slots = threading.BoundedSemaphore(workers + queue)
+
+    def run(self, fn, body):
+        if not self._slots.acquire(blocking=False):
+            raise ApiError(503, "Server busy, retry later")
+        try:
+            future = self._executor.submit(fn, body)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeout:
+            raise ApiError(504, f"Timed out after {self.timeout:g}s")
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+class ServerStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+        self.in_flight = 0
+
+    def start(self):
+        with self._lock:
+            self.requests += 1
+            self.in_flight += 1
+
+    def finish(self, status):
+        with self._lock:
+            self.in_flight -= 1
+            if status >= 400:
+                self.errors += 1
+
+    def snapshot(self):
+        with self._lock:
+            return {'requests': self.requests, 'errors': self.errors, 'in_flight': self.in_flight}
+
+
+SERVER_STATS = ServerStats()
+
+
+# --- HTTP ---
+class ApiHandler(BaseHTTPRequestHandler):
+    server_version = 'F1StrategyAPI/1.0'
+    protocol_version = 'HTTP/1.1'   # keep-alive for clients that reuse connections
+    pool = None                     # set by make_server
+
+    def do_GET(self):
+        self._handle('GET')
+
+    def do_POST(self):
+        self._handle('POST')
+
+    def _read_raw(self):
+        """
+        Reads the request body off the socket before anything can fail, so a
+        kept-alive connection never has a previous body left in it.
+        Bodies that are too large (or unreadable) are not drained: the
+        connection is closed after the error instead.
+        """
+        try:
+            length = int(self.headers.get('Content-Length') or 0)
+        except ValueError:
+            self.close_connection = True
+            raise ApiError(400, "Invalid Content-Length")
+        if length > MAX_BODY or length < 0:
+            self.close_connection = True
+            raise ApiError(413, f"Body larger than {MAX_BODY} bytes")
+        return self.rfile.read(length) if length else b''
+
+    def _body(self, method, raw):
+        if method == 'GET':
+            query = parse_qs(urlparse(self.path).query)
+            return {key: values[-1] for key, values in query.items()}
+        if not raw:
+            return {}
+        try:
+            body = json.loads(raw)
+        except ValueError:
+            raise ApiError(400, "Body must be JSON")
+        if not isinstance(body, dict):
+            raise ApiError(400, "Body must be a JSON object")
+        return body
+
+    def _handle(self, method):
+        SERVER_STATS.start()
+        t0 = time.perf_counter()
+        status = 200
+        try:
+            raw = self._read_raw()
+            route = ROUTES.get((method, urlparse(self.path).path.rstrip('/') or '/'))
+            if route is None:
+                raise ApiError(404, f"No route for {method} {urlparse(self.path).path}")
+            fn, pooled = route
+            body = self._body(method, raw)
+            payload = self.pool.run(fn, body) if pooled else fn(body)
+        except ApiError as e:
+            status, payload = e.status, {'error': str(e)}
+        except FileNotFoundError as e:   # no model trained yet
+            status, payload = 503, {'error': str(e)}
+        except Exception as e:
+            status, payload = 500, {'error': f"{type(e).__name__}: {e}"}
+        payload['elapsed_ms'] = round((time.perf_counter() - t0) * 1000, 2)
+        self._send(status, payload)
+        SERVER_STATS.finish(status)
+
+    def _send(self, status, payload):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        if self.close_connection:
+            self.send_header('Connection', 'close')
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        if os.environ.get('F1_API_LOG'):
+            super().log_message(format, *args)
+
+
+def make_server(host=HOST, port=PORT, workers=WORKERS, queue=QUEUE, timeout=TIMEOUT):
+    """A ThreadingHTTPServer for the API (port 0 = any free port); call serve_forever() to run it."""
+    handler = type('BoundApiHandler', (ApiHandler,), {'pool': SolverPool(workers, queue, timeout)})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+if __name__ == "__main__":
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else PORT
+    REGISTRY.get(fast=True, batched=True)   # load + compile before the first request
+    server = make_server(port=port)
+    print(f"🏎️ Strategy API on http://{HOST}:{server.server_port} "
+          f"({WORKERS} workers, queue {QUEUE}, timeout {TIMEOUT:g}s)")
+    print("   POST /v1/scenario  {\"driver\": \"VER\", \"circuit\": \"Monza\", \"mode\": \"Standard Q3\"}")
+    print("   POST /v1/grid      {\"circuit\": \"Monza\"}      GET /v1/next-race      GET /health")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        server.RequestHandlerClass.pool.shutdown()
@@ -0,0 +1,132 @@
+import hashlib
+import os
+import threading
+import time
+import joblib
+from src.fast_predictor import compile_model
+from src.predict_broker import PredictBroker
+
+# --- PATHS ---
+MODEL_PATH = os.path.join('models', 'f1_baseline_model.pkl')
+ENCODER_PATH = os.path.join('models', 'encoder.pkl')
+
+
+def _file_hash(paths):
+    h = hashlib.sha256()
+    for path in paths:
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                h.update(chunk)
+    return h.hexdigest()
+
+
+def artifact_version(model_path=MODEL_PATH, encoder_path=ENCODER_PATH):
+    """Short content hash identifying a model+encoder pair (same value as REGISTRY.version)."""
+    return _file_hash((model_path, encoder_path))[:16]
+
+
+class ArtifactRegistry:
+    """
+    Process-wide cache for the trained model and encoder.
+    The pickles are read once; later calls only stat() the files and reload
+    when their mtime/size changed AND the content hash is actually different.
+    """
+
+    def __init__(self, model_path=MODEL_PATH, encoder_path=ENCODER_PATH):
+        self.model_path = model_path
+        self.encoder_path = encoder_path
+        self._lock = threading.Lock()
+        self._model = None
+        self._encoder = None
+        self._fast_model = None  # compiled FastPredictor for the loaded model
+        self._broker = None      # PredictBroker shared by every thread, over the fast model
+        self._stamp = None   # (mtime_ns, size) of both files at last check
+        self._hash = None    # sha256 of both files at last load
+        self._loads = 0
+        self._hits = 0
+        self._last_load_seconds = 0.0
+        self._loaded_at = None
+
+    def _file_stamp(self):
+        if not os.path.exists(self.model_path) or not os.path.exists(self.encoder_path):
+            raise FileNotFoundError("Model artifacts not found. Please wait for the auto-updater to run.")
+        stamp = []
+        for path in (self.model_path, self.encoder_path):
+            st = os.stat(path)
+            stamp.append((st.st_mtime_ns, st.st_size))
+        return tuple(stamp)
+
+    def _content_hash(self):
+        return _file_hash((self.model_path, self.encoder_path))
+
+    def get(self, fast=False, batched=False):
+        """
+        Returns (model, encoder), loading from disk only when the files changed.
+        fast=True returns the compiled FastPredictor instead of the sklearn model;
+        batched=True returns the process-wide PredictBroker over it, which merges
+        concurrent callers' predicts (Streamlit sessions) into batched calls.
+        """
+        with self._lock:
+            stamp = self._file_stamp()
+            if self._model is not None:
+                if stamp == self._stamp:
+                    self._hits += 1
+                    return self._result(fast, batched)
+
+                # Files were touched: only reload if the bytes really changed
+                digest = self._content_hash()
+                if digest == self._hash:
+                    self._stamp = stamp
+                    self._hits += 1
+                    return self._result(fast, batched)
+            else:
+                digest = self._content_hash()
+
+            t0 = time.perf_counter()
+            self._model = joblib.load(self.model_path)
+            self._encoder = joblib.load(self.encoder_path)
+            self._fast_model = None
+            if self._broker is not None:
+                self._broker.close()   # callers still holding it fall back to direct predicts
+                self._broker = None
+            self._last_load_seconds = time.perf_counter() - t0
+            self._stamp = stamp
+            self._hash = digest
+            self._loads += 1
+            self._loaded_at = time.time()
+            return self._result(fast, batched)
+
+    def _result(self, fast, batched=False):
+        if not fast and not batched:
+            return self._model, self._encoder
+        if self._fast_model is None:
+            self._fast_model = compile_model(self._model)
+        if not batched:
+            return self._fast_model, self._encoder
+        if self._broker is None:
+            self._broker = PredictBroker(self._fast_model)
+        return self._broker, self._encoder
+
+    @property
+    def version(self):
+        """Short content hash of the currently loaded artifacts."""
+        if self._hash is None:
+            self.get()
+        return self._hash[:16]
+
+    def stats(self):
+        return {
+            'loads': self._loads,
+            'cache_hits': self._hits,
+            'last_load_seconds': self._last_load_seconds,
+            'loaded_at': self._loaded_at,
+            'version': self._hash[:16] if self._hash else None,
+        }
+
+
+# One registry for the whole process (Streamlit reruns reuse the imported module)
+REGISTRY = ArtifactRegistry()
+
+
+def get_artifacts(fast=False, batched=False):
+    return REGISTRY.get(fast=fast, batched=batched)
@@ -1,110 +1,150 @@
-import fastf1
 import pandas as pd
 import joblib
 import os
+import sys
 from datetime import datetime
-from sklearn.ensemble import GradientBoostingRegressor
-from sklearn.preprocessing import LabelEncoder
-import sklearn.preprocessing
+
+# Allow `python src/auto_updater.py` from the repo root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.dataset_store import RACE_DATA, SessionIndex, list_partitions, read_dataset, write_partition
+from src.features import fuel_weight
+from src.result_cache import purge_stale
+from src.retrain import RETRAIN_MODE, print_report, retrain
+from src.schema import RACE_COLUMNS, RACE_DTYPES, apply_schema
 
 # --- CONFIG ---
-DATA_PATH = 'data/race_data.csv' 
 MODEL_PATH = 'models/f1_baseline_model.pkl'
 ENCODER_PATH = 'models/encoder.pkl'
+SESSION = 'R'   # race_data holds race sessions only (one partition per race)
 
-def get_last_completed_race():
-    """Finds the most recent race that has happened."""
-    today = datetime.now()
-    schedule = fastf1.get_event_schedule(today.year)
-    
-    past_races = schedule[schedule['EventDate'] < today]
-    if past_races.empty:
-        return None
-        
-    last_race = past_races.iloc[-1]
-    return last_race
+def completed_races(seasons, today=None):
+    """[(season, round, event name)] of every race in `seasons` that has happened, in order."""
+    import fastf1
 
-def update_dataset_and_train():
-    # 1. Load Existing Data
-    if os.path.exists(DATA_PATH):
-        df_main = pd.read_csv(DATA_PATH)
-        known_races = df_main['Circuit'].unique()
-    else:
-        print("⚠️ No existing dataset found. Starting fresh.")
-        df_main = pd.DataFrame()
-        known_races = []
-
-    # 2. Check Last Race
-    last_race = get_last_completed_race()
-    if last_race is None:
-        print("No races found.")
-        return
+    today = today or datetime.now()
+    races = []
+    for season in seasons:
+        schedule = fastf1.get_event_schedule(season, include_testing=False)
+        past_races = schedule[schedule['EventDate'] < today]
+        races += [(season, int(row['RoundNumber']), row['EventName']) for _, row in past_races.iterrows()]
+    return races
 
-    race_name = last_race['EventName']
-    if race_name in known_races:
-        print(f"✅ Data for {race_name} is already up to date. No action needed.")
-        return
+def missing_races(index, today=None):
+    """
+    Completed races the session index doesn't have yet: every one after the
+    first stored race (so missed weekends are backfilled), or just the latest
+    race when the store is empty. Decided from the index alone.
+    """
+    today = today or datetime.now()
+    stored = [(season, round_num) for season, round_num, session in index.keys() if session == SESSION]
+    seasons = range(stored[0][0] if stored else today.year, today.year + 1)
+    races = completed_races(seasons, today)
+    if not stored:
+        return races[-1:]
+    return [race for race in races if race[:2] > stored[0] and not index.has(race[0], race[1], SESSION)]
 
-    print(f"🚀 New Race Detected: {race_name}. Fetching data...")
-    
-    # --- FIX 1: Auto-create cache folder ---
-    if not os.path.exists('cache'):
-        os.makedirs('cache')
-    
-    # 3. Fetch Data via FastF1
-    fastf1.Cache.enable_cache('cache') 
-    session = fastf1.get_session(last_race.year, last_race['RoundNumber'], 'R')
+def fetch_race(season, round_num, race_name):
+    """Downloads one race session and returns its race_data rows."""
+    import fastf1
+
+    session = fastf1.get_session(season, round_num, SESSION)
     session.load()
     
     # --- FIX 2: Handle Missing 'Rainfall' Column ---
+    # Race length from every lap run, before the slow laps are filtered out
+    total_laps = int(session.laps['LapNumber'].max())
     laps = session.laps.pick_quicklaps()
     
     # Check if Rainfall exists; if not, assume DRY (False/0)
     if 'Rainfall' not in laps.columns:
         print("⚠️ 'Rainfall' data missing. Assuming Dry conditions.")
-        laps['Rainfall'] = False
+    return race_rows(laps, race_name, total_laps)
+
+def race_rows(laps, race_name, total_laps):
+    """
+    FastF1 laps -> race_data rows, column by column (no per-lap Python).
+    FuelWeight uses the race's real length (features.fuel_weight, same as training);
+    a missing Rainfall value counts as dry.
+    """
+    if 'Rainfall' in laps.columns:
+        rainfall = laps['Rainfall'].fillna(False).astype(bool).astype(int)
+    else:
+        rainfall = 0
+    lap_number = laps['LapNumber']
+    df = pd.DataFrame({
+        'Driver': laps['Driver'],
+        'Circuit': race_name,
+        'Compound': laps['Compound'],
+        'TyreLife': laps['TyreLife'],
+        'LapNumber': lap_number,
+        'Rainfall': rainfall,
+        'FuelWeight': fuel_weight(lap_number, total_laps),
+        'LapTime': pd.to_timedelta(laps['LapTime']).dt.total_seconds(),
+    }, columns=RACE_COLUMNS)
+    return apply_schema(df.reset_index(drop=True), RACE_COLUMNS, RACE_DTYPES, race_name)
+
+def update_dataset_and_train():
+    # 1. What's missing? (session index only - no partition is read)
+    index = SessionIndex(RACE_DATA)
+    if not index.sessions and list_partitions(RACE_DATA):
+        index.rebuild(SESSION)   # store written before the index existed
+    todo = missing_races(index)
+    if not todo:
+        print("✅ Race data is already up to date. No action needed.")
+        return
+
+    print(f"🚀 {len(todo)} new race(s) detected: {', '.join(name for _, _, name in todo)}. Fetching data...")
     
-    new_data = []
-    for index, lap in laps.iterrows():
-        new_data.append({
-            'Driver': lap['Driver'],
-            'Circuit': race_name,
-            'Compound': lap['Compound'],
-            'TyreLife': lap['TyreLife'],
-            'LapNumber': lap['LapNumber'],
-            'Rainfall': 1 if lap['Rainfall'] else 0,
-            'FuelWeight': max(0, 110 - (lap['LapNumber'] * 1.7)),
-            'LapTime': lap['LapTime'].total_seconds() 
-        })
-        
-    df_new = pd.DataFrame(new_data)
+    # --- FIX 1: Auto-create cache folder ---
+    if not os.path.exists('cache'):
+        os.makedirs('cache')
     
-    # 4. Append & Save
-    df_updated = pd.concat([df_main, df_new], ignore_index=True)
-    df_updated.to_csv(DATA_PATH, index=False)
-    print(f"✅ Added {len(df_new)} laps from {race_name}.")
+    # 2. Fetch every missing race via FastF1; one that fails is retried next run
+    import fastf1
+
+    fastf1.Cache.enable_cache('cache') 
+    added = []
+    for season, round_num, race_name in todo:
+        try:
+            df_new = fetch_race(season, round_num, race_name)
+        except Exception as e:
+            print(f"⚠️ Could not load {season} {race_name}: {e}")
+            continue
 
-    # 5. RETRAIN MODEL
-    print("🧠 Retraining Model...")
+        # 3. Save: writes only this race's partition, then indexes it
+        write_partition(df_new, RACE_DATA, season, round_num)
+        index.record(season, round_num, df_new, session=SESSION, event=race_name)
+        added.append((season, round_num))
+        print(f"✅ Added {len(df_new)} laps from {race_name}.")
+
+    if not added:
+        print("No new race data could be loaded.")
+        return
+
+    # 4. RETRAIN MODEL once for the whole batch
+    # (F1_RETRAIN_MODE: 'fast' adds trees to the last model, 'full' refits)
+    print(f"🧠 Retraining Model ({RETRAIN_MODE}) on {len(added)} new race(s)...")
     
-    le = LabelEncoder()
+    feature_cols = RACE_COLUMNS[:-1]
+    df_updated = apply_schema(read_dataset(RACE_DATA, columns=RACE_COLUMNS + ['Season', 'Round']),
+                              RACE_COLUMNS, RACE_DTYPES, RACE_DATA)
+
     for col in ['Driver', 'Circuit', 'Compound']:
-        df_updated[col] = df_updated[col].astype(str)
-        
-    df_encoded = df_updated.copy()
-    feature_cols = ['Driver', 'Circuit', 'Compound', 'TyreLife', 'LapNumber', 'Rainfall', 'FuelWeight']
-    
-    enc = sklearn.preprocessing.OrdinalEncoder(handle_unknown='use_encoded_value', unknown_value=-1)
-    df_encoded[feature_cols[:3]] = enc.fit_transform(df_updated[feature_cols[:3]])
-    
-    X = df_encoded[feature_cols]
-    y = df_updated['LapTime'].fillna(90)
-    
-    model = GradientBoostingRegressor(n_estimators=100)
-    model.fit(X, y)
+        # Stay categorical; a missing value is encoded as the string 'nan' like before
+        if df_updated[col].isna().any():
+            df_updated[col] = df_updated[col].cat.add_categories(['nan']).fillna('nan')
+    df_updated['LapTime'] = df_updated['LapTime'].fillna(90)
+
+    prev_model = joblib.load(MODEL_PATH) if os.path.exists(MODEL_PATH) else None
+    prev_encoder = joblib.load(ENCODER_PATH) if os.path.exists(ENCODER_PATH) else None
+    new_rows = pd.MultiIndex.from_frame(df_updated[['Season', 'Round']]).isin(added)
+    model, enc, report = retrain(df_updated, feature_cols, 'LapTime', new_rows, prev_model, prev_encoder)
+    print_report(report)
     
     joblib.dump(model, MODEL_PATH)
     joblib.dump(enc, ENCODER_PATH)
+    purge_stale(MODEL_PATH, ENCODER_PATH)
     print("🎉 Model Retrained and Saved!")
 
 if __name__ == "__main__":
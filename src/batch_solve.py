@@ -0,0 +1,288 @@
+import csv
+import json
+import os
+import sys
+import math
+from concurrent.futures import FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+
+# Allow `python src/batch_solve.py` from the repo root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.artifacts import REGISTRY
+from src.inventory_solver import MODES
+from src.physics import get_pit_loss
+
+# --- CONFIGURATION ---
+CHUNK_ROWS = 512             # scenarios per task
+# 0 = solve in this process; by default one worker per core beyond the one reading / writing the stream
+WORKERS = int(os.environ.get('F1_BATCH_WORKERS', max(0, (os.cpu_count() or 1) - 1)))
+IN_FLIGHT_PER_WORKER = 2     # chunks queued per worker (bounds memory)
+TRAFFIC = 1.5                # same traffic factor as the app (the solver has no traffic model)
+MAX_PIT_LOSS = 60            # seconds, same bound as the API
+OUTPUT_FIELDS = ['row', 'driver', 'circuit', 'mode', 'pit_loss', 'strategy', 'description', 'race_time', 'error']
+
+USAGE = """usage: python src/batch_solve.py INPUT [OUTPUT] [--workers N] [--chunk N]
+
+INPUT / OUTPUT: .csv or .jsonl files, '-' = stdin / stdout (JSONL). One scenario per row:
+  driver, circuit                       required
+  mode                                  'Standard Q3' (default), 'Knocked out in Q2', 'Knocked out in Q1'
+  pit_loss                              seconds, 0-60 (default: the circuit's)
+  constraints                           JSON list like the app's, or 'SOFT:NEW:0;HARD:USED:1' (compound:status:limit)
+Results are written as each chunk finishes (not in input order); 'row' is the input row number.
+Rows that cannot be solved (bad input, or no legal strategy with the allowed tyres) have an 'error'.
+A 'traffic' value is an error: the solver does not model traffic, so it would have no effect."""
+
+
+# --- INPUT ---
+def _parse_constraints(value):
+    if value is None or value == '':
+        return []
+    if isinstance(value, str):
+        value = value.strip()
+        if value.startswith('['):
+            value = json.loads(value)
+        else:
+            value = [dict(zip(('compound', 'status', 'limit'), part.split(':')))
+                     for part in value.split(';') if part.strip()]
+    constraints = []
+    for c in value:
+        if 'compound' not in c or 'limit' not in c:
+            raise ValueError(f"constraint {c} needs 'compound' and 'limit'")
+        constraints.append({'compound': str(c['compound']).strip().upper(),
+                            'status': str(c.get('status') or 'NEW').strip().upper(),
+                            'limit': int(c['limit'])})
+    return constraints
+
+
+def parse_row(raw):
+    """One input record -> scenario dict (raises ValueError on bad input)."""
+    driver = str(raw.get('driver') or '').strip().upper()
+    circuit = str(raw.get('circuit') or '').strip()
+    if not driver or not circuit:
+        raise ValueError("'driver' and 'circuit' are required")
+    mode = str(raw.get('mode') or MODES[0]).strip()
+    if mode not in MODES:
+        raise ValueError(f"unknown mode '{mode}'")
+    if raw.get('traffic') not in (None, ''):
+        raise ValueError("'traffic' is not supported: the solver has no traffic model")
+    return {'driver': driver, 'circuit': circuit, 'mode': mode, 'pit_loss': _pit_loss(raw.get('pit_loss'), circuit),
+            'constraints': _parse_constraints(raw.get('constraints'))}
+
+
+def _pit_loss(value, circuit):
+    if value in (None, ''):
+        return get_pit_loss(circuit)
+    try:
+        pit_loss = float(value)
+    except (TypeError, ValueError):
+        pit_loss = math.nan
+    if isinstance(value, bool) or not 0 <= pit_loss <= MAX_PIT_LOSS:   # also rejects nan / inf
+        raise ValueError(f"'pit_loss' must be a number of seconds (0-{MAX_PIT_LOSS}), got {value!r}")
+    return pit_loss
+
+
+def read_rows(f, fmt):
+    """Yields (row number, raw record) lazily from a CSV or JSONL stream."""
+    if fmt == 'csv':
+        for n, raw in enumerate(csv.DictReader(f), 1):
+            yield n, raw
+        return
+    n = 0
+    for line in f:
+        if line.strip():
+            n += 1
+            try:
+                yield n, json.loads(line)
+            except ValueError:
+                yield n, None
+
+
+def read_chunks(rows, chunk_rows=CHUNK_ROWS):
+    """Groups the row stream into (scenarios, errors) chunks of at most chunk_rows rows."""
+    scenarios, errors = [], []
+    for n, raw in rows:
+        try:
+            if not isinstance(raw, dict):
+                raise ValueError("row is not a JSON object")
+            scenarios.append((n, parse_row(raw)))
+        except (ValueError, TypeError) as e:
+            errors.append({'row': n, 'error': str(e)})
+        if len(scenarios) + len(errors) >= chunk_rows:
+            yield scenarios, errors
+            scenarios, errors = [], []
+    if scenarios or errors:
+        yield scenarios, errors
+
+
+# --- SOLVING ---
+def solve_chunk(scenarios):
+    """
+    Solves one chunk. Rows sharing circuit / pit loss / constraints go
+    through one solve_grid_cached call, so their stint tables come from a single
+    batched predict (and repeats are answered by the result cache).
+    """
+    from src.result_cache import solve_grid_cached
+
+    model, encoder = REGISTRY.get(fast=True)
+    groups = {}
+    for n, s in scenarios:
+        key = (s['circuit'], s['pit_loss'], json.dumps(s['constraints'], sort_keys=True))
+        groups.setdefault(key, []).append((n, s))
+
+    out = []
+    for (circuit, pit_loss, _), rows in groups.items():
+        drivers = list(dict.fromkeys(s['driver'] for _, s in rows))
+        modes = list(dict.fromkeys(s['mode'] for _, s in rows))
+        try:
+            results = solve_grid_cached(model, encoder, drivers, [circuit], modes, pit_loss=pit_loss,
+                                        traffic=TRAFFIC, tyre_constraints=rows[0][1]['constraints'] or None)
+        except Exception as e:
+            out.extend(_row(n, s, error=f"{type(e).__name__}: {e}") for n, s in rows)
+            continue
+        for n, s in rows:
+            strategy, description, race_time = results[(s['driver'], circuit, s['mode'])]
+            if strategy == "INVALID":   # no legal strategy with these sets (race_time is inf)
+                out.append(_row(n, s, strategy=strategy, description=description, race_time=None,
+                                error=description))
+            else:
+                out.append(_row(n, s, strategy=strategy, description=description, race_time=float(race_time)))
+    return out
+
+
+def _row(n, s, **result):
+    return {'row': n, 'driver': s['driver'], 'circuit': s['circuit'], 'mode': s['mode'],
+            'pit_loss': s['pit_loss'], **result}
+
+
+def solve_stream(chunks, workers=WORKERS):
+    """
+    Yields result rows as chunks finish. With workers > 0 the chunks go to the
+    shared process pool (parallel_grid.get_pool), at most
+    IN_FLIGHT_PER_WORKER per worker at a time, so memory does not grow with the input.
+    """
+    if not workers or workers <= 0:
+        for scenarios, errors in chunks:
+            yield from errors
+            yield from solve_chunk(scenarios)
+        return
+
+    from src.parallel_grid import _discard_pool, get_pool
+
+    pool = get_pool(workers)
+    pending = set()
+    chunks = iter(chunks)
+    exhausted = False
+    try:
+        while pending or not exhausted:
+            while not exhausted and len(pending) < workers * IN_FLIGHT_PER_WORKER:
+                try:
+                    scenarios, errors = next(chunks)
+                except StopIteration:
+                    exhausted = True
+                    break
+                yield from errors
+                if scenarios:
+                    pending.add(pool.submit(solve_chunk, scenarios))
+            if pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield from future.result()
+    except BrokenProcessPool:
+        _discard_pool(workers)
+        raise
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+# --- OUTPUT ---
+class ResultWriter:
+    """Writes result rows as JSONL or CSV, flushing after every batch so consumers see them straight away."""
+
+    def __init__(self, f, fmt):
+        self.f = f
+        self.csv = csv.DictWriter(f, OUTPUT_FIELDS, extrasaction='ignore') if fmt == 'csv' else None
+        if self.csv:
+            self.csv.writeheader()
+
+    def write(self, rows):
+        for row in rows:
+            if self.csv:
+                self.csv.writerow(row)
+            else:
+                self.f.write(json.dumps(row, allow_nan=False) + '\n')   # never emit NaN / Infinity
+        self.f.flush()
+
+
+def _format(path):
+    return 'csv' if path.lower().endswith('.csv') else 'jsonl'
+
+
+def run(input_path, output_path='-', workers=WORKERS, chunk_rows=CHUNK_ROWS, progress=None):
+    """Streams input_path through the solver into output_path. Returns (rows solved, rows with errors)."""
+    fin = sys.stdin if input_path == '-' else open(input_path, newline='')
+    fout = sys.stdout if output_path == '-' else open(output_path, 'w', newline='')
+    solved = failed = 0
+    try:
+        writer = ResultWriter(fout, 'jsonl' if output_path == '-' else _format(output_path))
+        chunks = read_chunks(read_rows(fin, 'jsonl' if input_path == '-' else _format(input_path)), chunk_rows)
+        batch = []
+        for row in solve_stream(chunks, workers):
+            batch.append(row)
+            if 'error' in row:
+                failed += 1
+            else:
+                solved += 1
+            if len(batch) >= chunk_rows:
+                writer.write(batch)
+                batch = []
+                if progress:
+                    progress(solved, failed)
+        writer.write(batch)
+    finally:
+        if fin is not sys.stdin:
+            fin.close()
+        if fout is not sys.stdout:
+            fout.close()
+    return solved, failed
+
+
+def main(argv):
+    args, workers, chunk_rows = [], WORKERS, CHUNK_ROWS
+    i = 0
+    while i < len(argv):
+        if argv[i] in ('--workers', '--chunk') and i + 1 < len(argv):
+            if argv[i] == '--workers':
+                workers = int(argv[i + 1])
+            else:
+                chunk_rows = max(1, int(argv[i + 1]))
+            i += 2
+        elif argv[i] in ('-h', '--help'):
+            print(USAGE)
+            return 0
+        else:
+            args.append(argv[i])
+            i += 1
+    if not 1 <= len(args) <= 2:
+        print(USAGE, file=sys.stderr)
+        return 2
+
+    REGISTRY.get(fast=True)   # fail fast if there is no model, before any worker starts
+    output_path = args[1] if len(args) > 1 else '-'
+
+    def progress(solved, failed):
+        print(f"   ... {solved} solved, {failed} errors", file=sys.stderr)
+
+    print(f"🏎️ Batch solving {args[0]} ({workers or 'no'} worker processes, {chunk_rows} rows per chunk)",
+          file=sys.stderr)
+    solved, failed = run(args[0], output_path, workers, chunk_rows, progress)
+    print(f"✅ Done: {solved} scenarios solved, {failed} rows with errors", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    # Call through the package so worker processes can unpickle solve_chunk
+    from src.batch_solve import main as batch_main
+
+    sys.exit(batch_main(sys.argv[1:]))
@@ -28,6 +28,12 @@ RACE_CALENDAR = [
     {"round": 24, "circuit": "Yas Marina", "date": "2026-12-06"}
 ]
 
+# 2026 Grid (driver codes, same order as the app)
+DRIVER_GRID = [
+    "VER", "HAD", "RUS", "ANT", "LEC", "HAM", "NOR", "PIA", "ALO", "STR", "GAS",
+    "COL", "SAI", "ALB", "LAW", "LIN", "OCO", "BEA", "HUL", "BOR", "PER", "BOT"
+]
+
 def get_next_race():
     """
     Finds the next race based on the current date.
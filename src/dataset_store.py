@@ -0,0 +1,210 @@
+import glob
+import hashlib
+import json
+import os
+import re
+import sys
+import numpy as np
+import pandas as pd
+
+# Allow `python src/dataset_store.py` from the repo root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.schema import CATEGORY_COLS
+
+# --- CONFIGURATION ---
+STORE_DIR = os.path.join('data', 'store')
+RACE_DATA = 'race_data'    # weekly auto_updater laps (was data/race_data.csv)
+TRAINING = 'training'      # process_data output (was data/processed/f1_training_data.csv)
+PART_FILE = 'part.parquet'
+SESSIONS_FILE = '_sessions.json'   # per-dataset index of ingested sessions
+PARTITION_RE = re.compile(r'season=(\d+)[\\/]round=(\d+)')
+
+
+# --- LAYOUT: <store>/<dataset>/season=YYYY/round=RR/part.parquet ---
+def partition_path(dataset, season, round_num, root=STORE_DIR):
+    return os.path.join(root, dataset, f"season={int(season)}", f"round={int(round_num):02d}", PART_FILE)
+
+
+def list_partitions(dataset, root=STORE_DIR):
+    """Sorted [(season, round)] stored for a dataset."""
+    parts = []
+    for path in glob.glob(os.path.join(root, dataset, 'season=*', 'round=*', PART_FILE)):
+        match = PARTITION_RE.search(path)
+        if match:
+            parts.append((int(match.group(1)), int(match.group(2))))
+    return sorted(parts)
+
+
+def has_partition(dataset, season, round_num, root=STORE_DIR):
+    return os.path.exists(partition_path(dataset, season, round_num, root))
+
+
+def write_partition(df, dataset, season, round_num, root=STORE_DIR):
+    """
+    Writes (or replaces) ONE race partition; nothing else in the store is touched.
+    The file is written next to its target and renamed in, so readers never see half a race.
+    """
+    path = partition_path(dataset, season, round_num, root)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + '.tmp'
+    df.to_parquet(tmp, index=False, compression='zstd')
+    os.replace(tmp, path)
+    return path
+
+
+def delete_partition(dataset, season, round_num, root=STORE_DIR):
+    path = partition_path(dataset, season, round_num, root)
+    if os.path.exists(path):
+        os.remove(path)
+
+
+def _selected(dataset, seasons, rounds, root):
+    seasons = None if seasons is None else {int(s) for s in seasons}
+    for season, round_num in list_partitions(dataset, root):
+        if seasons is not None and season not in seasons:
+            continue
+        if rounds is not None and round_num not in rounds and (season, round_num) not in rounds:
+            continue
+        yield season, round_num
+
+
+def _read_partition(dataset, season, round_num, columns, root):
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+
+    part = pq.ParquetFile(partition_path(dataset, season, round_num, root))
+    names = part.schema_arrow.names
+    table = part.read(columns=None if columns is None else [c for c in columns if c in names])
+    # Categorical columns (schema.py) come back as categories, also from partitions written before the schema
+    for i, field in enumerate(table.schema):
+        if field.name in CATEGORY_COLS and (pa.types.is_string(field.type) or pa.types.is_large_string(field.type)):
+            table = table.set_column(i, field.name, pc.dictionary_encode(table.column(i)))
+    for name, value in (('Season', season), ('Round', round_num)):
+        if name not in table.column_names:
+            table = table.append_column(name, pa.array(np.full(table.num_rows, value, dtype=np.int16)))
+    return table
+
+
+def read_dataset(dataset, columns=None, seasons=None, rounds=None, root=STORE_DIR):
+    """
+    Loads a dataset, reading only the partitions and columns asked for.
+    seasons / rounds: iterables to keep (None = all); rounds may also be
+    (season, round) pairs. Adds 'Season' and 'Round' from the partition path.
+    """
+    import pyarrow as pa
+
+    tables = [_read_partition(dataset, s, r, columns, root) for s, r in _selected(dataset, seasons, rounds, root)]
+    if not tables:
+        return pd.DataFrame(columns=list(columns) if columns else [])
+    # One conversion for the whole result; partitions written by older code may
+    # lack a column or store it with a wider type
+    df = pa.concat_tables(tables, promote_options='permissive').to_pandas()
+    if columns is not None:
+        df = df[[c for c in columns if c in df.columns]]
+    return df
+
+
+def iter_partitions(dataset, columns=None, seasons=None, rounds=None, root=STORE_DIR):
+    """Same selection as read_dataset, one race DataFrame at a time (memory stays at one partition)."""
+    for season, round_num in _selected(dataset, seasons, rounds, root):
+        df = _read_partition(dataset, season, round_num, columns, root).to_pandas()
+        if columns is not None:
+            df = df[[c for c in columns if c in df.columns]]
+        yield df
+
+
+def dataset_columns(dataset, root=STORE_DIR):
+    """Union of the column names of every partition, in first-seen order (reads only file footers)."""
+    import pyarrow.parquet as pq
+
+    columns = {}
+    for season, round_num in list_partitions(dataset, root):
+        for name in pq.read_schema(partition_path(dataset, season, round_num, root)).names:
+            columns.setdefault(name, None)
+    return list(columns)
+
+
+def frame_hash(df):
+    """Content hash of a frame's columns and values (index ignored)."""
+    h = hashlib.sha256(','.join(map(str, df.columns)).encode())
+    h.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return h.hexdigest()
+
+
+# --- SESSION INDEX ---
+class SessionIndex:
+    """
+    Which sessions a dataset already holds, in <store>/<dataset>/_sessions.json:
+    "YYYY/RR/<session>" -> {event, rows, hash, updated}. Lets ingest decide what
+    is new without reading any partition; rewritten atomically after each record.
+    """
+
+    def __init__(self, dataset, root=STORE_DIR):
+        self.dataset = dataset
+        self.root = root
+        self.path = os.path.join(root, dataset, SESSIONS_FILE)
+        self.sessions = {}
+        if os.path.exists(self.path):
+            with open(self.path) as f:
+                self.sessions = json.load(f)
+
+    @staticmethod
+    def key(season, round_num, session='R'):
+        return f"{int(season)}/{int(round_num):02d}/{session}"
+
+    def has(self, season, round_num, session='R'):
+        return self.key(season, round_num, session) in self.sessions
+
+    def keys(self):
+        """Sorted [(season, round, session)] in the index."""
+        out = []
+        for key in self.sessions:
+            season, round_num, session = key.split('/')
+            out.append((int(season), int(round_num), session))
+        return sorted(out)
+
+    def record(self, season, round_num, df, session='R', **info):
+        self.sessions[self.key(season, round_num, session)] = {
+            'rows': len(df), 'hash': frame_hash(df),
+            'updated': pd.Timestamp.now().isoformat(timespec='seconds'), **info}
+        self.save()
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp = self.path + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(self.sessions, f, indent=1, sort_keys=True)
+        os.replace(tmp, self.path)
+
+    def rebuild(self, session='R'):
+        """Re-indexes every stored partition (one full read; for stores that predate the index)."""
+        self.sessions = {}
+        for season, round_num in list_partitions(self.dataset, self.root):
+            df = _read_partition(self.dataset, season, round_num, None, self.root).to_pandas()
+            df = df.drop(columns=[c for c in ('Season', 'Round') if c in df.columns])
+            event = str(df['Circuit'].iloc[0]) if 'Circuit' in df.columns and len(df) else None
+            self.sessions[self.key(season, round_num, session)] = {
+                'event': event, 'rows': len(df), 'hash': frame_hash(df),
+                'updated': pd.Timestamp.now().isoformat(timespec='seconds')}
+        self.save()
+        return self
+
+
+def dataset_size(dataset, root=STORE_DIR):
+    """Total bytes of a dataset on disk."""
+    return sum(os.path.getsize(partition_path(dataset, s, r, root)) for s, r in list_partitions(dataset, root))
+
+
+if __name__ == "__main__":
+    print(f"\n--- 🗄️ DATASET STORE ({STORE_DIR}) ---")
+    for name in (RACE_DATA, TRAINING):
+        parts = list_partitions(name)
+        if not parts:
+            print(f"{name}: empty")
+            continue
+        rows = len(read_dataset(name, columns=['Season']))
+        print(f"{name}: {len(parts)} races, {rows} rows, {dataset_size(name) / 1024:.0f} KB "
+              f"({parts[0][0]} R{parts[0][1]} .. {parts[-1][0]} R{parts[-1][1]})")
+    print(f"{RACE_DATA} session index: {len(SessionIndex(RACE_DATA).sessions)} sessions")
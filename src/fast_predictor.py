@@ -0,0 +1,174 @@
+import numpy as np
+import pandas as pd
+
+# Supported model families (both live in models/ depending on which script trained it)
+# - GradientBoostingRegressor      (auto_updater.py)
+# - HistGradientBoostingRegressor  (train_baseline.py, auto_updater.py's fast retrain)
+
+# Above this many rows sklearn's compiled multi-threaded predict beats NumPy
+# traversal (see benchmarks/bench_fast_predictor.py), so big batches go there.
+BATCH_CROSSOVER = 256
+
+
+class FastPredictor:
+    """
+    Array-backed copy of a trained boosted-tree regressor.
+
+    Every tree is flattened into contiguous NumPy node arrays
+    (feature, threshold, left, right, value) and rows are pushed down all
+    trees at once with vectorized traversal, skipping sklearn's per-call
+    validation, DataFrame conversion and thread setup. Trees are summed in
+    the same order as sklearn, so results match bit-for-bit (or within float
+    rounding for exotic losses).
+
+    Duck-types `model.predict`, so it can be passed anywhere a model is.
+    Batches larger than `batch_crossover` rows are handed to the original
+    model (same numbers, less time); pass None to always traverse.
+    """
+
+    def __init__(self, model, batch_crossover=BATCH_CROSSOVER):
+        name = type(model).__name__
+        family = {cls.__name__ for cls in type(model).__mro__}   # subclasses count too
+        if 'GradientBoostingRegressor' in family:
+            self._compile_gb(model)
+        elif 'HistGradientBoostingRegressor' in family:
+            self._compile_hist(model)
+        else:
+            raise TypeError(f"FastPredictor does not support {name}")
+
+        self.feature_names_in_ = getattr(model, 'feature_names_in_', None)
+        self.n_features_in_ = model.n_features_in_
+        self.source = model
+        self.batch_crossover = batch_crossover
+
+    # --- COMPILERS ---
+    def _compile_gb(self, model):
+        trees = [est.tree_ for est in model.estimators_[:, 0]]
+        if model.init_ == 'zero':
+            self._init = 0.0
+        else:
+            self._init = float(np.ravel(model.init_.constant_)[0])
+        self._scale = model.learning_rate
+        self._dtype = np.float32          # sklearn trees compare float32 inputs
+        self._link = None
+
+        feature, threshold, left, right, value, missing_left, roots = [], [], [], [], [], [], []
+        offset = 0
+        depth = 0
+        for tree in trees:
+            n = tree.node_count
+            is_leaf = tree.children_left == -1
+            idx = np.arange(n)
+            roots.append(offset)
+            feature.append(np.where(is_leaf, 0, tree.feature))
+            threshold.append(np.where(is_leaf, -np.inf, tree.threshold))
+            left.append(tree.children_left + offset)
+            # Leaves point to themselves so every row can run a fixed number of steps
+            right.append(np.where(is_leaf, idx, tree.children_right) + offset)
+            value.append(tree.value[:, 0, 0])
+            missing = getattr(tree, 'missing_go_to_left', None)
+            missing_left.append(np.zeros(n, dtype=bool) if missing is None else missing.astype(bool) & ~is_leaf)
+            depth = max(depth, tree.max_depth)
+            offset += n
+
+        self._set_arrays(feature, threshold, left, right, value, missing_left, roots, depth)
+
+    def _compile_hist(self, model):
+        if getattr(model, '_preprocessor', None) is not None:
+            raise TypeError("FastPredictor does not support categorical HistGradientBoosting inputs")
+        if model.n_trees_per_iteration_ != 1:
+            raise TypeError("FastPredictor only supports single-output regressors")
+
+        self._init = float(np.ravel(model._baseline_prediction)[0])
+        self._scale = 1.0                 # leaf values already include the learning rate
+        self._dtype = np.float64
+        self._link = model._loss.link.inverse
+
+        feature, threshold, left, right, value, missing_left, roots = [], [], [], [], [], [], []
+        offset = 0
+        depth = 0
+        for (predictor,) in model._predictors:
+            nodes = predictor.nodes
+            if nodes['is_categorical'].any():
+                raise TypeError("FastPredictor does not support categorical splits")
+            n = len(nodes)
+            is_leaf = nodes['is_leaf'].astype(bool)
+            idx = np.arange(n)
+            roots.append(offset)
+            feature.append(np.where(is_leaf, 0, nodes['feature_idx']))
+            threshold.append(np.where(is_leaf, -np.inf, nodes['num_threshold']))
+            left.append(nodes['left'].astype(np.int64) + offset)
+            # Leaves point to themselves so every row can run a fixed number of steps
+            right.append(np.where(is_leaf, idx, nodes['right'].astype(np.int64)) + offset)
+            value.append(nodes['value'])
+            missing_left.append(nodes['missing_go_to_left'].astype(bool) & ~is_leaf)
+            depth = max(depth, int(nodes['depth'].max()))
+            offset += n
+
+        self._set_arrays(feature, threshold, left, right, value, missing_left, roots, depth)
+
+    def _set_arrays(self, feature, threshold, left, right, value, missing_left, roots, depth):
+        left = np.concatenate(left)
+        # Both sklearn layouts are depth-first: the left child is always node + 1
+        # (leaves never go left because their threshold is -inf)
+        internal = np.concatenate(threshold) != -np.inf
+        if not np.array_equal(left[internal], np.flatnonzero(internal) + 1):
+            raise TypeError("FastPredictor expects depth-first node layout")
+
+        self.feature = np.ascontiguousarray(np.concatenate(feature), dtype=np.int64)
+        self.threshold = np.ascontiguousarray(np.concatenate(threshold), dtype=np.float64)
+        self.right = np.ascontiguousarray(np.concatenate(right), dtype=np.int64)
+        self.value = np.ascontiguousarray(np.concatenate(value), dtype=np.float64)
+        self.missing_left = np.ascontiguousarray(np.concatenate(missing_left))
+        self.roots = np.asarray(roots, dtype=np.int64)
+        self.max_depth = depth
+
+    # --- PREDICTION ---
+    def _as_array(self, X):
+        if hasattr(X, 'columns'):
+            if self.feature_names_in_ is not None and list(X.columns) != list(self.feature_names_in_):
+                X = X[list(self.feature_names_in_)]
+            X = X.to_numpy(dtype=self._dtype)
+        X = np.asarray(X, dtype=self._dtype)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        return X
+
+    def predict(self, X):
+        if self.batch_crossover is not None and len(X) > self.batch_crossover:
+            if self.feature_names_in_ is not None and not hasattr(X, 'columns'):
+                X = pd.DataFrame(X, columns=self.feature_names_in_)
+            return self.source.predict(X)
+
+        X = self._as_array(X)
+        n_rows, n_features = X.shape
+        x_flat = X.ravel()
+        row_offset = (np.arange(n_rows) * n_features)[None, :]
+        has_nan = np.isnan(x_flat).any()
+
+        # nodes[t, i] = current node of row i in tree t
+        nodes = np.repeat(self.roots[:, None], n_rows, axis=1)
+        for _ in range(self.max_depth):
+            x = x_flat.take(row_offset + self.feature.take(nodes))
+            go_left = x <= self.threshold.take(nodes)
+            if has_nan:
+                go_left |= np.isnan(x) & self.missing_left.take(nodes)
+            nodes = np.where(go_left, nodes + 1, self.right.take(nodes))
+
+        # Sequential sum (init, tree 1, tree 2, ...) = sklearn's accumulation order
+        contrib = np.empty((len(self.roots) + 1, n_rows))
+        contrib[0] = self._init
+        np.multiply(self._scale, self.value.take(nodes), out=contrib[1:])
+        raw = np.cumsum(contrib, axis=0)[-1]
+
+        if self._link is not None:
+            raw = self._link(raw)
+        return raw
+
+
+def compile_model(model):
+    """Returns a FastPredictor for the model, or the model itself if it can't be compiled."""
+    try:
+        return FastPredictor(model)
+    except TypeError:
+        return model
@@ -0,0 +1,144 @@
+import threading
+import numpy as np
+import pandas as pd
+from src.fast_predictor import FastPredictor
+
+# --- MODEL FEATURE LAYOUT ---
+# Must match auto_updater.py / train_baseline.py EXACTLY
+CAT_COLS = ['Driver', 'Circuit', 'Compound']
+FEATURES = ['Driver', 'Circuit', 'Compound', 'TyreLife', 'LapNumber', 'Rainfall', 'FuelWeight']
+
+
+def fuel_weight(lap, total_laps):
+    """Linear burn: 110kg on the grid -> 0kg at the flag (same formula as add_feature.py)."""
+    return np.maximum(0.0, 110 * (1 - (np.asarray(lap, dtype=float) / total_laps)))
+
+
+def race_fuel_weight(laps):
+    """
+    FuelWeight for every lap of a lap frame, each race's length being its own max
+    LapNumber. Always float64 (even from float32 LapNumber): train_baseline's
+    encoder keys on the exact value that fuel_weight gives at predict time.
+    """
+    total_laps = laps.groupby('RaceID', observed=True)['LapNumber'].transform('max')
+    return fuel_weight(laps['LapNumber'], total_laps.to_numpy(dtype=float))
+
+
+class CategoryCodes:
+    """
+    The fitted OrdinalEncoder's categories_ compiled into plain lookup tables.
+    Gives the same codes as encoder.transform (including unknown_value=-1)
+    without pandas/sklearn validation on every call, and remembers which
+    unknown values it has seen.
+    """
+
+    def __init__(self, encoder):
+        names = getattr(encoder, 'feature_names_in_', None)
+        if names is None:
+            # auto_updater.py fits on the 3 categoricals, train_baseline.py on all 7 features
+            names = CAT_COLS if len(encoder.categories_) == len(CAT_COLS) else FEATURES
+        self.encoded_cols = list(names)
+
+        unknown = getattr(encoder, 'unknown_value', None)
+        self.unknown_value = float(unknown) if encoder.handle_unknown == 'use_encoded_value' else None
+
+        self._lookup = {}  # col -> {category: code}
+        for col, cats in zip(self.encoded_cols, encoder.categories_):
+            self._lookup[col] = {cat: float(i) for i, cat in enumerate(cats)}
+
+        self.unknowns = {col: set() for col in self.encoded_cols}
+        self._lock = threading.Lock()
+
+    def _unknown(self, col, values):
+        if self.unknown_value is None:
+            raise ValueError(f"Found unknown categories {sorted(map(str, values))} in column {col}")
+        with self._lock:
+            self.unknowns[col].update(values)
+        return self.unknown_value
+
+    def encode(self, col, values):
+        """Codes for one column; `values` may be a scalar or an array."""
+        if np.ndim(values) == 0:
+            code = self._lookup[col].get(values)
+            return self._unknown(col, [values]) if code is None else code
+
+        # Arrays: look up each DISTINCT value once, then scatter back
+        inverse, uniques = pd.factorize(np.asarray(values), use_na_sentinel=False)
+        lookup = self._lookup[col]
+        unique_codes = np.array([lookup.get(v, np.nan) for v in uniques], dtype=np.float64)
+        missing = np.isnan(unique_codes)
+        if missing.any():
+            unique_codes[missing] = self._unknown(col, set(np.asarray(uniques, dtype=object)[missing]))
+        return unique_codes[inverse]
+
+    def reset(self):
+        with self._lock:
+            self.unknowns = {col: set() for col in self.encoded_cols}
+
+    def report(self):
+        """{column: sorted unknown values seen so far} (only columns with unknowns)."""
+        return {col: sorted(map(str, vals)) for col, vals in self.unknowns.items() if vals}
+
+
+_CODES = {}
+_CODES_LOCK = threading.Lock()
+
+
+def get_codes(encoder):
+    """Compiled CategoryCodes for an encoder, built once per encoder object."""
+    with _CODES_LOCK:
+        entry = _CODES.get(id(encoder))
+        if entry is None or entry[0] is not encoder:
+            if len(_CODES) >= 8:
+                _CODES.clear()
+            entry = (encoder, CategoryCodes(encoder))
+            _CODES[id(encoder)] = entry
+        return entry[1]
+
+
+def feature_matrix(encoder, columns):
+    """
+    Builds the float64 model matrix (n_rows, 7) in FEATURES order.
+    `columns` maps each feature to a scalar or an array (a DataFrame works too);
+    encoded columns go through the compiled lookup tables.
+    """
+    codes = get_codes(encoder)
+    n_rows = len(columns) if hasattr(columns, 'columns') else \
+        max((len(columns[f]) for f in FEATURES if np.ndim(columns[f]) > 0), default=1)
+
+    X = np.empty((n_rows, len(FEATURES)))
+    for j, feature in enumerate(FEATURES):
+        values = columns[feature]
+        if feature in codes.encoded_cols and isinstance(getattr(values, 'dtype', None), pd.CategoricalDtype):
+            # Categorical column (schema.py): encode each category once, then take by code
+            cat_codes = values.cat.codes.to_numpy()
+            if (cat_codes >= 0).all():
+                X[:, j] = np.asarray(codes.encode(feature, values.cat.categories.to_numpy()))[cat_codes]
+                continue
+        if hasattr(values, 'to_numpy'):
+            values = values.to_numpy()
+        if feature in codes.encoded_cols:
+            values = codes.encode(feature, values)
+        X[:, j] = values
+    return X
+
+
+def predict_matrix(model, X):
+    """model.predict on a feature matrix (sklearn models get their feature names back)."""
+    if len(X) == 0:
+        return np.empty(0)
+    if isinstance(model, FastPredictor) or getattr(model, 'feature_names_in_', None) is None:
+        return model.predict(X)
+    return model.predict(pd.DataFrame(X, columns=model.feature_names_in_))
+
+
+def encode_features(encoder, df):
+    """Same result as encoder.transform on the feature frame, as a DataFrame in model order."""
+    return pd.DataFrame(feature_matrix(encoder, df), columns=FEATURES, index=df.index)
+
+
+def predict_rows(model, encoder, df):
+    """Encodes and predicts a whole feature frame in ONE model.predict call."""
+    if len(df) == 0:
+        return np.empty(0)
+    return predict_matrix(model, feature_matrix(encoder, df))
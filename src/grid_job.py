@@ -0,0 +1,83 @@
+import threading
+import time
+from src.artifacts import REGISTRY
+from src.parallel_grid import DEFAULT_WORKERS, simulate_grid
+from src.physics import get_pit_loss
+
+# --- CONFIGURATION ---
+STREAM_DRIVERS = 4   # drivers solved per step: results (and cancellation) land every few drivers
+
+
+class GridJob:
+    """
+    Solves a whole grid at one circuit on a background thread, a few drivers at
+    a time, so a UI can show the classification as it fills in instead of
+    blocking until the last driver. Each step goes through simulate_grid, so
+    cached drivers come back at once and fresh ones are cached for next time.
+    cancel() stops the job after the step in progress.
+    """
+
+    def __init__(self, drivers, circuit, mode="Standard Q3", pit_loss=None, traffic=1.5,
+                 workers=DEFAULT_WORKERS, step=STREAM_DRIVERS):
+        self.drivers = list(drivers)
+        self.circuit = circuit
+        self.mode = mode
+        self.pit_loss = get_pit_loss(circuit) if pit_loss is None else pit_loss
+        self.traffic = traffic
+        self.workers = workers
+        self.step = max(1, step, workers or 0)   # keep every worker busy
+        self.model_version = REGISTRY.version
+
+        self.status = 'queued'   # -> running -> done / cancelled / failed
+        self.error = None
+        self.started = None
+        self.finished = None
+        self._results = {}       # driver -> (strategy, desc, time)
+        self._lock = threading.Lock()
+        self._cancel = threading.Event()
+        self._thread = None
+
+    @property
+    def running(self):
+        return self.status in ('queued', 'running')
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name=f'grid-job-{self.circuit}', daemon=True)
+            self._thread.start()
+        return self
+
+    def cancel(self):
+        self._cancel.set()
+
+    def wait(self, timeout=None):
+        if self._thread is not None:
+            self._thread.join(timeout)
+        return not self.running
+
+    def _run(self):
+        self.status, self.started = 'running', time.time()
+        try:
+            for i in range(0, len(self.drivers), self.step):
+                if self._cancel.is_set():
+                    self.status = 'cancelled'
+                    return
+                group = self.drivers[i:i + self.step]
+                grid = simulate_grid(group, [self.circuit], [self.mode], workers=self.workers,
+                                     pit_loss=self.pit_loss, traffic=self.traffic)
+                with self._lock:
+                    for driver in group:
+                        self._results[driver] = grid[(driver, self.circuit, self.mode)]
+            self.status = 'done'
+        except Exception as e:
+            self.status, self.error = 'failed', f"{type(e).__name__}: {e}"
+        finally:
+            self.finished = time.time()
+
+    def snapshot(self):
+        """{status, error, done, total, seconds, results: {driver: (strategy, desc, time)}} at this moment."""
+        with self._lock:
+            results = dict(self._results)
+        end = self.finished or time.time()
+        return {'status': self.status, 'error': self.error, 'done': len(results), 'total': len(self.drivers),
+                'seconds': end - self.started if self.started else 0.0, 'results': results}
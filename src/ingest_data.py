@@ -1,99 +1,221 @@
-import fastf1
-import pandas as pd
+import json
 import os
 import shutil
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import pandas as pd
+
+# Allow `python src/ingest_data.py` from the repo root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.schema import RAW_LAP_COLUMNS, validate_columns
 
 # --- CONFIGURATION ---
 START_YEAR = 2023
 END_YEAR = 2025  # Since we are in Dec 2025, we get full history
 CACHE_DIR = 'cache'
 RAW_DATA_DIR = os.path.join('data', 'raw')
+MANIFEST_FILE = '_manifest.json'   # inside RAW_DATA_DIR
+TMP_PREFIX = '.tmp_'               # half-written race folders
+WORKERS = int(os.environ.get('F1_INGEST_WORKERS', '4'))  # concurrent session loads (I/O-bound)
 
-# 1. Setup Cache (Crucial for speed)
-if not os.path.exists(CACHE_DIR):
-    os.makedirs(CACHE_DIR)
-fastf1.Cache.enable_cache(CACHE_DIR)
+LAPS_COLS = ['Driver', 'LapTime', 'LapNumber', 'Stint', 'PitOutTime',
+             'PitInTime', 'Sector1Time', 'Sector2Time', 'Sector3Time',
+             'SpeedI1', 'SpeedI2', 'SpeedFL', 'SpeedST', 'Compound',
+             'TyreLife', 'FreshTyre', 'Team', 'TrackStatus', 'Time']
+RESULTS_COLS = ['Abbreviation', 'DriverNumber', 'TeamName', 'Position',
+                'GridPosition', 'Status', 'Points', 'Time']
 
-def process_season(year):
-    """Downloads and saves data for an entire season."""
-    print(f"\n=== FETCHING SEASON {year} ===")
-    
-    # Get the schedule for the year
+
+# --- SESSION PROVIDERS ---
+class FastF1Provider:
+    """Schedules and race sessions from fastf1 (with its on-disk cache)."""
+
+    def __init__(self, cache_dir=CACHE_DIR):
+        import fastf1  # only needed when actually downloading
+
+        # 1. Setup Cache (Crucial for speed)
+        os.makedirs(cache_dir, exist_ok=True)
+        fastf1.Cache.enable_cache(cache_dir)
+        self.fastf1 = fastf1
+
+    def get_event_schedule(self, year):
+        return self.fastf1.get_event_schedule(year, include_testing=False)
+
+    def load_race(self, year, round_num):
+        # We download the RACE session ('R')
+        session = self.fastf1.get_session(year, round_num, 'R')
+        session.load(weather=True, telemetry=False, messages=False)  # Lighter load
+        return session
+
+
+# --- CHECKPOINT MANIFEST ---
+class Manifest:
+    """
+    Per-race ingestion status in data/raw/_manifest.json, rewritten atomically
+    after every race so a killed run resumes exactly where it stopped.
+    """
+
+    def __init__(self, raw_dir=RAW_DATA_DIR):
+        self.path = os.path.join(raw_dir, MANIFEST_FILE)
+        self._lock = threading.Lock()
+        self.races = {}
+        if os.path.exists(self.path):
+            with open(self.path) as f:
+                self.races = json.load(f)
+
+    def is_done(self, race_id, save_path):
+        # A folder without a 'done' entry may be a race whose run died before mark(): fetch it again
+        entry = self.races.get(race_id)
+        return os.path.exists(save_path) and entry is not None and entry['status'] == 'done'
+
+    def mark(self, race_id, status, **info):
+        with self._lock:
+            self.races[race_id] = {'status': status, 'updated': pd.Timestamp.now().isoformat(timespec='seconds'), **info}
+            tmp = self.path + '.tmp'
+            with open(tmp, 'w') as f:
+                json.dump(self.races, f, indent=1, sort_keys=True)
+            os.replace(tmp, self.path)
+
+
+def race_jobs(provider, year):
+    """[(year, round, race_id)] of every race of the season that has already happened."""
     try:
-        schedule = fastf1.get_event_schedule(year, include_testing=False)
+        schedule = provider.get_event_schedule(year)
     except Exception as e:
         print(f"Error fetching schedule for {year}: {e}")
-        return
-
-    # Loop through every round
-    for i, row in schedule.iterrows():
-        round_num = row['RoundNumber']
-        country = row['Country']
-        location = row['Location']
-        session_date = row['Session5Date'] # Date of the Race
-        
+        return []
+
+    jobs = []
+    for _, row in schedule.iterrows():
+        session_date = row['Session5Date']  # Date of the Race
         # Skip if the race hasn't happened yet (future proofing)
         if pd.isnull(session_date) or (session_date.tz_localize(None) > pd.Timestamp.now()):
             continue
-
         # Create a unique ID for this race (e.g., "2024_01_Bahrain")
-        race_id = f"{year}_{str(round_num).zfill(2)}_{location.replace(' ', '_')}"
-        save_path = os.path.join(RAW_DATA_DIR, race_id)
+        race_id = f"{year}_{str(row['RoundNumber']).zfill(2)}_{row['Location'].replace(' ', '_')}"
+        jobs.append((year, int(row['RoundNumber']), race_id))
+    return jobs
+
+
+def save_session(session, folder):
+    """Writes the 3 core datasets of a loaded race session into `folder`."""
+    # 1. LAPS (The Physics) - only columns that exist (sometimes Speed is missing),
+    # but never without the ones process_data needs
+    laps = session.laps
+    validate_columns(laps, RAW_LAP_COLUMNS, 'laps')
+    laps[[c for c in LAPS_COLS if c in laps.columns]].to_csv(os.path.join(folder, 'laps.csv'), index=False)
+
+    # 2. WEATHER (The Variable)
+    session.weather_data.to_csv(os.path.join(folder, 'weather.csv'), index=False)
+
+    # 3. RESULTS (The Target) - Points, GridPosition, Status (DNF/Finished)
+    results = session.results
+    results[[c for c in RESULTS_COLS if c in results.columns]].to_csv(os.path.join(folder, 'results.csv'))
+    return len(laps)
+
+
+def ingest_race(provider, year, round_num, race_id, raw_dir=RAW_DATA_DIR):
+    """
+    Downloads one race and publishes its folder atomically: everything is written
+    to a temp folder that is renamed into place only once complete (replacing a
+    folder left by an earlier, unfinished or failed attempt).
+    Returns the number of laps saved.
+    """
+    save_path = os.path.join(raw_dir, race_id)
+    tmp_path = os.path.join(raw_dir, TMP_PREFIX + race_id)
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    os.makedirs(tmp_path)
+    try:
+        session = provider.load_race(year, round_num)
+        n_laps = save_session(session, tmp_path)
+        shutil.rmtree(save_path, ignore_errors=True)
+        os.rename(tmp_path, save_path)
+    except BaseException:
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        raise
+    return n_laps
+
+
+def process_season(year, provider=None, workers=WORKERS, raw_dir=RAW_DATA_DIR, manifest=None):
+    """Downloads and saves data for an entire season."""
+    return ingest(range(year, year + 1), provider, workers, raw_dir, manifest)
+
+
+def ingest(years, provider=None, workers=WORKERS, raw_dir=RAW_DATA_DIR, manifest=None):
+    """
+    Downloads every completed race of `years` with up to `workers` concurrent
+    session loads. Resumable: races marked done in the manifest are skipped;
+    half-written folders of a killed run are discarded, and race folders
+    without a 'done' entry are downloaded again.
+    Returns a report dict (races done/skipped/failed, elapsed, races per minute).
+    """
+    provider = provider or FastF1Provider()
+    os.makedirs(raw_dir, exist_ok=True)
+    manifest = manifest or Manifest(raw_dir)
+
+    # Leftovers of an interrupted run are never valid data
+    for name in os.listdir(raw_dir):
+        if name.startswith(TMP_PREFIX):
+            shutil.rmtree(os.path.join(raw_dir, name), ignore_errors=True)
+
+    jobs = []
+    skipped = 0
+    for year in years:
+        print(f"\n=== FETCHING SEASON {year} ===")
+        for job in race_jobs(provider, year):
+            race_id = job[2]
+            # CHECKPOINT: already downloaded, skip it! (Saves time on restart)
+            if manifest.is_done(race_id, os.path.join(raw_dir, race_id)):
+                print(f"  [SKIP] Found data for {race_id}")
+                skipped += 1
+            else:
+                jobs.append(job)
+
+    done, failed = 0, 0
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = {}
+        for year, round_num, race_id in jobs:
+            print(f"  [DOWNLOADING] {race_id}...")
+            futures[pool.submit(ingest_race, provider, year, round_num, race_id, raw_dir)] = race_id
+        for future in as_completed(futures):
+            race_id = futures[future]
+            try:
+                n_laps = future.result()
+            except Exception as e:
+                print(f"  [ERROR] Failed {race_id}: {e}")
+                manifest.mark(race_id, 'failed', error=str(e))
+                failed += 1
+            else:
+                print(f"  [SAVED] {race_id} ({n_laps} laps)")
+                manifest.mark(race_id, 'done', laps=n_laps)
+                done += 1
+    elapsed = time.perf_counter() - t0
+
+    return {
+        'done': done,
+        'skipped': skipped,
+        'failed': failed,
+        'workers': workers,
+        'elapsed': elapsed,
+        'races_per_minute': done / elapsed * 60 if elapsed > 0 else 0.0,
+    }
+
+
+def print_report(report):
+    print(f"\n{report['done']} races downloaded, {report['skipped']} skipped, {report['failed']} failed "
+          f"in {report['elapsed']:.1f}s with {report['workers']} workers "
+          f"({report['races_per_minute']:.1f} races/min)")
 
-        # CHECKPOINT: If folder exists, skip it! (Saves time on restart)
-        if os.path.exists(save_path):
-            print(f"  [SKIP] Found data for {race_id}")
-            continue
-            
-        print(f"  [DOWNLOADING] Round {round_num}: {location}...")
-
-        try:
-            # We download the RACE session ('R')
-            # You can also add 'Q' for qualifying if you want later
-            session = fastf1.get_session(year, round_num, 'R')
-            session.load(weather=True, telemetry=False, messages=False) # Lighter load
-
-            # Create the folder
-            os.makedirs(save_path, exist_ok=True)
-
-            # --- EXTRACT & SAVE 3 CORE DATASETS ---
-
-            # 1. LAPS (The Physics)
-            # We pick specific columns to keep file size small
-            laps = session.laps
-            laps_cols = ['Driver', 'LapTime', 'LapNumber', 'Stint', 'PitOutTime', 
-                         'PitInTime', 'Sector1Time', 'Sector2Time', 'Sector3Time', 
-                         'SpeedI1', 'SpeedI2', 'SpeedFL', 'SpeedST', 'Compound', 
-                         'TyreLife', 'FreshTyre', 'Team', 'TrackStatus', 'Time']
-            # Only save columns that exist (sometimes Speed is missing)
-            avail_cols = [c for c in laps_cols if c in laps.columns]
-            laps[avail_cols].to_csv(os.path.join(save_path, 'laps.csv'), index=False)
-
-            # 2. WEATHER (The Variable)
-            weather = session.weather_data
-            weather.to_csv(os.path.join(save_path, 'weather.csv'), index=False)
-
-            # 3. RESULTS (The Target)
-            results = session.results
-            # Includes Points, GridPosition, Status (DNF/Finished)
-            results_cols = ['Abbreviation', 'DriverNumber', 'TeamName', 'Position', 
-                            'GridPosition', 'Status', 'Points', 'Time']
-            avail_res_cols = [c for c in results_cols if c in results.columns]
-            results[avail_res_cols].to_csv(os.path.join(save_path, 'results.csv'))
-
-        except Exception as e:
-            print(f"  [ERROR] Failed {race_id}: {e}")
-            # If it failed, delete the folder so we retry cleanly next time
-            if os.path.exists(save_path):
-                shutil.rmtree(save_path)
 
 if __name__ == "__main__":
-    # Ensure raw directory exists
-    if not os.path.exists(RAW_DATA_DIR):
-        os.makedirs(RAW_DATA_DIR)
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else WORKERS
 
     # Run for our target years
-    for y in range(START_YEAR, END_YEAR + 1):
-        process_season(y)
-        
-    print("\n\nData Ingestion Complete! Check the 'data/raw' folder.")
\ No newline at end of file
+    report = ingest(range(START_YEAR, END_YEAR + 1), workers=workers)
+    print_report(report)
+
+    print("\n\nData Ingestion Complete! Check the 'data/raw' folder.")
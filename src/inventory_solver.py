@@ -0,0 +1,240 @@
+import threading
+from collections import Counter, OrderedDict
+import numpy as np
+from src.pit_optimizer import MAX_STOPS
+from src.stint_tables import TOTAL_LAPS, get_stint_tables
+from src.tyre_strategy import get_race_start_tyres
+
+# --- CONFIGURATION ---
+MODES = ["Standard Q3", "Knocked out in Q2", "Knocked out in Q1"]
+MIN_STINT = 1
+MEMO_SIZE = 4096     # solved (driver, circuit, inventory) searches kept in memory
+
+
+def apply_constraints(inventory, tyre_constraints):
+    """
+    Caps the sets of each (compound, status) at the constraint's limit, keeping the freshest.
+    e.g. {'compound': 'MEDIUM', 'status': 'NEW', 'limit': 0} removes every new medium.
+    """
+    if not tyre_constraints:
+        return list(inventory)
+
+    limits = {}
+    for c in tyre_constraints:
+        key = (c['compound'].upper(), c.get('status', 'NEW').upper())
+        limits[key] = min(limits.get(key, c['limit']), c['limit'])
+
+    kept = []
+    taken = Counter()
+    for tyre in sorted(inventory, key=lambda t: t['age']):
+        key = (tyre['compound'], tyre['status'])
+        if key in limits and taken[key] >= limits[key]:
+            continue
+        taken[key] += 1
+        kept.append(tyre)
+    return kept
+
+
+def inventory_signature(inventory):
+    """Canonical form of an inventory: sets with the same compound and age are interchangeable."""
+    counts = Counter((t['compound'], int(round(t['age']))) for t in inventory)
+    return tuple(sorted(counts.items()))
+
+
+def stint_cost_matrix(table, age, min_stint=MIN_STINT):
+    """
+    C[p, e] = time of laps p+1..e on a set that is `age` laps old at the start of the stint
+    (inf for stints shorter than min_stint). Built from the table's prefix sums.
+    """
+    total_laps = table.total_laps
+    if age + total_laps > table.max_age + 1:
+        raise ValueError(f"Tyre age {age} is older than the stint tables cover")
+    p = np.arange(total_laps + 1)[:, None]
+    e = np.arange(total_laps + 1)[None, :]
+    n = e - p
+    C = table.cum[e, np.clip(age + n, 0, None)] - table.cum[p, age]
+    C[n < max(1, min_stint)] = np.inf
+    return C
+
+
+def fastest_lap(table):
+    """The table's fastest predicted lap at any lap and tyre age: a lower bound on every lap on that compound."""
+    lap_times = table.lap_times[1:]   # row 0 is not a lap
+    finite = lap_times[np.isfinite(lap_times)]
+    return float(finite.min()) if finite.size else 0.0
+
+
+def search_inventory(costs, signature, pit_loss, max_stops=MAX_STOPS, require_two_compounds=True, min_lap=0.0,
+                     prune=True):
+    """
+    Exact search over stint assignments for one inventory.
+
+    Depth-first over the ordered sequence of sets (each set used at most once,
+    identical sets never permuted); for each sequence the best pit laps come from
+    a DP over stint end laps: best[e] = min_p best_prev[p] + pit_loss + C[p, e].
+    Branches that cannot beat the best plan of any stop count they could still
+    reach, even at min_lap per remaining lap, are pruned.
+
+    costs: {(compound, age): stint_cost_matrix}. min_lap must not exceed any
+    single lap's time on these sets (fastest_lap of their tables; 0 prunes on
+    pit loss alone). prune=False searches every branch. Returns the fastest
+    plan dict (with 'by_stops': the best plan for every stop count) or None.
+    """
+    types = [set_type for set_type, _ in signature]
+    left = [count for _, count in signature]
+    C = [costs[set_type] for set_type in types]
+    total_laps = C[0].shape[0] - 1 if C else 0
+    laps = np.arange(total_laps + 1)
+    usable = [np.isfinite(c).any() for c in C]
+
+    best = {}  # stops -> (time, seq, back)
+
+    def best_time(stops):
+        return best[stops][0] if stops in best else np.inf
+
+    def extend(prev, seq, back):
+        for t in range(len(types)):
+            if left[t] == 0 or not usable[t]:
+                continue
+            stop = pit_loss if seq else 0.0
+            cand = (prev + stop)[:, None] + C[t]
+            arg = cand.argmin(axis=0)
+            cur = cand[arg, laps]
+
+            seq_t = seq + [t]
+            back_t = back + [arg]
+            stops = len(seq)
+            compounds = {types[i][0] for i in seq_t}
+            if cur[total_laps] < best_time(stops) and (len(compounds) >= 2 or not require_two_compounds):
+                best[stops] = (cur[total_laps], seq_t, back_t)
+
+            if stops < max_stops:
+                target = max(best_time(k) for k in range(stops + 1, max_stops + 1)) if prune else np.inf
+                bound = cur + pit_loss + (total_laps - laps) * min_lap
+                nxt = np.where(bound < target, cur, np.inf)
+                nxt[total_laps] = np.inf
+                if np.isfinite(nxt).any():
+                    left[t] -= 1
+                    extend(nxt, seq_t, back_t)
+                    left[t] += 1
+
+    start = np.full(total_laps + 1, np.inf)
+    start[0] = 0.0
+    extend(start, [], [])
+
+    if not best:
+        return None
+
+    by_stops = {}
+    for stops, (time, seq, back) in sorted(best.items()):
+        # Walk the argmins back from the flag to get the pit laps
+        pit_laps = []
+        end = total_laps
+        for arg in reversed(back[1:]):
+            end = int(arg[end])
+            pit_laps.insert(0, end)
+
+        sets = [types[i] for i in seq]
+        by_stops[stops] = {
+            'stops': stops,
+            'sets': sets,
+            'compounds': [compound for compound, _ in sets],
+            'pit_laps': pit_laps,
+            'total_laps': total_laps,
+            'total_time': float(time),
+        }
+
+    plan = dict(min(by_stops.values(), key=lambda p: p['total_time']))
+    plan['by_stops'] = by_stops
+    return plan
+
+
+class InventoryMemo:
+    """LRU memo of solved searches keyed by the canonical inventory signature."""
+
+    def __init__(self, maxsize=MEMO_SIZE):
+        self.maxsize = maxsize
+        self._plans = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            if key in self._plans:
+                self._plans.move_to_end(key)
+                self.hits += 1
+                return True, self._plans[key][2]
+            self.misses += 1
+            return False, None
+
+    def put(self, key, model, encoder, plan):
+        with self._lock:
+            # Keep model/encoder referenced so their id() cannot be reused while memoized
+            self._plans[key] = (model, encoder, plan)
+            while len(self._plans) > self.maxsize:
+                self._plans.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._plans.clear()
+
+    def stats(self):
+        return {'plans': len(self._plans), 'hits': self.hits, 'misses': self.misses}
+
+
+INVENTORY_MEMO = InventoryMemo()
+
+
+def solve_modes(model, encoder, driver, circuit, modes=MODES, pit_loss=22.5, tyre_constraints=None, tables=None,
+                total_laps=TOTAL_LAPS, max_stops=MAX_STOPS, min_stint=MIN_STINT, memo=INVENTORY_MEMO):
+    """
+    Best plan for each qualifying mode, searched over the sets get_race_start_tyres
+    leaves for Sunday (after tyre_constraints). All modes share one set of stint
+    tables and cost matrices; modes with the same inventory are searched once.
+    Returns {mode: plan or None} (None = no legal strategy with these sets).
+    """
+    signatures = {
+        mode: inventory_signature(apply_constraints(get_race_start_tyres(driver, mode), tyre_constraints))
+        for mode in modes
+    }
+    if tables is None:
+        compounds = sorted({compound for sig in signatures.values() for (compound, _), _ in sig})
+        tables = get_stint_tables(model, encoder, driver, circuit, compounds, total_laps)
+
+    costs = {}
+    min_laps = {}
+    results = {}
+    for mode, signature in signatures.items():
+        key = (id(model), id(encoder), driver, circuit, total_laps, float(pit_loss), max_stops, min_stint, signature)
+        found, plan = memo.get(key)
+        if not found:
+            for set_type, _ in signature:
+                compound, age = set_type
+                if set_type not in costs:
+                    costs[set_type] = stint_cost_matrix(tables[compound], age, min_stint)
+                if compound not in min_laps:
+                    min_laps[compound] = fastest_lap(tables[compound])
+            # Per-lap time is not monotone in tyre age (the fuel term falls every lap):
+            # bound the laps still to run by the fastest single lap of any compound and age
+            min_lap = min(min_laps[compound] for (compound, _), _ in signature) if signature else 0.0
+            plan = search_inventory(costs, signature, pit_loss, max_stops, min_lap=min_lap)
+            memo.put(key, model, encoder, plan)
+        results[mode] = plan
+    return results
+
+
+def describe_plan(plan):
+    """(strategy, desc, total_time) in the solve_scenario format."""
+    if plan is None:
+        return "INVALID", "No legal strategy with the available tyre sets.", float('inf')
+
+    strategy = f"{plan['stops']} Stop ({' -> '.join(plan['compounds'])})"
+    bounds = [0] + plan['pit_laps'] + [plan['total_laps']]
+    stints = []
+    for i, (compound, age) in enumerate(plan['sets']):
+        state = f"used, {age} laps" if age > 0 else "new"
+        stints.append(f"L{bounds[i] + 1}-{bounds[i + 1]} {compound} ({state})")
+    t = plan['total_time']
+    desc = f"Stints: {', '.join(stints)}. Total Time: {int(t//60)}m {int(t%60)}s"
+    return strategy, desc, t
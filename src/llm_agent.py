@@ -2,7 +2,9 @@ import os
 import json
 from groq import Groq
 from src.physics import get_pit_loss
-from src.solve_strategy_battle import solve_scenario, load_artifacts
+from src.artifacts import REGISTRY
+from src.result_cache import solve_grid_cached
+from src.season_table import SEASON_TABLE
 
 # --- CONFIG ---
 DRIVER_CODE_MAP = {
@@ -36,25 +38,38 @@ def run_strategy_simulation(driver_name: str, circuit: str, constraints_descript
     
     # 4. Run Simulation
     try:
-        model, encoder = load_artifacts()
+        model, encoder = REGISTRY.get(fast=True, batched=True)
         pit_loss = get_pit_loss(circuit)
         
-        strat, desc, time = solve_scenario(
-            model, encoder, code, circuit, pit_loss, 1.5, 
-            "", "Standard Q3", fast_mode=False, 
+        results = solve_grid_cached(
+            model, encoder, [code], [circuit], ["Standard Q3"],
+            pit_loss=pit_loss, traffic=1.5,
             tyre_constraints=tyre_constraints
         )
+        strat, desc, time = results[(code, circuit, "Standard Q3")]
+        if strat == "INVALID":
+            return json.dumps({"error": f"{desc} Please enable more tyres.", "driver": code, "circuit": circuit})
         
         m = int(time // 60)
         s = time % 60
         
-        return json.dumps({
+        answer = {
             "strategy": strat,
             "details": desc,
             "race_time": f"{m}m {s:.2f}s",
             "driver": code,
             "circuit": circuit
-        })
+        }
+        
+        # 5. Precomputed alternatives (season table): best time for each stop count
+        row = None if tyre_constraints else SEASON_TABLE.row(code, circuit, "Standard Q3")
+        if row is not None:
+            answer["stop_options"] = {
+                f"{k} stop": f"{int(row[f'time_{k}stop'] // 60)}m {row[f'time_{k}stop'] % 60:.2f}s"
+                for k in (1, 2, 3) if row[f'time_{k}stop'] != float('inf')
+            }
+        
+        return json.dumps(answer)
     except Exception as e:
         return json.dumps({"error": str(e)})
 
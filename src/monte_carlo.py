@@ -0,0 +1,171 @@
+import os
+import sys
+import time
+import numpy as np
+
+# Allow `python src/monte_carlo.py` from the repo root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.physics import get_pit_loss, get_safety_car_rate
+from src.solve_strategy_battle import STRATEGY_OPTIONS, TOTAL_LAPS, plan_stints
+from src.stint_tables import get_stint_tables
+
+# --- CONFIGURATION ---
+N_SAMPLES = 10000
+MAX_SC_PERIODS = 3       # per race
+SC_LAPS = (3, 6)         # length of a Safety Car period: 3..5 laps
+SC_SLOWDOWN = 0.40       # lap time +40% behind the Safety Car
+SC_PIT_FACTOR = 0.5      # a stop under the Safety Car costs ~half the usual pit loss
+PIT_JITTER = 1.0         # s, std of each stop's pit loss (slow wheel nut, queueing, ...)
+TRAFFIC_LOSS = 0.10      # s per green lap, mean time lost in traffic
+TRAFFIC_SHAPE = 2.0      # gamma shape: most races little traffic, a few a lot
+LAP_NOISE = 0.30         # s, std of a single green-flag lap
+
+
+def strategy_plans(options=STRATEGY_OPTIONS):
+    """The evenly split solve_grid strategies as plans: [{'compounds', 'pit_laps'}]."""
+    plans = []
+    for compounds in options:
+        stints, _ = plan_stints(compounds)
+        plans.append({
+            'compounds': list(compounds),
+            'pit_laps': [start_lap + stint_len for _, stint_len, start_lap in stints[:-1]],
+        })
+    return plans
+
+
+def strategy_name(plan):
+    stops = len(plan['compounds']) - 1
+    return f"{stops} Stop ({' -> '.join(plan['compounds'])}) pit {', '.join(map(str, plan['pit_laps'])) or '-'}"
+
+
+def lap_matrix(model, encoder, drivers, circuit, plans, total_laps=TOTAL_LAPS):
+    """
+    Predicted lap-by-lap times for every (driver, plan), from the shared stint tables.
+    Returns L with shape (n_drivers, n_plans, total_laps); L[d, s, lap - 1] is lap `lap`.
+    Same convention as the pit optimizer: the pit lap closes a stint, the next lap
+    starts on a fresh set (age 0).
+    """
+    compounds = sorted({c for plan in plans for c in plan['compounds']})
+    laps = np.arange(1, total_laps + 1)
+
+    L = np.empty((len(drivers), len(plans), total_laps))
+    for d, driver in enumerate(drivers):
+        tables = get_stint_tables(model, encoder, driver, circuit, compounds, total_laps)
+        for s, plan in enumerate(plans):
+            pit_laps = np.asarray(plan['pit_laps'], dtype=int)
+            stint = np.searchsorted(pit_laps, laps, side='left')
+            first_lap = np.concatenate(([1], pit_laps + 1))
+            ages = laps - first_lap[stint]
+            for i, compound in enumerate(plan['compounds']):
+                on = stint == i
+                L[d, s, on] = tables[compound].lap_times[laps[on], ages[on]]
+    return L
+
+
+def safety_car_mask(rng, n_samples, total_laps, sc_rate):
+    """(n_samples, total_laps) 0/1 matrix of laps behind the Safety Car (shared by the whole field)."""
+    laps = np.arange(1, total_laps + 1)
+    periods = np.minimum(rng.poisson(sc_rate, n_samples), MAX_SC_PERIODS)
+    mask = np.zeros((n_samples, total_laps), dtype=bool)
+    for k in range(MAX_SC_PERIODS):
+        start = rng.integers(2, total_laps - SC_LAPS[1] + 1, n_samples)
+        length = rng.integers(SC_LAPS[0], SC_LAPS[1], n_samples)
+        active = (periods > k)[:, None]
+        mask |= active & (laps >= start[:, None]) & (laps < (start + length)[:, None])
+    return mask.astype(np.float64)
+
+
+def simulate(model, encoder, drivers, circuit, plans=None, n_samples=N_SAMPLES, pit_loss=None, sc_rate=None,
+             chosen=None, seed=None, total_laps=TOTAL_LAPS):
+    """
+    Monte Carlo race simulation: n_samples realisations of every (driver, plan) at once.
+
+    Per sample: Safety Car laps (whole field), pit-loss jitter per stop (cheaper
+    under the SC), traffic per driver and lap-time noise per driver (summed over
+    the green laps as one N(0, sigma * sqrt(laps)) draw).
+
+    chosen[d] = plan index driver d races with for the win probabilities
+    (default: each driver's fastest plan on average).
+
+    Returns a dict:
+      times              (n_samples, n_drivers, n_plans) race times
+      deterministic      (n_drivers, n_plans) no-randomness race times
+      mean, std, p10, p50, p90   (n_drivers, n_plans)
+      strategy_win_prob  (n_drivers, n_plans) P(plan is that driver's fastest)
+      chosen, race_times (n_samples, n_drivers), win_prob {driver: P(win)}
+    """
+    plans = strategy_plans() if plans is None else plans
+    pit_loss = get_pit_loss(circuit) if pit_loss is None else pit_loss
+    sc_rate = get_safety_car_rate(circuit) if sc_rate is None else sc_rate
+    rng = np.random.default_rng(seed)
+
+    # 1. One lap-time tensor from the model, shared by every sample
+    L = lap_matrix(model, encoder, drivers, circuit, plans, total_laps)
+    n_drivers, n_plans, _ = L.shape
+    n_stops = np.array([len(plan['pit_laps']) for plan in plans])
+    pits = np.zeros((n_plans, total_laps))
+    for s, plan in enumerate(plans):
+        pits[s, np.asarray(plan['pit_laps'], dtype=int) - 1] = 1.0
+
+    deterministic = L.sum(axis=2) + n_stops * pit_loss
+
+    # 2. Safety Car: slower laps (matrix product over laps) and cheaper stops
+    sc = safety_car_mask(rng, n_samples, total_laps, sc_rate)
+    sc_delta = sc @ (L * SC_SLOWDOWN).reshape(n_drivers * n_plans, total_laps).T
+    times = (deterministic.ravel() + sc_delta).reshape(n_samples, n_drivers, n_plans)
+    times -= (sc @ pits.T)[:, None, :] * (pit_loss * (1 - SC_PIT_FACTOR))
+
+    # 3. Pit-loss jitter: sum of n_stops independent draws
+    times += rng.standard_normal(times.shape) * (PIT_JITTER * np.sqrt(n_stops))
+
+    # 4. Traffic + lap noise per (sample, driver), only on green laps
+    green = total_laps - sc.sum(axis=1)
+    traffic = rng.gamma(TRAFFIC_SHAPE, TRAFFIC_LOSS / TRAFFIC_SHAPE, (n_samples, n_drivers)) * green[:, None]
+    noise = rng.standard_normal((n_samples, n_drivers)) * (LAP_NOISE * np.sqrt(green))[:, None]
+    times += (traffic + noise)[:, :, None]
+
+    # --- SUMMARY ---
+    fastest = times.argmin(axis=2)
+    strategy_win_prob = (fastest[:, :, None] == np.arange(n_plans)).mean(axis=0)
+
+    chosen = times.mean(axis=0).argmin(axis=1) if chosen is None else np.asarray(chosen)
+    race_times = times[:, np.arange(n_drivers), chosen]
+    wins = np.bincount(race_times.argmin(axis=1), minlength=n_drivers) / n_samples
+    p10, p50, p90 = np.percentile(times, [10, 50, 90], axis=0)
+
+    return {
+        'drivers': list(drivers),
+        'plans': plans,
+        'strategies': [strategy_name(plan) for plan in plans],
+        'times': times,
+        'deterministic': deterministic,
+        'mean': times.mean(axis=0),
+        'std': times.std(axis=0),
+        'p10': p10,
+        'p50': p50,
+        'p90': p90,
+        'strategy_win_prob': strategy_win_prob,
+        'chosen': chosen,
+        'race_times': race_times,
+        'win_prob': dict(zip(drivers, wins)),
+    }
+
+
+if __name__ == "__main__":
+    from src.artifacts import REGISTRY
+
+    model, encoder = REGISTRY.get(fast=True)
+    drivers = ["VER", "NOR", "LEC", "HAM", "PIA", "RUS"]
+    circuit = "Sakhir"
+
+    t0 = time.perf_counter()
+    result = simulate(model, encoder, drivers, circuit, seed=0)
+    elapsed = time.perf_counter() - t0
+
+    print(f"\n--- 🎲 MONTE CARLO: {circuit} ({N_SAMPLES} races, {elapsed:.2f}s) ---")
+    for d, driver in enumerate(drivers):
+        best = result['chosen'][d]
+        print(f"{driver}: {result['strategies'][best]:<42} "
+              f"P50 {result['p50'][d, best]:.1f}s (P10 {result['p10'][d, best]:.1f} / P90 {result['p90'][d, best]:.1f}) "
+              f"| fastest plan in {result['strategy_win_prob'][d, best]:.0%} | WIN {result['win_prob'][driver]:.1%}")
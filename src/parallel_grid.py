@@ -0,0 +1,169 @@
+import atexit
+import multiprocessing
+import os
+import sys
+import threading
+import types
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from src.artifacts import REGISTRY
+from src.result_cache import RESULT_CACHE, scenario_keys
+from src.season_table import SEASON_TABLE
+from src.solve_strategy_battle import solve_grid
+
+# --- CONFIGURATION ---
+# 0 = solve in this process (one batched predict per circuit), N > 0 = N worker processes
+DEFAULT_WORKERS = int(os.environ.get('F1_GRID_WORKERS', '0'))
+DRIVERS_PER_TASK = 1   # 1 = progress after every driver; raise it for big sweeps
+
+
+# --- WORKER SIDE ---
+def _init_worker():
+    """Runs once per worker: load + compile the model so tasks only stat() the files."""
+    REGISTRY.get(fast=True)
+
+
+def _solve_task(drivers, circuit, modes, pit_loss, traffic, tyre_constraints):
+    model, encoder = REGISTRY.get(fast=True)
+    return solve_grid(model, encoder, drivers, [circuit], modes, pit_loss=pit_loss,
+                      traffic=traffic, tyre_constraints=tyre_constraints)
+
+
+# --- POOLS ---
+_POOLS = {}
+_POOLS_LOCK = threading.Lock()
+
+
+_MAIN_LOCK = threading.Lock()
+
+
+def _noop():
+    return None
+
+
+def get_pool(workers):
+    """
+    Shared pool for `workers` processes, started on first use and reused afterwards.
+    All worker processes are started here, once, so later submit() calls never spawn.
+    """
+    with _POOLS_LOCK:
+        pool = _POOLS.get(workers)
+        if pool is None:
+            # spawn: forking a multi-threaded process (Streamlit) is not safe
+            pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'),
+                                       initializer=_init_worker)
+            with _bare_main():
+                # one queued task per worker: the pool starts a process for each
+                for _ in range(workers):
+                    pool.submit(_noop)
+            _POOLS[workers] = pool
+        return pool
+
+
+@contextmanager
+def _bare_main():
+    """
+    spawn re-runs the __main__ script in every new worker, and under `streamlit run`
+    __main__ is app.py. Workers only need src.*, so hide it while the workers start.
+    The swap is process-wide: _MAIN_LOCK keeps two threads from nesting it.
+    """
+    with _MAIN_LOCK:
+        main = sys.modules.get('__main__')
+        sys.modules['__main__'] = types.ModuleType('__main__')
+        try:
+            yield
+        finally:
+            sys.modules['__main__'] = main
+
+
+def shutdown_pools():
+    with _POOLS_LOCK:
+        for pool in _POOLS.values():
+            pool.shutdown(wait=False, cancel_futures=True)
+        _POOLS.clear()
+
+
+atexit.register(shutdown_pools)
+
+
+def _discard_pool(workers):
+    with _POOLS_LOCK:
+        pool = _POOLS.pop(workers, None)
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+# --- GRID ---
+def simulate_grid(drivers, circuits, modes=("Standard Q3",), workers=DEFAULT_WORKERS, pit_loss=None, traffic=1.5,
+                  tyre_constraints=None, progress=None, drivers_per_task=DRIVERS_PER_TASK, cache=RESULT_CACHE):
+    """
+    Solves every (driver, circuit, mode), spreading drivers over `workers` processes.
+    Returns {(driver, circuit, mode): (strategy, desc, time)} in grid order
+    (circuits, then drivers, then modes, as given).
+    progress(done, total) is called as each (driver, circuit) finishes.
+    Season-table and cached scenarios are answered up front; pass cache=None to always solve.
+    """
+    drivers, circuits, modes = list(drivers), list(circuits), list(modes)
+    total = len(drivers) * len(circuits)
+    results = {}
+
+    keys = {}
+    if cache is not None:
+        # Precomputed season rows first, then the persistent cache
+        model_version = REGISTRY.version
+        results = SEASON_TABLE.lookup_grid(drivers, circuits, modes, pit_loss, tyre_constraints, model_version)
+        keys = scenario_keys(model_version, drivers, circuits, modes, pit_loss, traffic, tyre_constraints)
+        cached = cache.get_many([key for scenario, key in keys.items() if scenario not in results])
+        results.update({scenario: cached[key] for scenario, key in keys.items() if key in cached})
+
+    # Work left: (circuit, [drivers]) groups
+    tasks = []
+    for circuit in circuits:
+        missing = [d for d in drivers if any((d, circuit, m) not in results for m in modes)]
+        if workers and workers > 0:
+            step = max(1, drivers_per_task)
+            tasks.extend((circuit, missing[i:i + step]) for i in range(0, len(missing), step))
+        elif missing:
+            tasks.append((circuit, missing))
+
+    done = total - sum(len(group) for _, group in tasks)
+    if progress and done:
+        progress(done, total)
+
+    fresh = {}
+
+    def collect(group, solved):
+        nonlocal done
+        for scenario, result in solved.items():
+            if scenario not in results:
+                results[scenario] = result
+                if scenario in keys:
+                    fresh[keys[scenario]] = result
+        done += len(group)
+        if progress:
+            progress(done, total)
+
+    if workers and workers > 0 and tasks:
+        pool = get_pool(workers)
+        try:
+            futures = {
+                pool.submit(_solve_task, group, circuit, modes, pit_loss, traffic, tyre_constraints): group
+                for circuit, group in tasks
+            }
+            for future in as_completed(futures):
+                collect(futures[future], future.result())
+        except BrokenProcessPool:
+            # A worker died (e.g. killed by the OS): start a fresh pool next time
+            _discard_pool(workers)
+            raise
+    else:
+        model, encoder = REGISTRY.get(fast=True, batched=True)
+        for circuit, group in tasks:
+            collect(group, solve_grid(model, encoder, group, [circuit], modes, pit_loss=pit_loss,
+                                      traffic=traffic, tyre_constraints=tyre_constraints))
+
+    if cache is not None:
+        cache.put_many(model_version, fresh)
+
+    return {(d, c, m): results[(d, c, m)] for c in circuits for d in drivers for m in modes}
@@ -40,6 +40,48 @@ def get_pit_loss(circuit):
     # Default to 22.5s if unknown
     return lookup.get(circuit, 22.5)
 
+def get_safety_car_rate(circuit):
+    """
+    Expected number of Safety Car periods per race (rough recent-seasons average).
+    Street circuits and walls = more interruptions.
+    """
+    lookup = {
+        # --- HIGH (street / walls) ---
+        'Singapore': 1.5,
+        'Jeddah': 1.3,
+        'Baku': 1.2,
+        'Las Vegas': 1.0,
+        'Madrid': 1.0,     # NEW: street layout, assume similar to Baku/Las Vegas
+        'Albert Park': 1.0,
+        'Montreal': 1.0,
+        'Monaco': 0.8,
+        'Interlagos': 0.9,
+        'Miami': 0.9,
+
+        # --- MEDIUM ---
+        'Silverstone': 0.7,
+        'Zandvoort': 0.7,
+        'Imola': 0.6,
+        'Spa': 0.6,
+        'Suzuka': 0.6,
+        'Shanghai': 0.6,
+        'Mexico City': 0.6,
+
+        # --- LOW (big run-off) ---
+        'Bahrain': 0.5,
+        'Sakhir': 0.5,
+        'Monza': 0.5,
+        'Austin': 0.5,
+        'Lusail': 0.5,
+        'Red Bull Ring': 0.5,
+        'Hungaroring': 0.4,
+        'Yas Marina': 0.4,
+        'Barcelona': 0.3,
+    }
+
+    # Default to 0.6 periods if unknown
+    return lookup.get(circuit, 0.6)
+
 def calculate_tyre_cliff_penalty(compound, age):
     penalty = 0.0
     
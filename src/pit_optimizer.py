@@ -0,0 +1,121 @@
+import numpy as np
+from src.stint_tables import get_stint_tables
+
+# --- CONFIGURATION ---
+TOTAL_LAPS = 57
+COMPOUNDS = ['SOFT', 'MEDIUM', 'HARD']
+MAX_STOPS = 3
+
+
+def lap_time_tensor(model, encoder, driver, circuit, compounds=COMPOUNDS, total_laps=TOTAL_LAPS):
+    """
+    Every (compound, lap, tyre age) lap, predicted ONCE via the shared stint tables.
+    Returns T with shape (n_compounds, total_laps + 1, total_laps) where
+    T[c, lap, age] is the predicted lap time (inf where age >= lap).
+    """
+    tables = get_stint_tables(model, encoder, driver, circuit, compounds, total_laps)
+
+    T = np.full((len(compounds), total_laps + 1, total_laps), np.inf)
+    laps, ages = np.tril_indices(total_laps)          # age <= lap index
+    laps = laps + 1                                   # laps are 1-based
+    for c, compound in enumerate(compounds):
+        T[c, laps, ages] = tables[compound].lap_times[laps, ages]
+    return T
+
+
+def optimize_pit_stops(T, pit_loss, compounds=COMPOUNDS, max_stops=MAX_STOPS, min_stint=1, require_two_compounds=True):
+    """
+    Exact pit-stop optimizer: dynamic programming over lap x tyre state.
+
+    State after each lap = (stops made, compounds used, current compound, tyre age).
+    Each lap we either stay out (age + 1) or the previous lap was an in-lap and
+    we start this lap on a fresh set. Every pit lap and every compound sequence
+    with up to `max_stops` stops is covered, so the result is the true optimum
+    of the lap-time tensor T (see lap_time_tensor).
+
+    Returns one plan per stop count (fastest first):
+    [{'stops', 'compounds', 'pit_laps', 'total_time'}, ...]
+    """
+    n_c = len(compounds)
+    total_laps = T.shape[1] - 1
+    n_masks = 1 << n_c
+
+    # V[k, mask, c, age] = best time to complete laps 1..lap in that state
+    V = np.full((max_stops + 1, n_masks, n_c, total_laps), np.inf)
+    for c in range(n_c):
+        V[0, 1 << c, c, 0] = T[c, 1, 0]
+
+    # pit_from[lap, k, mask, c] = flat index of (prev_mask, prev_c, prev_age) on lap - 1
+    pit_from = np.full((total_laps + 1, max_stops + 1, n_masks, n_c), -1, dtype=np.int64)
+    stint_ok = np.arange(total_laps) >= (min_stint - 1)
+
+    for lap in range(2, total_laps + 1):
+        V_next = np.full_like(V, np.inf)
+
+        # 1. Stay out: tyres get one lap older
+        V_next[:, :, :, 1:] = V[:, :, :, :-1] + T[:, lap, 1:][None, None, :, :]
+
+        # 2. Pit at the end of lap - 1: fresh set for this lap
+        for k in range(max_stops):
+            flat = np.where(stint_ok[None, None, :], V[k], np.inf).reshape(n_masks, -1)
+            best_idx = flat.argmin(axis=1)
+            best_val = flat[np.arange(n_masks), best_idx]
+            for prev_mask in range(n_masks):
+                if not np.isfinite(best_val[prev_mask]):
+                    continue
+                for c in range(n_c):
+                    mask = prev_mask | (1 << c)
+                    cost = best_val[prev_mask] + pit_loss + T[c, lap, 0]
+                    if cost < V_next[k + 1, mask, c, 0]:
+                        V_next[k + 1, mask, c, 0] = cost
+                        pit_from[lap, k + 1, mask, c] = prev_mask * n_c * total_laps + best_idx[prev_mask]
+        V = V_next
+
+    # --- Best finishing state per stop count ---
+    plans = []
+    for k in range(max_stops + 1):
+        final = V[k].copy()
+        final[:, :, :min_stint - 1] = np.inf
+        if require_two_compounds:
+            for mask in range(n_masks):
+                if bin(mask).count('1') < 2:
+                    final[mask] = np.inf
+        idx = int(final.argmin())
+        total = final.flat[idx]
+        if not np.isfinite(total):
+            continue
+        mask, c, age = np.unravel_index(idx, final.shape)
+        plans.append(_backtrack(pit_from, compounds, total_laps, k, int(mask), int(c), int(age), float(total)))
+
+    plans.sort(key=lambda p: p['total_time'])
+    return plans
+
+
+def _backtrack(pit_from, compounds, total_laps, k, mask, c, age, total):
+    """Walks the pit backpointers from the final lap to rebuild the stint plan."""
+    n_c = len(compounds)
+    stint_compounds = [compounds[c]]
+    pit_laps = []
+    lap = total_laps
+    while k > 0:
+        start = lap - age                       # first lap of the current stint
+        prev = pit_from[start, k, mask, c]
+        mask, rest = divmod(int(prev), n_c * total_laps)
+        c, age = divmod(rest, total_laps)
+        lap = start - 1                         # the in-lap
+        pit_laps.append(lap)
+        stint_compounds.append(compounds[c])
+        k -= 1
+
+    return {
+        'stops': len(pit_laps),
+        'compounds': stint_compounds[::-1],
+        'pit_laps': pit_laps[::-1],
+        'total_time': total,
+    }
+
+
+def solve_optimal_strategy(model, encoder, driver, circuit, pit_loss, max_stops=MAX_STOPS, total_laps=TOTAL_LAPS):
+    """Convenience wrapper: predict the lap tensor once, then run the DP."""
+    T = lap_time_tensor(model, encoder, driver, circuit, COMPOUNDS, total_laps)
+    return optimize_pit_stops(T, pit_loss, COMPOUNDS, max_stops=max_stops)
@@ -0,0 +1,152 @@
+import os
+import threading
+import time
+import numpy as np
+from src.features import predict_matrix
+
+# --- CONFIGURATION ---
+MAX_BATCH = 4096   # rows per model call
+# Extra window (ms) to hold a batch open for more callers. 0 = flush as soon as
+# the model is free: whatever queued during the previous predict rides along,
+# which measured best here (see benchmarks/bench_predict_broker.py)
+MAX_WAIT = float(os.environ.get('F1_BATCH_WAIT_MS', '0')) / 1000
+
+
+class _Request:
+    __slots__ = ('X', 'result', 'error', 'done')
+
+    def __init__(self, X):
+        self.X = X
+        self.result = None
+        self.error = None
+        self.done = threading.Event()
+
+
+class PredictBroker:
+    """
+    Coalesces predict calls from many threads (e.g. concurrent Streamlit
+    sessions) into batched model.predict calls.
+
+    Callers queue their feature rows and block; one background thread flushes
+    the queue as a single predict once `max_batch` rows are waiting or the
+    oldest request has waited `max_wait` seconds, then hands each caller its
+    own slice of the result. The window is only held open while requests are
+    actually arriving together, so a lone session is not delayed. A request
+    with the wrong column count is rejected before queuing, and if a merged
+    predict still fails each request is retried alone, so errors stay with
+    the caller that caused them. Duck-types `model.predict`, so it can be
+    passed anywhere a model is (rows must already be a feature matrix).
+    """
+
+    def __init__(self, model, max_batch=MAX_BATCH, max_wait=MAX_WAIT):
+        self.model = model
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.feature_names_in_ = None          # predict_matrix hands us plain arrays
+        self.n_features_in_ = getattr(model, 'n_features_in_', None)
+
+        self._cond = threading.Condition()
+        self._queue = []
+        self._queued_rows = 0
+        self._closed = False
+        self._thread = None
+        self._last_batch_requests = 0
+
+        self._batches = 0
+        self._requests = 0
+        self._rows = 0
+        self._max_batch_seen = 0
+
+    def predict(self, X):
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        if len(X) == 0:
+            return np.empty(0)
+        if self.n_features_in_ is not None and X.shape[1] != self.n_features_in_:
+            # rejected here, before it can be merged into (and fail) other callers' batch
+            raise ValueError(f"X has {X.shape[1]} features, but the model expects {self.n_features_in_}")
+
+        request = _Request(X)
+        with self._cond:
+            if self._closed:   # e.g. replaced after a model reload: just predict here
+                return np.asarray(predict_matrix(self.model, X))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='predict-broker', daemon=True)
+                self._thread.start()
+            self._queue.append(request)
+            self._queued_rows += len(X)
+            self._cond.notify()
+        request.done.wait()
+        if request.error is not None:
+            raise request.error
+        return request.result
+
+    # --- FLUSHER ---
+    def _next_batch(self):
+        """Blocks until a batch is due; returns it (None once closed and drained)."""
+        with self._cond:
+            while not self._queue:
+                if self._closed:
+                    return None
+                self._cond.wait()
+            # Hold the window only if callers are overlapping (more queued, or
+            # the last batch had company); otherwise go straight to predict
+            concurrent = len(self._queue) > 1 or self._last_batch_requests > 1
+            deadline = time.perf_counter() + (self.max_wait if concurrent else 0.0)
+            while self._queued_rows < self.max_batch and not self._closed:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            batch, self._queue, self._queued_rows = self._queue, [], 0
+            self._last_batch_requests = len(batch)
+            return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            rows = sum(len(r.X) for r in batch)
+            try:
+                X = batch[0].X if len(batch) == 1 else np.concatenate([r.X for r in batch])
+                y = np.asarray(predict_matrix(self.model, X))
+                start = 0
+                for request in batch:
+                    stop = start + len(request.X)
+                    request.result = y[start:stop]
+                    start = stop
+            except Exception as e:
+                if len(batch) == 1:
+                    batch[0].error = e
+                else:
+                    # one bad request must not fail the rest: predict each on its own
+                    for request in batch:
+                        try:
+                            request.result = np.asarray(predict_matrix(self.model, request.X))
+                        except Exception as own_error:
+                            request.error = own_error
+            self._batches += 1
+            self._requests += len(batch)
+            self._rows += rows
+            self._max_batch_seen = max(self._max_batch_seen, rows)
+            for request in batch:
+                request.done.set()
+
+    def close(self):
+        """Flushes what is queued and stops the background thread (later calls predict directly)."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+
+    def stats(self):
+        return {
+            'batches': self._batches,
+            'requests': self._requests,
+            'rows': self._rows,
+            'requests_per_batch': self._requests / self._batches if self._batches else 0.0,
+            'largest_batch': self._max_batch_seen,
+        }
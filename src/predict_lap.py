@@ -1,8 +1,15 @@
 import pandas as pd
 import joblib
 import os
+import sys
 import warnings
 
+# Allow `python src/predict_lap.py` from the repo root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.fast_predictor import compile_model
+from src.features import encode_features, get_codes
+
 # Silence warnings
 warnings.filterwarnings('ignore')
 
@@ -18,7 +25,8 @@ def load_artifacts():
     print("Loading AI Brain...")
     model = joblib.load(MODEL_PATH)
     encoder = joblib.load(ENCODER_PATH)
-    return model, encoder
+    # Single-row predictions: the compiled trees skip sklearn's per-call overhead
+    return compile_model(model), encoder
 
 def get_user_input():
     print("\n--- F1 RACE PREDICTOR (v1) ---")
@@ -65,9 +73,13 @@ def predict():
             input_df = get_user_input()
             if input_df is None: continue
             
-            # 2. Encode (Transform ALL columns, just like in training)
-            # The encoder expects 7 columns. We give it 7 columns.
-            encoded_data = encoder.transform(input_df)
+            # 2. Encode (Driver/Circuit/Compound, just like in training)
+            encoded_data = encode_features(encoder, input_df)
+            codes = get_codes(encoder)
+            if codes.report():
+                print(f"\n⚠️  The AI has never seen: {codes.report()}. Using the 'unknown' code, expect a rough guess.")
+                print("   Check your spelling! Use 'check_name.py' to see valid options.")
+                codes.reset()
             
             # 3. Predict
             prediction = model.predict(encoded_data)[0]
@@ -1,99 +1,183 @@
 import pandas as pd
 import os
+import sys
 import glob
+import hashlib
+import json
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from tqdm import tqdm  # This gives us a nice progress bar
 
+# Allow `python src/process_data.py` from the repo root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.dataset_store import STORE_DIR, TRAINING, delete_partition, has_partition, write_partition
+from src.schema import RAW_LAP_COLUMNS, TRAINING_COLUMNS, apply_schema, read_csv_typed
+
 # --- CONFIGURATION ---
 RAW_DIR = os.path.join('data', 'raw')
-PROCESSED_DIR = os.path.join('data', 'processed')
-OUTPUT_FILE = os.path.join(PROCESSED_DIR, 'f1_training_data.csv')
-
-def process_data():
-    all_races_data = []
-    
-    # Get list of all race folders
-    race_folders = glob.glob(os.path.join(RAW_DIR, '*'))
-    print(f"Found {len(race_folders)} races to process.")
-
-    # Loop through every race folder
-    for folder in tqdm(race_folders, desc="Processing Races"):
-        try:
-            # 1. Load the 3 raw files
-            laps_file = os.path.join(folder, 'laps.csv')
-            weather_file = os.path.join(folder, 'weather.csv')
-            results_file = os.path.join(folder, 'results.csv')
-
-            # Skip if any file is missing (safety check)
-            if not (os.path.exists(laps_file) and os.path.exists(weather_file) and os.path.exists(results_file)):
-                continue
-
-            laps = pd.read_csv(laps_file)
-            weather = pd.read_csv(weather_file)
-            results = pd.read_csv(results_file)
-
-            # --- CLEANING: Filter out non-racing laps ---
-            # Keep only Green Flag laps (TrackStatus = 1)
-            # Remove Pit In/Out laps (PitInTime/PitOutTime must be empty)
-            laps = laps[laps['TrackStatus'] == 1]
-            laps = laps[laps['PitInTime'].isna() & laps['PitOutTime'].isna()]
-            
-            # Remove laps with no time
-            laps = laps.dropna(subset=['LapTime'])
-
-            # --- MERGING: Connect Weather to Laps ---
-            # We need to convert time strings to Timedeltas to match them
-            laps['Time'] = pd.to_timedelta(laps['Time'])
-            weather['Time'] = pd.to_timedelta(weather['Time'])
-            
-            # Sort for merge_asof
-            laps = laps.sort_values('Time')
-            weather = weather.sort_values('Time')
-            
-            # The Magic Merge: Find the weather closest to the lap time
-            # direction='backward' means "look at the weather just before the lap finished"
-            merged = pd.merge_asof(laps, weather, on='Time', direction='backward')
-
-            # --- MERGING: Add End-of-Race Results ---
-            # We want to know the driver's final position and grid position
-            # We merge on 'Driver' (abbreviation)
-            # Rename columns in results to avoid conflict (e.g., 'Time' -> 'TotalRaceTime')
-            results = results.rename(columns={'Time': 'TotalRaceTime', 'Position': 'FinalPosition'})
-            
-            # Keep only useful result columns
-            results_cols = ['Abbreviation', 'TeamName', 'FinalPosition', 'GridPosition', 'Status']
-            merged = pd.merge(merged, results[results_cols], left_on='Driver', right_on='Abbreviation', how='left')
-
-            # --- FEATURE ENGINEERING (Basic) ---
-            # Add Race ID from folder name so we know which track this is
-            race_id = os.path.basename(folder)
-            merged['RaceID'] = race_id
-            merged['Year'] = int(race_id.split('_')[0])
-            merged['Round'] = int(race_id.split('_')[1])
-            merged['Circuit'] = race_id.split('_', 2)[2]
-
-            # Convert LapTime to Seconds (AI understands floats, not "1:24.500")
-            # The string format is usually "0 days 00:01:24.500000"
-            merged['LapTime_Seconds'] = merged['LapTime'].apply(lambda x: pd.to_timedelta(x).total_seconds())
-
-            all_races_data.append(merged)
-
-        except Exception as e:
-            print(f"Skipping {folder} due to error: {e}")
-
-    # Combine all 70 races into one massive table
-    if all_races_data:
-        final_df = pd.concat(all_races_data, ignore_index=True)
-        
-        # Create output folder if not exists
-        if not os.path.exists(PROCESSED_DIR):
-            os.makedirs(PROCESSED_DIR)
-            
-        final_df.to_csv(OUTPUT_FILE, index=False)
-        print(f"\nSUCCESS! Processed {len(final_df)} laps.")
-        print(f"Saved to: {OUTPUT_FILE}")
-        print("Columns:", list(final_df.columns))
+RAW_FILES = ('laps.csv', 'weather.csv', 'results.csv')
+INDEX_PATH = os.path.join(STORE_DIR, TRAINING, '_inputs.json')  # race_id -> input hash + partition
+PROCESS_VERSION = 2    # bump when process_race changes: every race is rebuilt
+WORKERS = int(os.environ.get('F1_PROCESS_WORKERS', '0')) or (os.cpu_count() or 1)
+
+
+def input_hash(folder):
+    """Content hash of a race folder's 3 raw files (plus the processing version)."""
+    h = hashlib.sha256(f"v{PROCESS_VERSION}".encode())
+    for name in RAW_FILES:
+        h.update(name.encode())
+        with open(os.path.join(folder, name), 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                h.update(chunk)
+    return h.hexdigest()
+
+
+def timedelta_seconds(col):
+    """
+    Seconds from a column of timedelta strings ("0 days 00:01:24.500000") in one pass.
+    Parsed by regex rather than pd.to_timedelta: some pandas versions take the
+    fraction precision from the first value and misread the rest of the column.
+    """
+    if pd.api.types.is_timedelta64_dtype(col):
+        return col.dt.total_seconds()
+    parts = col.astype('string').str.extract(r'(?:(-?\d+) days?\s*)?(\d+):(\d+):(\d+(?:\.\d*)?)')
+    parts = parts.astype(float)
+    return parts[0].fillna(0) * 86400 + parts[1] * 3600 + parts[2] * 60 + parts[3]
+
+
+def process_race(folder):
+    """Cleans + merges one race folder into a training frame."""
+    # 1. Load the 3 raw files (typed: categories + float32, see schema.py)
+    laps = read_csv_typed(os.path.join(folder, 'laps.csv'), required=RAW_LAP_COLUMNS)
+    weather = read_csv_typed(os.path.join(folder, 'weather.csv'), required=['Time'])
+    results = read_csv_typed(os.path.join(folder, 'results.csv'))
+
+    # --- CLEANING: Filter out non-racing laps ---
+    # Keep only Green Flag laps (TrackStatus = 1)
+    # Remove Pit In/Out laps (PitInTime/PitOutTime must be empty)
+    laps = laps[laps['TrackStatus'] == 1]
+    laps = laps[laps['PitInTime'].isna() & laps['PitOutTime'].isna()]
+
+    # Remove laps with no time
+    laps = laps.dropna(subset=['LapTime'])
+
+    # --- MERGING: Connect Weather to Laps ---
+    # We need to convert time strings to Timedeltas to match them
+    laps['Time'] = pd.to_timedelta(timedelta_seconds(laps['Time']), unit='s')
+    weather['Time'] = pd.to_timedelta(timedelta_seconds(weather['Time']), unit='s')
+
+    # Sort for merge_asof
+    laps = laps.sort_values('Time')
+    weather = weather.sort_values('Time')
+
+    # The Magic Merge: Find the weather closest to the lap time
+    # direction='backward' means "look at the weather just before the lap finished"
+    merged = pd.merge_asof(laps, weather, on='Time', direction='backward')
+
+    # --- MERGING: Add End-of-Race Results ---
+    # We want to know the driver's final position and grid position
+    # We merge on 'Driver' (abbreviation)
+    # Rename columns in results to avoid conflict (e.g., 'Time' -> 'TotalRaceTime')
+    results = results.rename(columns={'Time': 'TotalRaceTime', 'Position': 'FinalPosition'})
+
+    # Keep only useful result columns
+    results_cols = ['Abbreviation', 'TeamName', 'FinalPosition', 'GridPosition', 'Status']
+    merged = pd.merge(merged, results[results_cols], left_on='Driver', right_on='Abbreviation', how='left')
+
+    # --- FEATURE ENGINEERING (Basic) ---
+    # Add Race ID from folder name so we know which track this is
+    race_id = os.path.basename(folder)
+    merged['RaceID'] = race_id
+    merged['Year'] = int(race_id.split('_')[0])
+    merged['Round'] = int(race_id.split('_')[1])
+    merged['Circuit'] = race_id.split('_', 2)[2]
+
+    # Convert LapTime to Seconds (AI understands floats, not "1:24.500")
+    # The string format is usually "0 days 00:01:24.500000" - parsed for the whole column at once
+    merged['LapTime_Seconds'] = timedelta_seconds(merged['LapTime'])
+    return apply_schema(merged, TRAINING_COLUMNS, name=race_id)
+
+
+def _process_task(folder, digest):
+    """Worker: processes one race and writes its partition; only a summary goes back."""
+    merged = process_race(folder)
+    season, round_num = int(merged['Year'].iloc[0]), int(merged['Round'].iloc[0])
+    write_partition(merged, TRAINING, season, round_num)
+    return {'hash': digest, 'season': season, 'round': round_num, 'laps': len(merged)}, list(merged.columns)
+
+
+def load_index(path=INDEX_PATH):
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_index(index, path=INDEX_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + '.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(index, f, indent=1, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def process_data(workers=WORKERS, raw_dir=RAW_DIR):
+    """
+    Incremental: a race is (re)processed only when the hash of its raw files
+    changed or its partition is missing; each one runs in a worker process
+    and lands in its own store partition. Returns the number of races processed.
+    """
+    index = load_index()
+
+    # Get list of all complete race folders
+    race_folders = {}
+    for folder in sorted(glob.glob(os.path.join(raw_dir, '*'))):
+        # Skip if any file is missing (safety check)
+        if all(os.path.exists(os.path.join(folder, name)) for name in RAW_FILES):
+            race_folders[os.path.basename(folder)] = folder
+
+    # Races whose raw folder is gone: drop their partitions too
+    removed = set(index) - set(race_folders)
+    for race_id in removed:
+        entry = index.pop(race_id)
+        delete_partition(TRAINING, entry['season'], entry['round'])
+
+    todo = []
+    for race_id, folder in race_folders.items():
+        digest = input_hash(folder)
+        entry = index.get(race_id)
+        if entry and entry['hash'] == digest and has_partition(TRAINING, entry['season'], entry['round']):
+            continue
+        todo.append((race_id, folder, digest))
+    print(f"Found {len(race_folders)} races: {len(race_folders) - len(todo)} unchanged, {len(todo)} to process.")
+
+    n_done, n_laps = 0, 0
+    columns = None
+    if todo:
+        with ProcessPoolExecutor(max_workers=max(1, min(workers, len(todo)))) as pool:
+            futures = {pool.submit(_process_task, folder, digest): race_id for race_id, folder, digest in todo}
+            for future in tqdm(as_completed(futures), total=len(futures), desc="Processing Races"):
+                race_id = futures[future]
+                try:
+                    entry, columns = future.result()
+                except Exception as e:
+                    print(f"Skipping {race_id} due to error: {e}")
+                    continue
+                index[race_id] = entry
+                n_done += 1
+                n_laps += entry['laps']
+    if todo or removed:
+        save_index(index)
+
+    if n_done:
+        print(f"\nSUCCESS! Processed {n_laps} laps from {n_done} races.")
+        print(f"Saved to: {os.path.join(STORE_DIR, TRAINING)} (one partition per race)")
+        print("Columns:", columns)
+    elif not todo:
+        print(f"Everything up to date ({len(removed)} deleted races removed)." if removed else "Everything up to date.")
     else:
         print("No data processed!")
+    return n_done
 
 if __name__ == "__main__":
-    process_data()
\ No newline at end of file
+    process_data()
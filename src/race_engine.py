@@ -0,0 +1,112 @@
+import numpy as np
+from src.features import feature_matrix, fuel_weight, predict_matrix
+
+# --- CONFIGURATION ---
+TOTAL_LAPS = 57
+
+
+def lap_matrix(encoder, driver, circuit, compound, lap, tyre_age, total_laps=TOTAL_LAPS, rainfall=0):
+    """
+    Model input for any set of laps (scalars or arrays, broadcast together).
+    The one place lap features are built: fuel uses the training formula
+    (features.fuel_weight, same as add_feature.py).
+    """
+    lap = np.asarray(lap)
+    return feature_matrix(encoder, {
+        'Driver': driver,
+        'Circuit': circuit,
+        'Compound': compound,
+        'TyreLife': tyre_age,
+        'LapNumber': lap,
+        'Rainfall': rainfall,
+        'FuelWeight': fuel_weight(lap, total_laps),
+    })
+
+
+def predict_laps(model, encoder, driver, circuit, compound, lap, tyre_age, total_laps=TOTAL_LAPS, rainfall=0, dedupe=True):
+    """
+    Predicted lap times in ONE model call.
+    dedupe=True predicts each distinct feature row once (strategies share most laps).
+    """
+    X = lap_matrix(encoder, driver, circuit, compound, lap, tyre_age, total_laps, rainfall)
+    if not dedupe or len(X) < 2:
+        return predict_matrix(model, X)
+    unique, inverse = np.unique(X, axis=0, return_inverse=True)
+    return predict_matrix(model, unique)[inverse.ravel()]
+
+
+def race_stints(compounds, pit_laps, ages=None, total_laps=TOTAL_LAPS):
+    """[(compound, first_lap, n_laps, start_age)] for a plan; pit laps close a stint."""
+    ages = ages or [0] * len(compounds)
+    bounds = [0] + list(pit_laps) + [total_laps]
+    return [(compound, bounds[i] + 1, bounds[i + 1] - bounds[i], int(ages[i]))
+            for i, compound in enumerate(compounds)]
+
+
+def _stint_rows(stints):
+    compound, lap, age = [], [], []
+    for c, first_lap, n_laps, start_age in stints:
+        compound.extend([c] * n_laps)
+        lap.append(np.arange(first_lap, first_lap + n_laps))
+        age.append(np.arange(start_age, start_age + n_laps))
+    empty = np.empty(0, dtype=int)
+    return compound, np.concatenate(lap or [empty]), np.concatenate(age or [empty])
+
+
+def simulate(model, encoder, races, pit_loss=22.0, total_laps=TOTAL_LAPS, rainfall=0):
+    """
+    Lap-by-lap simulation of many races in a single predict.
+
+    races: [{'driver', 'circuit', 'compounds', 'pit_laps', 'ages' (optional,
+    tyre age at the start of each stint), 'pit_loss' (optional)}]
+    The in-lap carries the pit loss; the next lap starts on the new set.
+
+    Returns one trace per race: {'lap', 'compound', 'tyre_age', 'fuel',
+    'lap_time' (pit loss included), 'cumulative', 'pit_laps', 'total_time'}.
+    """
+    rows = {'driver': [], 'circuit': [], 'compound': [], 'lap': [], 'age': []}
+    spans = []
+    for race in races:
+        stints = race_stints(race['compounds'], race['pit_laps'], race.get('ages'), total_laps)
+        compound, lap, age = _stint_rows(stints)
+        start = sum(len(a) for a in rows['lap'])
+        spans.append((start, start + len(lap)))
+        rows['driver'].extend([race['driver']] * len(lap))
+        rows['circuit'].extend([race['circuit']] * len(lap))
+        rows['compound'].extend(compound)
+        rows['lap'].append(lap)
+        rows['age'].append(age)
+
+    if not spans:
+        return []
+    lap = np.concatenate(rows['lap'])
+    age = np.concatenate(rows['age'])
+    preds = predict_laps(model, encoder, np.array(rows['driver']), np.array(rows['circuit']),
+                         np.array(rows['compound']), lap, age, total_laps, rainfall)
+
+    traces = []
+    for race, (a, b) in zip(races, spans):
+        lap_time = preds[a:b].copy()
+        pit_laps = list(race['pit_laps'])
+        lap_time[np.asarray(pit_laps, dtype=int) - 1] += race.get('pit_loss', pit_loss)
+        cumulative = np.cumsum(lap_time)
+        traces.append({
+            'lap': lap[a:b],
+            'compound': rows['compound'][a:b],
+            'tyre_age': age[a:b],
+            'fuel': fuel_weight(lap[a:b], total_laps),
+            'lap_time': lap_time,
+            'cumulative': cumulative,
+            'pit_laps': pit_laps,
+            'total_time': float(cumulative[-1]) if len(cumulative) else 0.0,
+        })
+    return traces
+
+
+def stint_time(model, encoder, driver, circuit, compound, first_lap, n_laps, start_age=0, total_laps=TOTAL_LAPS):
+    """Predicted time of laps first_lap..first_lap+n_laps-1 on a set `start_age` laps old."""
+    if n_laps <= 0:
+        return 0.0
+    laps = np.arange(first_lap, first_lap + n_laps)
+    ages = np.arange(start_age, start_age + n_laps)
+    return float(predict_laps(model, encoder, driver, circuit, compound, laps, ages, total_laps, dedupe=False).sum())
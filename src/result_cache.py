@@ -0,0 +1,163 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from src.artifacts import MODEL_PATH, ENCODER_PATH, REGISTRY, artifact_version
+from src.physics import get_pit_loss
+from src.season_table import SEASON_TABLE
+from src.solve_strategy_battle import SOLVER_VERSION, solve_grid
+
+# --- CONFIGURATION ---
+CACHE_PATH = os.path.join('cache', 'strategy_results.sqlite')
+MAX_ENTRIES = 20000
+
+
+class ResultCache:
+    """
+    Persistent (SQLite) cache of solved strategy scenarios.
+    Keys hash the model+encoder version with the full scenario inputs, so a
+    retrained model can never serve stale answers; purge_stale() drops the
+    old rows. Least-recently-used rows are evicted past max_entries.
+    """
+
+    def __init__(self, path=CACHE_PATH, max_entries=MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _connect(self):
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS results (
+                    key TEXT PRIMARY KEY,
+                    model_version TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    last_access REAL NOT NULL
+                )""")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_results_access ON results(last_access)")
+            self._conn = conn
+        return self._conn
+
+    @staticmethod
+    def make_key(model_version, inputs):
+        blob = json.dumps({'model': model_version, 'solver': SOLVER_VERSION, **inputs}, sort_keys=True, default=str)
+        return hashlib.sha256(blob.encode()).hexdigest()
+
+    def get_many(self, keys):
+        """{key: result} for the keys that are cached (and marks them as recently used)."""
+        if not keys:
+            return {}
+        with self._lock:
+            conn = self._connect()
+            found = {}
+            for i in range(0, len(keys), 500):
+                chunk = keys[i:i + 500]
+                marks = ",".join("?" * len(chunk))
+                for key, payload in conn.execute(f"SELECT key, payload FROM results WHERE key IN ({marks})", chunk):
+                    found[key] = tuple(json.loads(payload))
+                conn.execute(f"UPDATE results SET last_access = ? WHERE key IN ({marks})", [time.time(), *chunk])
+            conn.commit()
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+            return found
+
+    def put_many(self, model_version, items):
+        """items: {key: result tuple}."""
+        if not items:
+            return
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            conn.executemany(
+                "INSERT OR REPLACE INTO results (key, model_version, payload, last_access) VALUES (?, ?, ?, ?)",
+                [(key, model_version, json.dumps([str(r[0]), str(r[1]), float(r[2])]), now) for key, r in items.items()]
+            )
+            # LRU eviction
+            (count,) = conn.execute("SELECT COUNT(*) FROM results").fetchone()
+            if count > self.max_entries:
+                conn.execute(
+                    "DELETE FROM results WHERE key IN (SELECT key FROM results ORDER BY last_access ASC LIMIT ?)",
+                    (count - self.max_entries,)
+                )
+            conn.commit()
+
+    def purge_stale(self, current_version):
+        """Deletes every row computed with a different model version. Returns rows removed."""
+        if self._conn is None and not os.path.exists(self.path):
+            return 0
+        with self._lock:
+            conn = self._connect()
+            cur = conn.execute("DELETE FROM results WHERE model_version != ?", (current_version,))
+            conn.commit()
+            return cur.rowcount
+
+    def stats(self):
+        entries = 0
+        if self._conn is not None or os.path.exists(self.path):
+            with self._lock:
+                (entries,) = self._connect().execute("SELECT COUNT(*) FROM results").fetchone()
+        return {'hits': self.hits, 'misses': self.misses, 'entries': entries}
+
+
+RESULT_CACHE = ResultCache()
+
+
+def scenario_keys(model_version, drivers, circuits, modes, pit_loss=None, traffic=1.5, tyre_constraints=None):
+    """{(driver, circuit, mode): cache key} for every scenario of a grid."""
+    constraints = sorted((json.dumps(c, sort_keys=True) for c in (tyre_constraints or [])))
+    keys = {}
+    for circuit in circuits:
+        loss = get_pit_loss(circuit) if pit_loss is None else pit_loss
+        for driver in drivers:
+            for mode in modes:
+                inputs = {'driver': driver, 'circuit': circuit, 'mode': mode, 'pit_loss': loss,
+                          'traffic': traffic, 'constraints': constraints}
+                keys[(driver, circuit, mode)] = ResultCache.make_key(model_version, inputs)
+    return keys
+
+
+def solve_grid_cached(model, encoder, drivers, circuits, modes=("Standard Q3",), pit_loss=None, traffic=1.5,
+                      tyre_constraints=None, model_version=None, cache=RESULT_CACHE):
+    """
+    solve_grid with the season table and the persistent cache in front of it.
+    Only the (driver, circuit) pairs that miss both are sent to the batched solver.
+    """
+    model_version = model_version or REGISTRY.version
+    keys = scenario_keys(model_version, drivers, circuits, modes, pit_loss, traffic, tyre_constraints)
+
+    # Precomputed season rows first, then the persistent cache
+    results = SEASON_TABLE.lookup_grid(drivers, circuits, modes, pit_loss, tyre_constraints, model_version)
+    cached = cache.get_many([key for scenario, key in keys.items() if scenario not in results])
+    results.update({scenario: cached[key] for scenario, key in keys.items() if key in cached})
+
+    # Solve the misses, one batched call per circuit
+    fresh = {}
+    for circuit in circuits:
+        missing = [d for d in drivers if any((d, circuit, m) not in results for m in modes)]
+        if not missing:
+            continue
+        solved = solve_grid(model, encoder, missing, [circuit], modes, pit_loss=pit_loss,
+                            traffic=traffic, tyre_constraints=tyre_constraints)
+        for scenario, result in solved.items():
+            if scenario not in results:
+                results[scenario] = result
+                fresh[keys[scenario]] = result
+    cache.put_many(model_version, fresh)
+
+    return results
+
+
+def purge_stale(model_path=MODEL_PATH, encoder_path=ENCODER_PATH, cache=RESULT_CACHE):
+    """Call after writing new artifacts: drops cached results of older models."""
+    removed = cache.purge_stale(artifact_version(model_path, encoder_path))
+    if removed:
+        print(f"🧹 Cleared {removed} cached strategy results from the previous model.")
+    return removed
@@ -0,0 +1,110 @@
+import copy
+import os
+import time
+import numpy as np
+from sklearn.ensemble import GradientBoostingRegressor, HistGradientBoostingRegressor
+from sklearn.preprocessing import OrdinalEncoder
+
+# --- RETRAIN SETTINGS ---
+# 'fast' = histogram boosting, warm-started from the previous model when possible
+# 'full' = the original GradientBoostingRegressor(n_estimators=100) refit
+RETRAIN_MODE = os.environ.get('F1_RETRAIN_MODE', 'fast')
+CAT_COLS = ['Driver', 'Circuit', 'Compound']
+HIST_PARAMS = dict(learning_rate=0.1, max_iter=500, early_stopping=True, validation_fraction=0.1,
+                   n_iter_no_change=10, random_state=12)
+WARM_TREES = 30        # trees added per update (one race of new laps)
+MAX_TREES = 600        # past this, start over with a cold fit
+# A warm update is kept only if the laps still fit within this factor of the
+# previous model's training MAE; otherwise (e.g. a wet race) refit cold
+WARM_MAX_RATIO = 1.5
+
+
+def covers(encoder, df, cat_cols=CAT_COLS):
+    """
+    True if `encoder` already knows every category in df. Warm starts need it:
+    the old trees were split on the old codes.
+    """
+    if encoder is None or list(getattr(encoder, 'feature_names_in_', [])) != list(cat_cols):
+        return False
+    return all(set(df[col].unique()) <= set(known) for col, known in zip(cat_cols, encoder.categories_))
+
+
+def encode(encoder, df, feature_cols, cat_cols=CAT_COLS):
+    X = df[feature_cols].copy()
+    X[cat_cols] = encoder.transform(df[cat_cols])
+    return X
+
+
+def mae(errors):
+    return float(errors.mean()) if len(errors) else float('nan')
+
+
+def retrain(df, feature_cols, target, new_rows, prev_model=None, prev_encoder=None, mode=RETRAIN_MODE):
+    """
+    Fits the lap-time model on df. `new_rows` is a boolean mask of the laps
+    added since prev_model was trained.
+    Returns (model, encoder, report) where report has mode, how it was fitted
+    ('warm' / 'cold' / 'warm->cold'), trees before/after, seconds and the
+    in-sample MAE of the new laps and the rest.
+    Warm starts need the previous fast model and an encoder that knows every
+    Driver / Circuit / Compound (so the codes don't move); else it's a cold fit.
+    prev_model is never modified: the warm fit runs on a copy.
+    """
+    t0 = time.perf_counter()
+    y = df[target].to_numpy()
+    new_rows = np.asarray(new_rows, dtype=bool)
+    report = {'mode': mode, 'trees_before': 0}
+
+    if mode == 'full':
+        encoder = OrdinalEncoder(handle_unknown='use_encoded_value', unknown_value=-1).fit(df[CAT_COLS])
+        X = encode(encoder, df, feature_cols)
+        model = GradientBoostingRegressor(n_estimators=100).fit(X, y)
+        report.update(fit='cold', trees=model.n_estimators_)
+        errors = None
+    else:
+        model, encoder, X, errors = None, None, None, None
+        # Only retrain's own fast models (they carry fit_mae_) are warm-started
+        if isinstance(prev_model, HistGradientBoostingRegressor) and hasattr(prev_model, 'fit_mae_') \
+                and prev_model.n_iter_ < MAX_TREES and covers(prev_encoder, df):
+            # 1. WARM: the old trees stay, WARM_TREES more are fitted on all laps
+            encoder = prev_encoder
+            X = encode(encoder, df, feature_cols)
+            report['trees_before'] = prev_model.n_iter_
+            model = copy.deepcopy(prev_model)   # the caller's model stays as it was if this one is rejected
+            model.set_params(warm_start=True, early_stopping=False, max_iter=prev_model.n_iter_ + WARM_TREES)
+            try:
+                model.fit(X, y)
+            except Exception as e:
+                model, report['warm_error'] = None, f"{type(e).__name__}: {e}"
+            if model is not None:
+                model.set_params(warm_start=False, early_stopping=HIST_PARAMS['early_stopping'])
+                errors = np.abs(model.predict(X) - y)
+                if mae(errors[new_rows]) > WARM_MAX_RATIO * prev_model.fit_mae_:
+                    model = None
+            report['fit'] = 'warm' if model is not None else 'warm->cold'
+
+        if model is None:
+            # 2. COLD: fresh encoder + early-stopped fit from scratch
+            encoder = OrdinalEncoder(handle_unknown='use_encoded_value', unknown_value=-1).fit(df[CAT_COLS])
+            X = encode(encoder, df, feature_cols)
+            model = HistGradientBoostingRegressor(**HIST_PARAMS).fit(X, y)
+            report.setdefault('fit', 'cold')
+            errors = None
+        report['trees'] = model.n_iter_
+
+    if errors is None:
+        errors = np.abs(model.predict(X) - y)
+    if mode != 'full':
+        model.fit_mae_ = mae(errors)   # the next warm update is judged against this
+    report['seconds'] = time.perf_counter() - t0
+    report['mae_new'] = mae(errors[new_rows])
+    report['mae_rest'] = mae(errors[~new_rows])
+    return model, encoder, report
+
+
+def print_report(report):
+    print(f"🧠 Retrain ({report['mode']}, {report['fit']}): {report['trees_before']} -> {report['trees']} trees "
+          f"in {report['seconds']:.2f}s | MAE new race {report['mae_new']:.3f}s, "
+          f"other races {report['mae_rest']:.3f}s")
+    if 'warm_error' in report:
+        print(f"⚠️ Warm start skipped: {report['warm_error']}")
@@ -0,0 +1,87 @@
+import numpy as np
+import pandas as pd
+
+# --- LAP DATASET SCHEMA ---
+# One dtype per column, shared by every reader and writer of lap data.
+# Strings repeat a handful of values per race -> category; counts fit in int16;
+# integer-valued floats that may be missing (TyreLife, LapNumber, ...) are float32,
+# which stores them exactly.
+CATEGORY_COLS = ['Driver', 'Circuit', 'Compound', 'Team', 'TeamName', 'Abbreviation', 'Status', 'RaceID']
+FLOAT32_COLS = ['TyreLife', 'LapNumber', 'Stint', 'TrackStatus', 'FinalPosition', 'GridPosition',
+                'SpeedI1', 'SpeedI2', 'SpeedFL', 'SpeedST', 'AirTemp', 'TrackTemp', 'Humidity',
+                'Pressure', 'WindSpeed', 'WindDirection', 'LapTime_Seconds']
+INT16_COLS = ['Year', 'Round', 'Season']
+FLAG_COLS = ['Rainfall']   # bool / 0-1 / missing (= dry) -> int8
+# FuelWeight stays float64: train_baseline's encoder keys on its exact value, and
+# features.fuel_weight computes it in float64 at predict time.
+FLOAT64_COLS = ['FuelWeight']
+
+DTYPES = {
+    **{col: 'category' for col in CATEGORY_COLS},
+    **{col: 'float32' for col in FLOAT32_COLS},
+    **{col: 'int16' for col in INT16_COLS},
+    **{col: 'int8' for col in FLAG_COLS},
+    **{col: 'float64' for col in FLOAT64_COLS},
+}
+
+# --- COLUMN SETS ---
+# Raw FastF1 laps as saved by ingest_data (what process_data needs)
+RAW_LAP_COLUMNS = ['Driver', 'LapTime', 'LapNumber', 'PitOutTime', 'PitInTime', 'Compound',
+                   'TyreLife', 'TrackStatus', 'Time']
+# auto_updater's race_data rows; LapTime is already in seconds there
+RACE_COLUMNS = ['Driver', 'Circuit', 'Compound', 'TyreLife', 'LapNumber', 'Rainfall', 'FuelWeight', 'LapTime']
+RACE_DTYPES = {**DTYPES, 'LapTime': 'float32'}
+# process_data output (before add_feature adds FuelWeight)
+TRAINING_COLUMNS = ['Driver', 'Circuit', 'Compound', 'TyreLife', 'LapNumber', 'Rainfall',
+                    'RaceID', 'Year', 'Round', 'LapTime_Seconds']
+# What train_baseline actually uses from the feature dataset
+MODEL_COLUMNS = ['Driver', 'Circuit', 'Compound', 'TyreLife', 'LapNumber', 'Rainfall', 'FuelWeight',
+                 'Year', 'LapTime_Seconds']
+
+
+def validate_columns(df, required, name='dataset'):
+    missing = [col for col in required if col not in df.columns]
+    if missing:
+        raise ValueError(f"{name} is missing columns: {', '.join(missing)}")
+
+
+def apply_schema(df, required=(), dtypes=DTYPES, name='dataset'):
+    """
+    Checks the required columns are there and casts every known column to its
+    schema dtype (unknown columns are left as they are). Returns a new frame.
+    """
+    validate_columns(df, required, name)
+    df = df.copy(deep=False)
+    for col in df.columns:
+        dtype = dtypes.get(col)
+        if dtype is None or df[col].dtype == dtype:
+            continue
+        if col in FLAG_COLS:
+            values = df[col]
+            if values.dtype == object:
+                values = values.map({'True': True, 'False': False, True: True, False: False})
+            df[col] = values.fillna(False).astype(bool).astype(np.int8)
+        elif dtype == 'category':
+            df[col] = df[col].astype('category')
+        else:
+            df[col] = pd.to_numeric(df[col], errors='coerce').astype(dtype)
+    return df
+
+
+def read_csv_typed(path, columns=None, required=(), dtypes=DTYPES, name=None):
+    """
+    pd.read_csv that only parses `columns` (None = all) and builds the
+    categorical / float32 columns directly, then applies the schema. Floats are
+    parsed exactly as written.
+    """
+    header = pd.read_csv(path, nrows=0).columns
+    usecols = list(header) if columns is None else [col for col in columns if col in header]
+    parse = {col: dtypes[col] for col in usecols if dtypes.get(col) in ('category', 'float32')}
+    # round_trip: the default parser can be 1 ulp off, and FuelWeight is matched exactly
+    df = pd.read_csv(path, usecols=usecols, dtype=parse, low_memory=False, float_precision='round_trip')
+    return apply_schema(df, required, dtypes, name or path)
+
+
+def memory_mb(df):
+    """Deep memory of a frame in MB (object strings included)."""
+    return df.memory_usage(deep=True).sum() / 1e6
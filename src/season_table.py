@@ -0,0 +1,208 @@
+import os
+import sys
+import threading
+import time
+import pandas as pd
+
+# Allow `python src/season_table.py` from the repo root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.artifacts import REGISTRY
+from src.calendar_utils import DRIVER_GRID, RACE_CALENDAR
+from src.inventory_solver import MODES, describe_plan, solve_modes
+from src.physics import get_pit_loss
+from src.pit_optimizer import COMPOUNDS, MAX_STOPS
+from src.solve_strategy_battle import SOLVER_VERSION, TOTAL_LAPS
+from src.stint_tables import get_grid_tables
+
+# --- CONFIGURATION ---
+TABLE_PATH = os.path.join('models', 'season_table.parquet')
+CATEGORY_COLS = ['circuit', 'driver', 'mode', 'model_version', 'strategy', 'compounds']
+
+
+def plan_row(race, driver, mode, pit_loss, plan, model_version):
+    """One table row: best strategy, stint details and the best time for every stop count."""
+    strategy, details, total_time = describe_plan(plan)
+    row = {
+        'round': race['round'],
+        'circuit': race['circuit'],
+        'driver': driver,
+        'mode': mode,
+        'model_version': model_version,
+        'solver_version': SOLVER_VERSION,
+        'pit_loss': float(pit_loss),
+        'strategy': strategy,
+        'details': details,
+        'total_time': total_time,
+        'stops': plan['stops'] if plan else -1,
+        'compounds': ",".join(plan['compounds']) if plan else "",
+        'pit_laps': ",".join(map(str, plan['pit_laps'])) if plan else "",
+        'start_ages': ",".join(str(age) for _, age in plan['sets']) if plan else "",
+    }
+    by_stops = plan['by_stops'] if plan else {}
+    for stops in range(1, MAX_STOPS + 1):
+        row[f'time_{stops}stop'] = by_stops[stops]['total_time'] if stops in by_stops else float('inf')
+    return row
+
+
+def read_table(path=TABLE_PATH):
+    """The stored table, or an empty frame if there is none yet."""
+    if not os.path.exists(path):
+        return pd.DataFrame()
+    return pd.read_parquet(path)
+
+
+def write_table(df, path=TABLE_PATH):
+    df = df.copy()
+    for col in CATEGORY_COLS:
+        df[col] = df[col].astype('category')
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp = path + '.tmp'
+    df.to_parquet(tmp, index=False, compression='zstd')
+    os.replace(tmp, path)
+
+
+def build_season_table(model, encoder, model_version, path=TABLE_PATH, calendar=RACE_CALENDAR,
+                       drivers=DRIVER_GRID, modes=MODES):
+    """
+    Precomputes every (round, driver, mode) of the season.
+    Incremental: rows already computed with this model + solver version are kept,
+    everything else (new model, new rounds/drivers) is rebuilt.
+    Returns (table, rows_rebuilt).
+    """
+    existing = read_table(path)
+    if len(existing):
+        existing = existing.astype({col: 'object' for col in CATEGORY_COLS})
+        fresh = (existing['model_version'] == model_version) & (existing['solver_version'] == SOLVER_VERSION)
+        keep = existing[fresh]
+    else:
+        keep = existing
+    done = set(zip(keep['round'], keep['driver'], keep['mode'])) if len(keep) else set()
+
+    new_rows = []
+    for race in calendar:
+        missing = [d for d in drivers if any((race['round'], d, m) not in done for m in modes)]
+        if not missing:
+            continue
+        pit_loss = get_pit_loss(race['circuit'])
+        # One predict for the whole (missing) grid at this circuit
+        tables = get_grid_tables(model, encoder, missing, race['circuit'], COMPOUNDS, TOTAL_LAPS)
+        for driver in missing:
+            plans = solve_modes(model, encoder, driver, race['circuit'], modes, pit_loss=pit_loss,
+                                tables=tables[driver], total_laps=TOTAL_LAPS)
+            for mode, plan in plans.items():
+                if (race['round'], driver, mode) not in done:
+                    new_rows.append(plan_row(race, driver, mode, pit_loss, plan, model_version))
+
+    # Drop rounds/drivers/modes that are no longer asked for
+    wanted = {(race['round'], d, m) for race in calendar for d in drivers for m in modes}
+    if len(keep):
+        keep = keep[[key in wanted for key in zip(keep['round'], keep['driver'], keep['mode'])]]
+
+    table = pd.concat([keep, pd.DataFrame(new_rows)], ignore_index=True) if new_rows else keep
+    if new_rows or len(table) != len(existing):
+        table = table.sort_values(['round', 'driver', 'mode'], ignore_index=True)
+        write_table(table, path)
+    return table, len(new_rows)
+
+
+class SeasonTable:
+    """
+    O(1) reads of the precomputed season table.
+    The file is indexed once by (circuit, driver, mode), keeping only rows of
+    the current model + solver; it is re-read when the file or the model changes.
+    """
+
+    def __init__(self, path=TABLE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._stamp = None
+        self._version = None
+        self._index = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _refresh(self, model_version):
+        try:
+            st = os.stat(self.path)
+            stamp = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            stamp = None
+        if stamp == self._stamp and model_version == self._version:
+            return
+
+        index = {}
+        if stamp is not None:
+            try:
+                df = read_table(self.path)
+            except (ImportError, ValueError, OSError) as e:
+                print(f"⚠️ Could not read the season table: {e}")
+                df = pd.DataFrame()
+            if len(df):
+                df = df[(df['model_version'] == model_version) & (df['solver_version'] == SOLVER_VERSION)]
+                for row in df.to_dict('records'):
+                    index[(row['circuit'], row['driver'], row['mode'])] = row
+        self._index = index
+        self._stamp = stamp
+        self._version = model_version
+
+    def row(self, driver, circuit, mode, model_version=None):
+        """Full precomputed row (dict) or None."""
+        model_version = model_version or REGISTRY.version
+        with self._lock:
+            self._refresh(model_version)
+            row = self._index.get((circuit, driver, mode))
+            if row is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return row
+
+    def lookup_grid(self, drivers, circuits, modes, pit_loss=None, tyre_constraints=None, model_version=None):
+        """
+        {(driver, circuit, mode): (strategy, desc, time)} for every scenario the
+        table can answer. Only the default setup is precomputed: no tyre
+        constraints and the circuit's own pit loss.
+        """
+        if tyre_constraints:
+            return {}
+        model_version = model_version or REGISTRY.version
+        found = {}
+        with self._lock:
+            self._refresh(model_version)
+            if not self._index:
+                return found
+            for circuit in circuits:
+                if pit_loss is not None and float(pit_loss) != get_pit_loss(circuit):
+                    continue
+                for driver in drivers:
+                    for mode in modes:
+                        row = self._index.get((circuit, driver, mode))
+                        if row is not None:
+                            found[(driver, circuit, mode)] = (row['strategy'], row['details'], row['total_time'])
+            self.hits += len(found)
+            self.misses += len(drivers) * len(circuits) * len(modes) - len(found)
+        return found
+
+    def stats(self, model_version=None):
+        model_version = model_version or REGISTRY.version
+        with self._lock:
+            self._refresh(model_version)
+            return {'rows': len(self._index), 'hits': self.hits, 'misses': self.misses}
+
+
+SEASON_TABLE = SeasonTable()
+
+
+if __name__ == "__main__":
+    model, encoder = REGISTRY.get(fast=True)
+    version = REGISTRY.version
+
+    print(f"\n--- 📅 SEASON TABLE (model {version}) ---")
+    t0 = time.perf_counter()
+    table, rebuilt = build_season_table(model, encoder, version)
+    elapsed = time.perf_counter() - t0
+    size_kb = os.path.getsize(TABLE_PATH) / 1024 if os.path.exists(TABLE_PATH) else 0
+
+    print(f"{len(table)} rows ({rebuilt} rebuilt, {len(table) - rebuilt} kept) in {elapsed:.1f}s")
+    print(f"Saved to {TABLE_PATH} ({size_kb:.0f} KB)")
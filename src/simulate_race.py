@@ -1,9 +1,13 @@
-import pandas as pd
 import joblib
 import os
-import matplotlib.pyplot as plt
+import sys
 import warnings
 
+# Allow `python src/simulate_race.py` from the repo root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.race_engine import simulate
+
 warnings.filterwarnings('ignore')
 
 # --- CONFIGURATION ---
@@ -24,69 +28,26 @@ def simulate_strategy(driver, circuit, start_compound, pit_lap, end_compound):
     print(f"\n--- Simulating {driver} at {circuit} ---")
     print(f"Strategy: Start {start_compound} -> Pit Lap {pit_lap} -> Finish {end_compound}")
     
-    cumulative_time = 0
-    lap_times = []
-    
-    # State Variables
-    current_compound = start_compound
-    current_tyre_age = 0  # Fresh tyres at start
+    # Whole race in one prediction (race_engine), then print the trace
+    race = {'driver': driver, 'circuit': circuit, 'compounds': [start_compound, end_compound], 'pit_laps': [pit_lap]}
+    trace = simulate(model, encoder, [race], PIT_LOSS_SECONDS, TOTAL_LAPS)[0]
+    lap_times = list(trace['lap_time'])
+    cumulative_time = trace['total_time']
     
     print("Lap  | Cmpd | Age | Fuel | Pred Time | Total Time")
     print("-" * 55)
 
-    for lap in range(1, TOTAL_LAPS + 1):
-        # 1. Handle Pit Stop
+    for i, lap in enumerate(trace['lap']):
         is_pit_lap = (lap == pit_lap)
-        
-        if is_pit_lap:
-            # We assume the lap time INCLUDES the pit loss
-            # But we switch tyres for the NEXT lap
-            pass # We calculate the in-lap normally, then add pit loss
-            
-        # 2. Prepare Input for Model
-        # Calculate Fuel (LINEAR BURN: 110kg -> 0kg)
-        fuel_weight = 110 * (1 - (lap / TOTAL_LAPS))
-        if fuel_weight < 0: fuel_weight = 0
-        
-        input_data = pd.DataFrame({
-            'Driver': [driver],
-            'Circuit': [circuit],
-            'Compound': [current_compound],
-            'TyreLife': [current_tyre_age],
-            'LapNumber': [lap],
-            'Rainfall': [0],      # Assume dry race for now
-            'FuelWeight': [fuel_weight]
-        })
-        
-        # 3. Predict Lap Time
-        # Encode
-        encoded_data = encoder.transform(input_data)
-        # Predict
-        pred_seconds = model.predict(encoded_data)[0]
-        
-        # 4. Add Pit Stop Penalty if applicable
-        if is_pit_lap:
-            pred_seconds += PIT_LOSS_SECONDS
-            note = " (PIT)"
-        else:
-            note = ""
-            
-        cumulative_time += pred_seconds
-        lap_times.append(pred_seconds)
+        note = " (PIT)" if is_pit_lap else ""
         
         # Print progress every 5 laps or on pit lap
         if lap % 5 == 0 or is_pit_lap:
+            pred_seconds = trace['lap_time'][i]
             m = int(pred_seconds // 60)
             s = pred_seconds % 60
-            total_m = int(cumulative_time // 60)
-            print(f"{lap:3d}  | {current_compound[:3]}  | {current_tyre_age:3d} | {int(fuel_weight):3d}  | {m}:{s:05.2f}{note} | {total_m}m")
-        
-        # 5. Update Car State for NEXT lap
-        if is_pit_lap:
-            current_compound = end_compound # Change tyres
-            current_tyre_age = 0            # Reset age
-        else:
-            current_tyre_age += 1           # Tyres get older
+            total_m = int(trace['cumulative'][i] // 60)
+            print(f"{lap:3d}  | {trace['compound'][i][:3]}  | {trace['tyre_age'][i]:3d} | {int(trace['fuel'][i]):3d}  | {m}:{s:05.2f}{note} | {total_m}m")
 
     print("-" * 55)
     total_m = int(cumulative_time // 60)
@@ -1,8 +1,13 @@
-import pandas as pd
 import joblib
 import os
+import sys
 import warnings
 
+# Allow `python src/solve_strategy.py` from the repo root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.race_engine import simulate
+
 warnings.filterwarnings('ignore')
 
 # --- CONFIGURATION ---
@@ -18,48 +23,8 @@ def load_artifacts():
     return joblib.load(MODEL_PATH), joblib.load(ENCODER_PATH)
 
 def get_race_time(driver, circuit, start_compound, pit_lap, end_compound, model, encoder):
-    cumulative_time = 0
-    
-    # State Variables
-    current_compound = start_compound
-    current_tyre_age = 0 
-
-    for lap in range(1, TOTAL_LAPS + 1):
-        is_pit_lap = (lap == pit_lap)
-        
-        # Physics: Fuel decreases linearly
-        fuel_weight = 110 * (1 - (lap / TOTAL_LAPS))
-        if fuel_weight < 0: fuel_weight = 0
-        
-        # Prepare Input
-        input_data = pd.DataFrame({
-            'Driver': [driver],
-            'Circuit': [circuit],
-            'Compound': [current_compound],
-            'TyreLife': [current_tyre_age],
-            'LapNumber': [lap],
-            'Rainfall': [0],
-            'FuelWeight': [fuel_weight]
-        })
-        
-        # Predict
-        encoded_data = encoder.transform(input_data)
-        pred_seconds = model.predict(encoded_data)[0]
-        
-        # Add Pit Cost
-        if is_pit_lap:
-            pred_seconds += PIT_LOSS_SECONDS
-            
-        cumulative_time += pred_seconds
-        
-        # Update State
-        if is_pit_lap:
-            current_compound = end_compound
-            current_tyre_age = 0
-        else:
-            current_tyre_age += 1
-            
-    return cumulative_time
+    race = {'driver': driver, 'circuit': circuit, 'compounds': [start_compound, end_compound], 'pit_laps': [pit_lap]}
+    return simulate(model, encoder, [race], PIT_LOSS_SECONDS, TOTAL_LAPS)[0]['total_time']
 
 def find_optimal_strategy():
     model, encoder = load_artifacts()
@@ -76,12 +41,12 @@ def find_optimal_strategy():
     print("Pit Lap | Total Time  | Diff to Best")
     print("-" * 40)
     
-    results = []
-    
-    # Test every possible pit lap from 10 to 50
-    for pit_lap in range(10, 51):
-        total_time = get_race_time(driver, circuit, start_cmpd, pit_lap, end_cmpd, model, encoder)
-        results.append((pit_lap, total_time))
+    # Test every possible pit lap from 10 to 50 (one simulation call for all of them)
+    pit_window = range(10, 51)
+    races = [{'driver': driver, 'circuit': circuit, 'compounds': [start_cmpd, end_cmpd], 'pit_laps': [pit_lap]}
+             for pit_lap in pit_window]
+    traces = simulate(model, encoder, races, PIT_LOSS_SECONDS, TOTAL_LAPS)
+    results = [(pit_lap, trace['total_time']) for pit_lap, trace in zip(pit_window, traces)]
     
     # Sort by fastest time
     results.sort(key=lambda x: x[1])
@@ -1,132 +1,90 @@
-import joblib
-import pandas as pd
-import os
+from src.artifacts import REGISTRY
+from src.inventory_solver import MODES, describe_plan, solve_modes
+from src.physics import get_pit_loss
+from src.pit_optimizer import COMPOUNDS
+from src.race_engine import stint_time
+from src.stint_tables import get_grid_tables
 
-# --- PATHS ---
-MODEL_PATH = 'models/f1_baseline_model.pkl'
-ENCODER_PATH = 'models/encoder.pkl'
+# --- STRATEGY OPTIONS ---
+# S = Soft, M = Medium, H = Hard
+STRATEGY_OPTIONS = [
+    ['SOFT', 'MEDIUM'],          # 1-Stop
+    ['MEDIUM', 'HARD'],          # 1-Stop
+    ['SOFT', 'HARD'],            # 1-Stop
+    ['SOFT', 'MEDIUM', 'SOFT'],  # 2-Stop Aggressive
+    ['SOFT', 'MEDIUM', 'MEDIUM'],# 2-Stop Balanced
+    ['MEDIUM', 'HARD', 'MEDIUM'] # 2-Stop Conservative
+]
+
+# Race Distance (Approx 57 laps for Bahrain standard)
+TOTAL_LAPS = 57
+
+# Bump whenever solve_scenario/solve_grid would return different answers for the
+# same inputs, so persisted results (result_cache.py) are not reused.
+SOLVER_VERSION = 2
 
 def load_artifacts():
-    """Loads the trained model and encoder."""
-    if not os.path.exists(MODEL_PATH) or not os.path.exists(ENCODER_PATH):
-        raise FileNotFoundError("Model artifacts not found. Please wait for the auto-updater to run.")
-    
-    model = joblib.load(MODEL_PATH)
-    encoder = joblib.load(ENCODER_PATH)
-    return model, encoder
+    """Returns the trained model and encoder from the shared artifact registry."""
+    return REGISTRY.get()
 
 def get_stint_time(model, encoder, driver_code, circuit, compound, laps, start_lap, traffic_factor=1.0):
     """
-    Predicts the total time for a stint using the ML model.
+    Predicted total time for a stint of `laps` laps on fresh tyres after `start_lap` laps.
+    Every lap is simulated (race_engine), not just an "average" lap.
     """
-    # 1. Prepare Input Data (Must match auto_updater.py features EXACTLY)
-    # Features: ['Driver', 'Circuit', 'Compound', 'TyreLife', 'LapNumber', 'Rainfall', 'FuelWeight']
-    
-    # We estimate average fuel for the stint (Linear burn approx)
-    fuel_start = 110 - (start_lap * 1.7)
-    fuel_end = 110 - ((start_lap + laps) * 1.7)
-    avg_fuel = max(0, (fuel_start + fuel_end) / 2)
-    
-    # We predict the pace for the "average" lap in the stint
-    avg_lap = start_lap + (laps / 2)
-    avg_tyre_life = (laps / 2) + 1  # Assume fresh tyres at start of stint
-
-    input_df = pd.DataFrame({
-        'Driver': [driver_code],
-        'Circuit': [circuit],
-        'Compound': [compound],
-        'TyreLife': [avg_tyre_life],
-        'LapNumber': [avg_lap],
-        'Rainfall': [0],  # <--- NEW: Defaults to Dry (0) for strategy planning
-        'FuelWeight': [avg_fuel]
-    })
+    return stint_time(model, encoder, driver_code, circuit, compound, start_lap + 1, laps, 0, TOTAL_LAPS) * traffic_factor
 
-    # 2. Encode Categoricals
-    # The encoder was trained ONLY on ['Driver', 'Circuit', 'Compound']
-    # We must transform those 3, then combine with the numericals.
-    
-    # Create a copy to avoid warnings
-    df_encoded = input_df.copy()
-    
-    # Transform only the categorical columns
-    cat_cols = ['Driver', 'Circuit', 'Compound']
-    df_encoded[cat_cols] = encoder.transform(input_df[cat_cols])
+def plan_stints(compounds):
+    """Split laps evenly for simplicity. Returns [(compound, stint_len, start_lap)] and the base stint length."""
+    laps_per_stint = TOTAL_LAPS // len(compounds)
+    stints = []
+    current_lap = 0
+    for i, compound in enumerate(compounds):
+        # Last stint takes remainder laps
+        if i == len(compounds) - 1:
+            stint_len = TOTAL_LAPS - current_lap
+        else:
+            stint_len = laps_per_stint
+        stints.append((compound, stint_len, current_lap))
+        current_lap += stint_len
+    return stints, laps_per_stint
 
-    # 3. Predict Single Lap Pace
-    # The model expects ALL columns: Cats + Nums
-    feature_order = ['Driver', 'Circuit', 'Compound', 'TyreLife', 'LapNumber', 'Rainfall', 'FuelWeight']
-    base_lap_time = model.predict(df_encoded[feature_order])[0]
-    
-    # 4. Calculate Total Stint Time
-    # (Base Pace * Laps) + (Traffic Penalty)
-    total_time = (base_lap_time * laps) * traffic_factor
-    
-    return total_time
+def solve_grid(model, encoder, drivers, circuits, modes=("Standard Q3",), pit_loss=None, traffic=1.5, tyre_constraints=None):
+    """
+    Best strategy for every (driver, circuit, mode).
+    Each mode races on the sets tyre_strategy.get_race_start_tyres leaves after
+    qualifying (minus tyre_constraints); stint order, set choice and pit laps are
+    searched exactly (inventory_solver). The stint tables of the whole grid are
+    built with a single model.predict per circuit.
+    Returns {(driver, circuit, mode): (strategy, desc, time)}.
+    pit_loss=None uses physics.get_pit_loss for each circuit.
+    """
+    results = {}
+    for circuit in circuits:
+        loss = get_pit_loss(circuit) if pit_loss is None else pit_loss
+        tables = get_grid_tables(model, encoder, drivers, circuit, COMPOUNDS, TOTAL_LAPS)
+        for driver_code in drivers:
+            plans = solve_modes(model, encoder, driver_code, circuit, modes, pit_loss=loss,
+                                tyre_constraints=tyre_constraints, tables=tables[driver_code],
+                                total_laps=TOTAL_LAPS)
+            for mode, plan in plans.items():
+                results[(driver_code, circuit, mode)] = describe_plan(plan)
+    return results
 
 def solve_scenario(model, encoder, driver_code, circuit, pit_loss, traffic, constraints, mode, fast_mode=False, tyre_constraints=None):
     """
-    Calculates the best strategy (1-stop vs 2-stop).
+    Calculates the best strategy for the tyres the driver has left in `mode`.
     """
-    strategies = []
-    
-    # --- STRATEGY OPTIONS ---
-    # S = Soft, M = Medium, H = Hard
-    options = [
-        ['SOFT', 'MEDIUM'],          # 1-Stop
-        ['MEDIUM', 'HARD'],          # 1-Stop
-        ['SOFT', 'HARD'],            # 1-Stop
-        ['SOFT', 'MEDIUM', 'SOFT'],  # 2-Stop Aggressive
-        ['SOFT', 'MEDIUM', 'MEDIUM'],# 2-Stop Balanced
-        ['MEDIUM', 'HARD', 'MEDIUM'] # 2-Stop Conservative
-    ]
-    
-    # Race Distance (Approx 57 laps for Bahrain standard)
-    TOTAL_LAPS = 57
-    
-    best_time = float('inf')
-    best_strat = "Unknown"
-    best_desc = "Analysis failed"
+    results = solve_grid(model, encoder, [driver_code], [circuit], [mode], pit_loss=pit_loss,
+                         traffic=traffic, tyre_constraints=tyre_constraints)
+    return results[(driver_code, circuit, mode)]
 
-    for compounds in options:
-        # Check tyre constraints (e.g. "No Softs")
-        valid = True
-        if tyre_constraints:
-            for constraint in tyre_constraints:
-                # If "No New Softs" and we use Soft, we check (simplified logic)
-                for c in compounds:
-                    if c == constraint['compound'] and constraint['limit'] == 0:
-                        valid = False
-        if not valid:
-            continue
-
-        # Split laps evenly for simplicity
-        n_stops = len(compounds) - 1
-        laps_per_stint = TOTAL_LAPS // len(compounds)
-        
-        current_time = 0
-        current_lap = 0
-        
-        for i, compound in enumerate(compounds):
-            # Last stint takes remainder laps
-            if i == len(compounds) - 1:
-                stint_len = TOTAL_LAPS - current_lap
-            else:
-                stint_len = laps_per_stint
-            
-            # Add Pit Loss for stops (not for race start)
-            if i > 0:
-                current_time += pit_loss
-            
-            # Calculate Driving Time
-            stint_time = get_stint_time(model, encoder, driver_code, circuit, compound, stint_len, current_lap)
-            current_time += stint_time
-            current_lap += stint_len
-            
-        # Compare
-        if current_time < best_time:
-            best_time = current_time
-            strategy_str = " -> ".join(compounds)
-            best_strat = f"{len(compounds)-1} Stop ({strategy_str})"
-            best_desc = f"Stints: ~{laps_per_stint} laps each. Total Time: {int(best_time//60)}m {int(best_time%60)}s"
-
-    return best_strat, best_desc, best_time
\ No newline at end of file
+def solve_scenario_modes(model, encoder, driver_code, circuit, pit_loss, traffic, modes=MODES, tyre_constraints=None):
+    """
+    solve_scenario for several qualifying modes in one pass: the modes share the
+    stint tables (one predict) and cost matrices, and modes left with the same
+    tyre sets are searched once. Returns {mode: (strategy, desc, time)}.
+    """
+    results = solve_grid(model, encoder, [driver_code], [circuit], modes, pit_loss=pit_loss,
+                         traffic=traffic, tyre_constraints=tyre_constraints)
+    return {mode: results[(driver_code, circuit, mode)] for mode in modes}
@@ -0,0 +1,130 @@
+import threading
+from collections import OrderedDict
+import numpy as np
+from src.race_engine import predict_laps
+
+# --- CONFIGURATION ---
+TOTAL_LAPS = 57
+MAX_START_AGE = 10     # Oldest set we expect to start a stint on (e.g. used quali softs)
+CACHE_SIZE = 256       # Tables kept in memory (one per driver/circuit/compound)
+
+
+class StintTable:
+    """
+    Predicted lap times for one (driver, circuit, compound) plus cumulative sums.
+
+    lap_times[lap, age] = predicted time of `lap` (1-based) on tyres aged `age`.
+    cum[lap, age] = sum of lap_times along the stint that ENDS on `lap` with
+    tyres aged `age - 1` (i.e. cum has a leading zero row and column), so a
+    stint of any length is two lookups.
+    """
+
+    def __init__(self, lap_times):
+        self.lap_times = lap_times
+        self.total_laps = lap_times.shape[0] - 1
+        self.max_age = lap_times.shape[1] - 1
+
+        cum = np.zeros((self.total_laps + 1, self.max_age + 2))
+        for lap in range(1, self.total_laps + 1):
+            cum[lap, 1:] = cum[lap - 1, :-1] + lap_times[lap]
+        self.cum = cum
+
+    def lap_time(self, lap, age):
+        return self.lap_times[lap, age]
+
+    def stint_time(self, start_lap, n_laps, tyre_age=0):
+        """Total time for laps start_lap..start_lap+n_laps-1 starting on tyres aged tyre_age. O(1)."""
+        if n_laps <= 0:
+            return 0.0
+        end_lap = start_lap + n_laps - 1
+        return self.cum[end_lap, tyre_age + n_laps] - self.cum[start_lap - 1, tyre_age]
+
+
+class StintTableCache:
+    """LRU cache of StintTables. Misses for one (driver, circuit) are built in ONE predict."""
+
+    def __init__(self, maxsize=CACHE_SIZE):
+        self.maxsize = maxsize
+        self._tables = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_tables(self, model, encoder, driver, circuit, compounds, total_laps=TOTAL_LAPS, max_start_age=MAX_START_AGE):
+        """Returns {compound: StintTable}."""
+        return self.get_tables_many(model, encoder, [driver], circuit, compounds, total_laps, max_start_age)[driver]
+
+    def get_tables_many(self, model, encoder, drivers, circuit, compounds, total_laps=TOTAL_LAPS, max_start_age=MAX_START_AGE):
+        """Returns {driver: {compound: StintTable}}; every miss is built in ONE predict."""
+        # The model/encoder objects are part of the key, so a hot-reloaded model never reuses old tables
+        base_key = (id(model), id(encoder))
+        tables = {driver: {} for driver in drivers}
+        missing = []
+        with self._lock:
+            for driver in drivers:
+                for compound in compounds:
+                    key = base_key + (driver, circuit, total_laps, max_start_age, compound)
+                    if key in self._tables:
+                        self._tables.move_to_end(key)
+                        tables[driver][compound] = self._tables[key][2]
+                        self.hits += 1
+                    else:
+                        missing.append((driver, compound))
+                        self.misses += 1
+
+        if missing:
+            built = build_many(model, encoder, missing, circuit, total_laps, max_start_age)
+            with self._lock:
+                for (driver, compound), table in built.items():
+                    # Keep model/encoder referenced so their id() cannot be reused while cached
+                    self._tables[base_key + (driver, circuit, total_laps, max_start_age, compound)] = (model, encoder, table)
+                    tables[driver][compound] = table
+                while len(self._tables) > self.maxsize:
+                    self._tables.popitem(last=False)
+
+        return tables
+
+    def clear(self):
+        with self._lock:
+            self._tables.clear()
+
+    def stats(self):
+        return {'tables': len(self._tables), 'hits': self.hits, 'misses': self.misses}
+
+
+def build_tables(model, encoder, driver, circuit, compounds, total_laps=TOTAL_LAPS, max_start_age=MAX_START_AGE):
+    """Predicts every (lap, tyre age) of every compound in one vectorized call."""
+    built = build_many(model, encoder, [(driver, c) for c in compounds], circuit, total_laps, max_start_age)
+    return {compound: table for (_, compound), table in built.items()}
+
+
+def build_many(model, encoder, pairs, circuit, total_laps=TOTAL_LAPS, max_start_age=MAX_START_AGE):
+    """Same as build_tables for a list of (driver, compound) pairs. Returns {(driver, compound): StintTable}."""
+    max_age = total_laps - 1 + max_start_age
+    laps = np.repeat(np.arange(1, total_laps + 1), max_age + 1)
+    ages = np.tile(np.arange(max_age + 1), total_laps)
+    n = len(laps)
+
+    preds = predict_laps(model, encoder,
+                         np.repeat([driver for driver, _ in pairs], n), circuit,
+                         np.repeat([compound for _, compound in pairs], n),
+                         np.tile(laps, len(pairs)), np.tile(ages, len(pairs)), total_laps, dedupe=False)
+
+    tables = {}
+    for i, pair in enumerate(pairs):
+        lap_times = np.zeros((total_laps + 1, max_age + 1))
+        lap_times[1:] = preds[i * n:(i + 1) * n].reshape(total_laps, max_age + 1)
+        tables[pair] = StintTable(lap_times)
+    return tables
+
+
+# Shared by every solver in the process
+STINT_TABLES = StintTableCache()
+
+
+def get_stint_tables(model, encoder, driver, circuit, compounds, total_laps=TOTAL_LAPS):
+    return STINT_TABLES.get_tables(model, encoder, driver, circuit, compounds, total_laps)
+
+
+def get_grid_tables(model, encoder, drivers, circuit, compounds, total_laps=TOTAL_LAPS):
+    return STINT_TABLES.get_tables_many(model, encoder, drivers, circuit, compounds, total_laps)
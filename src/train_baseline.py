@@ -1,54 +1,52 @@
-import pandas as pd
-import numpy as np
-from sklearn.model_selection import train_test_split
 from sklearn.ensemble import HistGradientBoostingRegressor
-from sklearn.preprocessing import OrdinalEncoder
 from sklearn.metrics import mean_absolute_error
 import joblib  # To save the trained model
 import os
+import sys
+
+# Allow `python src/train_baseline.py` from the repo root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.result_cache import purge_stale
+from src.schema import MODEL_COLUMNS, memory_mb, read_csv_typed
+from src.training_matrix import SOURCE_PATH, TEST_YEAR, load_matrix, write_matrix
 
 # --- CONFIGURATION ---
-DATA_PATH = os.path.join('data', 'processed', 'f1_training_data_v2.csv')
+DATA_PATH = SOURCE_PATH
 MODEL_DIR = 'models'
 os.makedirs(MODEL_DIR, exist_ok=True)
 
 def train_model():
     print("1. Loading Data...")
-    df = pd.read_csv(DATA_PATH)
-    
-    # --- PREPROCESSING ---
-    # We only want to train on valid racing laps
-    # Remove out-laps (LapTime > 110% of median) to remove crashes/safety cars
-    median_time = df['LapTime_Seconds'].median()
-    df = df[df['LapTime_Seconds'] < median_time * 1.15]
+    # The pipeline's pre-encoded matrix (add_feature.py), memory-mapped; built here if missing or stale
+    matrix = load_matrix()
+    if matrix is None:
+        print("   No current training matrix, building it from the CSV...")
+        # Only the model's columns, parsed straight into compact dtypes
+        df = read_csv_typed(DATA_PATH, MODEL_COLUMNS, required=MODEL_COLUMNS)
+        print(f"   {len(df)} laps, {memory_mb(df):.1f} MB in memory.")
+        # Keeps only valid racing laps: out-laps (LapTime > 115% of median), crashes
+        # and safety cars are dropped, then every feature is encoded
+        write_matrix(df, source=DATA_PATH)
+        del df
+        matrix = load_matrix()
     
-    print(f"   Training on {len(df)} clean racing laps.")
+    print(f"   Training on {len(matrix)} clean racing laps.")
 
-    # Select Features (Inputs) and Target (Output)
-    # We want to predict 'LapTime_Seconds' based on:
-    features = ['Driver', 'Circuit', 'Compound', 'TyreLife', 'LapNumber', 'Rainfall', 'FuelWeight']
-    target = 'LapTime_Seconds'
-
-    # Handle Text Columns (Driver, Circuit, Compound)
-    # Machines only understand numbers. We use OrdinalEncoder to convert "Hamilton" -> 44, "Soft" -> 1
-    print("2. Encoding Features...")
-    encoder = OrdinalEncoder(handle_unknown='use_encoded_value', unknown_value=-1)
+    # Features (Inputs) and Target (Output): 'LapTime_Seconds' predicted from
+    # Driver, Circuit, Compound, TyreLife, LapNumber, Rainfall, FuelWeight,
+    # already encoded as numbers by the OrdinalEncoder ("Hamilton" -> 44, "Soft" -> 1)
+    print("2. Encoding Features (pre-encoded by the pipeline)...")
+    encoder = matrix.encoder()
     
     # We split data strictly by YEAR to simulate predicting the future
     # Train: 2023 & 2024
     # Test: 2025 (The AI has never seen this year)
-    train_data = df[df['Year'] < 2025].copy()
-    test_data = df[df['Year'] == 2025].copy()
-    
-    print(f"   Train Set: {len(train_data)} laps (2023-2024)")
-    print(f"   Test Set:  {len(test_data)} laps (2025)")
-
-    # Transform text to numbers
-    X_train = encoder.fit_transform(train_data[features])
-    y_train = train_data[target]
+    # Rows are sorted by year, so both sets are zero-copy views of the mapped file
+    X_train, y_train, X_test, y_test = matrix.split(TEST_YEAR)
     
-    X_test = encoder.transform(test_data[features])
-    y_test = test_data[target]
+    print(f"   Train Set: {len(y_train)} laps (2023-2024)")
+    print(f"   Test Set:  {len(y_test)} laps (2025)")
 
     # --- TRAINING ---
     print("3. Training Model (Gradient Boosting)...")
@@ -74,6 +72,7 @@ def train_model():
     # Save the Brain
     joblib.dump(model, os.path.join(MODEL_DIR, 'f1_baseline_model.pkl'))
     joblib.dump(encoder, os.path.join(MODEL_DIR, 'encoder.pkl'))
+    purge_stale(os.path.join(MODEL_DIR, 'f1_baseline_model.pkl'), os.path.join(MODEL_DIR, 'encoder.pkl'))
     print(f"\nModel saved to '{MODEL_DIR}/f1_baseline_model.pkl'")
 
 if __name__ == "__main__":
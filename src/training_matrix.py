@@ -0,0 +1,149 @@
+import json
+import os
+import sys
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import OrdinalEncoder
+
+# Allow `python src/training_matrix.py` from the repo root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.features import FEATURES, feature_matrix
+from src.schema import MODEL_COLUMNS, read_csv_typed
+
+# --- CONFIGURATION ---
+SOURCE_PATH = os.path.join('data', 'processed', 'f1_training_data_v2.csv')
+MATRIX_DIR = os.path.join('data', 'processed', 'matrix')
+META_FILE = 'meta.json'   # written last: a matrix without it is incomplete
+TARGET = 'LapTime_Seconds'
+TEST_YEAR = 2025          # train on the seasons before, test on this one
+OUTLIER_FACTOR = 1.15     # laps slower than this x the median are dropped (crashes, safety cars)
+MATRIX_VERSION = 1        # bump when the filtering / encoding changes
+
+
+# --- BUILD ---
+def build_matrix(df, test_year=TEST_YEAR):
+    """
+    The training set exactly as train_baseline uses it: clean laps only, sorted
+    by Year (so each season is a contiguous block of rows) and encoded with an
+    OrdinalEncoder fitted on the seasons before test_year.
+    Returns (X float32, y float32, year int16, encoder).
+    """
+    median_time = df[TARGET].median()
+    df = df[df[TARGET] < median_time * OUTLIER_FACTOR]
+    df = df.sort_values('Year', kind='stable')
+
+    encoder = OrdinalEncoder(handle_unknown='use_encoded_value', unknown_value=-1)
+    encoder.fit(df.loc[df['Year'] < test_year, FEATURES].drop_duplicates())
+    X = feature_matrix(encoder, df[FEATURES]).astype(np.float32)   # codes are small integers: exact
+    y = df[TARGET].to_numpy(dtype=np.float32)
+    year = df['Year'].to_numpy(dtype=np.int16)
+    return X, y, year, encoder
+
+
+def _save_npy(path, array):
+    tmp = path + '.tmp.npy'
+    np.save(tmp, np.ascontiguousarray(array))
+    os.replace(tmp, path)
+
+
+def _source_stamp(source):
+    if source is None or not os.path.exists(source):
+        return None
+    st = os.stat(source)
+    return {'path': source, 'size': st.st_size, 'mtime_ns': st.st_mtime_ns}
+
+
+def write_matrix(df, out_dir=MATRIX_DIR, source=None, test_year=TEST_YEAR):
+    """
+    Writes X.npy / y.npy / year.npy plus meta.json (features, category
+    dictionaries, source file stamp) for a frame with MODEL_COLUMNS.
+    Returns the number of rows written.
+    """
+    X, y, year, encoder = build_matrix(df, test_year)
+    os.makedirs(out_dir, exist_ok=True)
+    meta_path = os.path.join(out_dir, META_FILE)
+    if os.path.exists(meta_path):
+        os.remove(meta_path)   # readers treat the matrix as missing until the new one is complete
+    for name, array in (('X', X), ('y', y), ('year', year)):
+        _save_npy(os.path.join(out_dir, f"{name}.npy"), array)
+
+    meta = {
+        'version': MATRIX_VERSION,
+        'rows': len(y),
+        'features': FEATURES,
+        'target': TARGET,
+        'test_year': test_year,
+        # code i of a feature = categories[feature]['values'][i]; anything else is -1
+        'categories': {feature: {'dtype': str(cats.dtype), 'values': cats.tolist()}
+                       for feature, cats in zip(FEATURES, encoder.categories_)},
+        'source': _source_stamp(source),
+    }
+    tmp = meta_path + '.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(meta, f)
+    os.replace(tmp, meta_path)
+    return len(y)
+
+
+# --- LOAD ---
+class TrainingMatrix:
+    """
+    The pipeline's pre-encoded training data. The arrays are opened with
+    np.load(mmap_mode='r'): nothing is read until rows are touched, and the
+    train/test blocks are views, not copies.
+    """
+
+    def __init__(self, path=MATRIX_DIR, mmap=True):
+        with open(os.path.join(path, META_FILE)) as f:
+            self.meta = json.load(f)
+        mode = 'r' if mmap else None
+        self.X = np.load(os.path.join(path, 'X.npy'), mmap_mode=mode)
+        self.y = np.load(os.path.join(path, 'y.npy'), mmap_mode=mode)
+        self.year = np.load(os.path.join(path, 'year.npy'), mmap_mode=mode)
+        if not len(self.X) == len(self.y) == len(self.year) == self.meta['rows']:
+            raise ValueError(f"Training matrix in {path} is inconsistent; rebuild it")
+        self.features = self.meta['features']
+
+    def __len__(self):
+        return len(self.y)
+
+    def year_rows(self, first=None, last=None):
+        """slice of the rows with first <= Year <= last (None = open-ended)."""
+        start = 0 if first is None else int(np.searchsorted(self.year, first, 'left'))
+        stop = len(self) if last is None else int(np.searchsorted(self.year, last, 'right'))
+        return slice(start, stop)
+
+    def split(self, test_year=None):
+        """(X_train, y_train, X_test, y_test): seasons before test_year vs test_year itself."""
+        test_year = self.meta['test_year'] if test_year is None else test_year
+        train = self.year_rows(last=test_year - 1)
+        test = self.year_rows(test_year, test_year)
+        return self.X[train], self.y[train], self.X[test], self.y[test]
+
+    def encoder(self):
+        """The fitted OrdinalEncoder the matrix was encoded with (rebuilt from the category dictionaries)."""
+        categories = [np.array(c['values'], dtype=c['dtype']) for c in self.meta['categories'].values()]
+        encoder = OrdinalEncoder(categories=categories, handle_unknown='use_encoded_value', unknown_value=-1)
+        return encoder.fit(pd.DataFrame({f: cats[:1] for f, cats in zip(self.features, categories)}))
+
+    def is_current(self, source=SOURCE_PATH):
+        """True if built by this MATRIX_VERSION from the current `source` file."""
+        return self.meta['version'] == MATRIX_VERSION and self.meta['source'] == _source_stamp(source)
+
+
+def load_matrix(path=MATRIX_DIR, source=SOURCE_PATH, mmap=True):
+    """The TrainingMatrix if one is there and matches `source` (None = don't check), else None."""
+    if not os.path.exists(os.path.join(path, META_FILE)):
+        return None
+    matrix = TrainingMatrix(path, mmap)
+    if source is not None and not matrix.is_current(source):
+        return None
+    return matrix
+
+
+if __name__ == "__main__":
+    # Rebuild the matrix from the feature CSV (add_feature.py does this automatically)
+    df = read_csv_typed(SOURCE_PATH, MODEL_COLUMNS, required=MODEL_COLUMNS)
+    n_rows = write_matrix(df, source=SOURCE_PATH)
+    print(f"SUCCESS! {n_rows} clean laps x {len(FEATURES)} features saved to: {MATRIX_DIR}")
@@ -1,17 +1,20 @@
-import pandas as pd
 import seaborn as sns
 import matplotlib.pyplot as plt
 import os
+import sys
+
+# Allow `python src/visualize.py` from the repo root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.dataset_store import TRAINING, list_partitions, read_dataset
 
 # 1. Load the Data
 print("Loading data...")
-data_path = os.path.join('data', 'processed', 'f1_training_data.csv')
-
-if not os.path.exists(data_path):
-    print("ERROR: File not found!")
+if not list_partitions(TRAINING):
+    print("ERROR: No processed races found! Run process_data.py first.")
     exit()
 
-df = pd.read_csv(data_path)
+df = read_dataset(TRAINING)
 print(f"Loaded {len(df)} laps.")
 
 # 2. Filter for Bahrain 2024 (or latest available)